@@ -1,11 +1,14 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
 
+# Recursos empaquetados (fuente de la UI): se cargan con fonts.resource_path
+datas = [('assets', 'assets')] if os.path.isdir('assets') else []
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=datas,
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
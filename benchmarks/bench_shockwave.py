@@ -0,0 +1,73 @@
+"""Benchmark: cinco ondas de choque simultáneas (capa auxiliar vs superficie por onda).
+
+Uso: python benchmarks/bench_shockwave.py [--frames N]
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from config import *
+from entities import Shockwave
+
+
+def legacy_draw(wave, surface, zoom=1.0):
+    # Implementación anterior: una superficie SRCALPHA de 2 * radio por onda y frame
+    center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
+    screen_x = center_x + (wave.x - center_x) * zoom
+    screen_y = center_y + (wave.y - center_y) * zoom
+    screen_radius = wave.radius * zoom
+    s = pygame.Surface((int(screen_radius*2), int(screen_radius*2)), pygame.SRCALPHA)
+    pygame.draw.circle(s, (255, 255, 255, max(0, wave.alpha)), (int(screen_radius), int(screen_radius)), int(screen_radius), int(5 * zoom))
+    surface.blit(s, (screen_x - screen_radius, screen_y - screen_radius))
+
+
+def make_waves():
+    # Cinco ondas escalonadas (como tras varias subidas de nivel encadenadas)
+    waves = []
+    for i in range(5):
+        wave = Shockwave(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, i + 1)
+        for _ in range(i * 8):
+            wave.update()
+        waves.append(wave)
+    return waves
+
+
+def run(draw, frames, surface):
+    samples = []
+    for _ in range(frames):
+        waves = make_waves()
+        while any(w.active for w in waves):
+            start = time.perf_counter()
+            for wave in waves:
+                if wave.active:
+                    draw(wave, surface)
+            samples.append(time.perf_counter() - start)
+            for wave in waves:
+                wave.update()
+    samples.sort()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ondas de choque: capa auxiliar vs superficie por onda")
+    parser.add_argument("--frames", type=int, default=10, help="repeticiones de la secuencia de cinco ondas")
+    frames = parser.parse_args().frames
+    pygame.init()
+    surface = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    for name, draw in (("legacy", legacy_draw), ("scratch", lambda w, s: w.draw(s))):
+        samples = run(draw, frames, surface)
+        median = samples[len(samples) // 2] * 1000
+        p95 = samples[int(len(samples) * 0.95)] * 1000
+        print(f"{name:8s} 5 ondas: mediana {median:.3f} ms  p95 {p95:.3f} ms  max {samples[-1] * 1000:.3f} ms")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
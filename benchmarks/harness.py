@@ -0,0 +1,73 @@
+"""Utilidades del banco de pruebas: medición, estadísticas y comparación con una baseline."""
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+import pygame
+
+
+def measure(run, setup=None, min_time=0.3, min_samples=5, max_samples=500):
+    """Ejecuta run(estado) hasta reunir min_samples y min_time segundos; devuelve tiempos en ms.
+
+    setup() prepara el estado de cada muestra fuera del tiempo medido.
+    """
+    samples = []
+    total = 0.0
+    while (len(samples) < min_samples or total < min_time) and len(samples) < max_samples:
+        state = setup() if setup is not None else None
+        start = time.perf_counter()
+        run(state)
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed * 1000)
+        total += elapsed
+    return samples
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        "min": round(samples[0], 4),
+        "median": round(float(np.median(samples)), 4),
+        "p95": round(float(np.percentile(samples, 95)), 4),
+        "samples": len(samples),
+    }
+
+
+def environment():
+    return {
+        "python": sys.version.split()[0],
+        "pygame": pygame.version.ver,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def save(path, results):
+    with open(path, "w") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare(results, baseline, threshold=0.25, min_delta_ms=0.02):
+    """Filas (nombre, baseline, actual, ratio, regresión) comparando medianas.
+
+    Es regresión si la mediana crece más de 'threshold' (relativo) y más de
+    'min_delta_ms' (para no marcar ruido en casos de microsegundos).
+    """
+    rows = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        ratio = current["median"] / previous["median"] if previous["median"] > 0 else float("inf")
+        regression = (ratio > 1 + threshold and
+                      current["median"] - previous["median"] > min_delta_ms)
+        rows.append((name, previous["median"], current["median"], ratio, regression))
+    return rows
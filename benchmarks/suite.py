@@ -0,0 +1,251 @@
+"""Microbenchmarks de los caminos calientes de entidades y renderizado (driver SDL dummy).
+
+Uso:
+    python benchmarks/suite.py                              # todo, resultados en bench_results.json
+    python benchmarks/suite.py -k draw --out draw.json      # solo los casos que contienen 'draw'
+    python benchmarks/suite.py --save-baseline              # guardar como baseline
+    python benchmarks/suite.py --compare                    # comparar con la baseline (código 1 si hay regresiones)
+"""
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import random
+
+import pygame
+from config import *
+from body_store import BodyStore
+from entities import CelestialBody, Asteroid, Planet, BlackHole, Shockwave, Starfield
+from game_state import GameManager, GameState
+from render_cache import PLANET_TEXTURES
+
+import harness
+
+SIZES = (10, 100, 1000, 10000)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# (nombre, fábrica) -> la fábrica devuelve (setup, run) para harness.measure
+CASES = []
+
+
+def case(name):
+    def register(factory):
+        CASES.append((name, factory))
+        return factory
+    return register
+
+
+# --- Escenarios ---
+
+def make_bodies(n, cls=Asteroid, level=3):
+    random.seed(n)
+    bodies = []
+    for _ in range(n):
+        body = cls(level)
+        body.set_spawn_position(BLACK_HOLE_RADIUS_BASE + 50, SPAWN_DISTANCE_MAX)
+        bodies.append(body)
+    return bodies
+
+
+def settle(bodies):
+    # Terminar la animación de entrada para medir el estado estable
+    for body in bodies:
+        body.spawn_anim_timer = body.spawn_anim_duration
+        body.current_size = body.target_size
+        body.update()
+
+
+def make_game(n):
+    """GameManager en PLAYING con n asteroides ya asentados y sin spawner"""
+    random.seed(n)
+    game = GameManager(persistent=False)
+    game.state = GameState.PLAYING
+    game.time_remaining = 1e9
+    game.spawned_count = game.bodies_per_level # Sin spawns nuevos durante la medición
+    bodies = make_bodies(n)
+    for body in bodies:
+        # Vida infinita: la población no cambia entre muestras
+        body.max_health = body.current_health = 1e12
+        game.bodies.append(body)
+    game.bodies.update()
+    return game
+
+
+# --- Casos ---
+
+for n in SIZES:
+    @case(f"CelestialBody.update[{n}]")
+    def _(n=n):
+        bodies = make_bodies(n)
+        def run(_):
+            for body in bodies:
+                body.update()
+        return None, run
+
+    @case(f"BodyStore.update[{n}]")
+    def _(n=n):
+        store = BodyStore()
+        for body in make_bodies(n):
+            store.append(body)
+        return None, lambda _: store.update()
+
+    @case(f"Asteroid.__init__[{n}]")
+    def _(n=n):
+        def run(_):
+            for _ in range(n):
+                Asteroid(3)
+        return None, run
+
+    @case(f"Planet.draw[{n}]")
+    def _(n=n):
+        surface = pygame.display.get_surface()
+        planets = make_bodies(n, Planet, level=2)
+        settle(planets)
+        def run(_):
+            for planet in planets:
+                planet.draw(surface, 1.0)
+        return None, run
+
+    @case(f"GameManager._apply_damage[{n}]")
+    def _(n=n):
+        game = make_game(n)
+        # Cursor sobre el cuerpo más cercano al centro de la órbita media
+        game.cursor.x, game.cursor.y = game.bodies[0].x, game.bodies[0].y
+        def setup():
+            game.floating_texts.clear()
+            game.debris.clear()
+        return setup, lambda _: game._apply_damage()
+
+    @case(f"GameManager.frame[{n}]")
+    def _(n=n):
+        surface = pygame.display.get_surface()
+        game = make_game(n)
+        game.cursor.pointer = lambda: (SCREEN_WIDTH // 2 + 150, SCREEN_HEIGHT // 2)
+        def run(_):
+            game.update()
+            game.draw(surface)
+        return None, run
+
+
+@case("Planet._generate_texture[miss]")
+def _():
+    planet = make_bodies(1, Planet, level=4)[0]
+    return PLANET_TEXTURES.clear, lambda _: planet._generate_texture()
+
+
+@case("Planet._generate_texture[hit]")
+def _():
+    planet = make_bodies(1, Planet, level=4)[0]
+    return None, lambda _: planet._generate_texture()
+
+
+# Radios en los que el aura sigue siendo visible: centrado, a partir de ~640 el propio agujero
+# tapa toda la pantalla y no se dibuja aura (ese caso grande se mide descentrado)
+for radius, offset in ((50, 0), (200, 0), (300, 0), (450, 0), (640, 400)):
+    name = f"r={radius}" + (f",offset={offset}" if offset else "")
+
+    @case(f"BlackHole.draw[{name}]")
+    def _(radius=radius, offset=offset):
+        surface = pygame.display.get_surface()
+        black_hole = BlackHole()
+        black_hole.x += offset
+        black_hole.radius = black_hole.target_radius = radius
+        def run(_):
+            black_hole.update()
+            black_hole.draw(surface, 1.0)
+        return None, run
+
+    @case(f"BlackHole.draw[{name},animating]")
+    def _(radius=radius, offset=offset):
+        surface = pygame.display.get_surface()
+        black_hole = BlackHole()
+        black_hole.x += offset
+        black_hole.radius = radius
+        def run(_):
+            black_hole.radius += 0.37 # Radio distinto en cada frame (sin caché)
+            black_hole.draw(surface, 1.0)
+        return None, run
+
+
+for density in (1, 10):
+    @case(f"Starfield.update+draw[x{density}]")
+    def _(density=density):
+        surface = pygame.display.get_surface()
+        starfield = Starfield(density)
+        def run(_):
+            starfield.update()
+            starfield.draw(surface, black_hole_radius=BLACK_HOLE_RADIUS_BASE)
+        return None, run
+
+
+@case("Shockwave.draw[x5]")
+def _():
+    surface = pygame.display.get_surface()
+    def setup():
+        # Cinco ondas escalonadas (como tras varias subidas de nivel encadenadas)
+        waves = []
+        for i in range(5):
+            wave = Shockwave(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, i + 1)
+            for _ in range(i * 8):
+                wave.update()
+            waves.append(wave)
+        return waves
+    def run(waves):
+        for wave in waves:
+            wave.draw(surface)
+    return setup, run
+
+
+# --- CLI ---
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks de Blackhole")
+    parser.add_argument("-k", dest="pattern", default="", help="solo casos cuyo nombre contiene el texto")
+    parser.add_argument("--max-size", type=int, default=max(SIZES), help="omitir casos con más cuerpos")
+    parser.add_argument("--min-time", type=float, default=0.3, help="segundos mínimos por caso")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="escribir también los resultados como baseline")
+    parser.add_argument("--compare", action="store_true", help="comparar con la baseline y marcar regresiones")
+    parser.add_argument("--threshold", type=float, default=0.25, help="aumento relativo de la mediana que cuenta como regresión")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    results = {}
+    for name, factory in CASES:
+        if args.pattern not in name:
+            continue
+        size = name.rpartition("[")[2].rstrip("]")
+        if size.isdigit() and int(size) > args.max_size:
+            continue
+        setup, run = factory()
+        stats = harness.summarize(harness.measure(run, setup, min_time=args.min_time))
+        results[name] = stats
+        print(f"{name:42s} min {stats['min']:9.3f} ms  mediana {stats['median']:9.3f} ms  p95 {stats['p95']:9.3f} ms")
+
+    harness.save(args.out, results)
+    if args.save_baseline:
+        harness.save(args.baseline, results)
+
+    if args.compare:
+        rows = harness.compare(results, harness.load(args.baseline), args.threshold)
+        regressions = [row for row in rows if row[4]]
+        print()
+        for name, before, after, ratio, regression in rows:
+            flag = "REGRESIÓN" if regression else ""
+            print(f"{name:42s} {before:9.3f} -> {after:9.3f} ms  x{ratio:5.2f}  {flag}")
+        print(f"\n{len(regressions)} regresiones de {len(rows)} casos comparados")
+        pygame.quit()
+        sys.exit(1 if regressions else 0)
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+import math
+from contextlib import contextmanager
+import numpy as np
+from config import *
+from spatial import SpatialGrid
+
+# Atributos de CelestialBody que viven en arrays contiguos cuando el cuerpo está en un BodyStore
+BODY_FIELDS = (
+    "x", "y",
+    "orbit_radius", "angle", "angular_speed", "push_velocity",
+    "spawn_anim_timer", "spawn_anim_duration",
+    "target_size", "current_size",
+    "current_health", "max_health",
+    "wave_generation", # Generación de la última onda de choque que golpeó al cuerpo
+)
+
+# Constante de la curva Elastic Out de la animación de entrada
+ELASTIC_C4 = (2 * math.pi) / 3
+
+
+class StoreField:
+    """Atributo escalar de un cuerpo que se lee/escribe en el array del BodyStore al que pertenece"""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.local_name = "_" + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        store = obj._store
+        if store is None:
+            return obj.__dict__[self.local_name]
+        return float(getattr(store, self.name)[obj._slot])
+
+    def __set__(self, obj, value):
+        store = obj.__dict__.get("_store")
+        if store is None:
+            obj.__dict__[self.local_name] = value
+        else:
+            getattr(store, self.name)[obj._slot] = value
+            store.version += 1
+
+
+class BodyStore:
+    """Contenedor de cuerpos celestes en formato structure-of-arrays.
+
+    Cada cuerpo añadido ocupa un slot en arrays NumPy contiguos (uno por atributo
+    de BODY_FIELDS) y sus atributos pasan a ser vistas sobre esos arrays, de modo
+    que update() avanza todos los cuerpos en un único paso vectorizado.
+
+    Los slots son densos: al eliminar, el último cuerpo ocupa el hueco (O(1), no
+    conserva el orden), y la pertenencia se comprueba con el propio cuerpo. Las eliminaciones pedidas mientras se recorre el store se aplican al acabar
+    el recorrido, así ningún cuerpo se salta ni se visita dos veces.
+    """
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.capacity = capacity
+        self._bodies = []
+        self._extras = {} # Cuerpos con lógica adicional por frame (atmósfera, lunas...), como conjunto ordenado
+        for name in BODY_FIELDS:
+            setattr(self, name, np.zeros(capacity))
+        # Cuerpos cuyo tamaño puede haber crecido en el último paso (animación de entrada):
+        # son los únicos cuya distancia al frente de una onda puede disminuir
+        self.growing = np.zeros(capacity, dtype=bool)
+        # Posición del paso de simulación anterior, para interpolar el dibujado (NaN = aún sin paso)
+        self.prev_x = np.full(capacity, np.nan)
+        self.prev_y = np.full(capacity, np.nan)
+        # Orden por radio clave mantenido de forma incremental (ver _update_radius_order).
+        # _radius_slot_keys es la clave con la que cada slot está colocado en ese orden (NaN = por colocar)
+        self._radius_slot_keys = np.full(capacity, np.nan)
+        self._radius_order_version = -1
+        self._radius_keys = np.empty(0)
+        self._radius_order = np.empty(0, dtype=np.intp)
+        self._growing_slots = np.empty(0, dtype=np.intp)
+
+        # Índice espacial, reconstruido de forma perezosa cuando cambia 'version'
+        self.version = 0
+        self.grid = SpatialGrid()
+        self._grid_version = -1
+
+        self._iterating = 0
+        self._pending_removal = {} # Eliminaciones aplazadas hasta acabar el recorrido (conjunto ordenado)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        # Iteramos sobre la lista viva: los cuerpos añadidos durante la iteración también se visitan
+        self._iterating += 1
+        try:
+            bodies = self._bodies
+            index = 0
+            while index < len(bodies):
+                yield bodies[index]
+                index += 1
+        finally:
+            self._iterating -= 1
+            if not self._iterating and self._pending_removal:
+                pending = list(self._pending_removal)
+                self._pending_removal.clear()
+                self.remove_many(pending)
+
+    def __getitem__(self, index):
+        return self._bodies[index]
+
+    def __contains__(self, body):
+        return getattr(body, "_store", None) is self and body not in self._pending_removal
+
+    def _grow(self):
+        new_capacity = self.capacity * 2
+        for name in BODY_FIELDS:
+            old = getattr(self, name)
+            new = np.zeros(new_capacity)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        growing = np.zeros(new_capacity, dtype=bool)
+        growing[:self.count] = self.growing[:self.count]
+        self.growing = growing
+        for name in ("prev_x", "prev_y", "_radius_slot_keys"):
+            old = getattr(self, name)
+            new = np.full(new_capacity, np.nan)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = new_capacity
+
+    def append(self, body):
+        """Añade un cuerpo y convierte sus atributos en vistas sobre los arrays"""
+        if body._store is not None:
+            raise ValueError("El cuerpo ya pertenece a un BodyStore")
+        if self.count == self.capacity:
+            self._grow()
+
+        slot = self.count
+        for name in BODY_FIELDS:
+            getattr(self, name)[slot] = body.__dict__.pop("_" + name)
+        body._store = self
+        body._slot = slot
+        self.growing[slot] = True
+        self.prev_x[slot] = np.nan
+        self.prev_y[slot] = np.nan
+        self._radius_slot_keys[slot] = np.nan
+
+        self._bodies.append(body)
+        if body.has_extras:
+            self._extras[body] = None
+        self.count += 1
+        self.version += 1
+
+    def _detach_many(self, bodies, slots):
+        # Devolver los valores actuales a los objetos para que sigan siendo válidos fuera del store
+        for name in BODY_FIELDS:
+            local_name = "_" + name
+            for body, value in zip(bodies, getattr(self, name)[slots].tolist()):
+                body.__dict__[local_name] = value
+        for body in bodies:
+            body._store = None
+            body._slot = -1
+
+    def remove(self, body):
+        self.remove_many([body])
+
+    def remove_many(self, bodies):
+        """Elimina varios cuerpos en O(k): los últimos slots vivos rellenan los huecos (no conserva el orden).
+
+        Si se está recorriendo el store, la eliminación se aplaza hasta que acabe el recorrido.
+        """
+        if self._iterating:
+            for body in bodies:
+                if body._store is self:
+                    self._pending_removal[body] = None
+            return
+
+        slots = set()
+        removed = []
+        for body in bodies:
+            if body._store is self and body._slot not in slots:
+                slots.add(body._slot)
+                removed.append(body)
+                self._extras.pop(body, None)
+        if not removed:
+            return
+        self._detach_many(removed, np.array([body._slot for body in removed], dtype=np.intp))
+
+        n = self.count
+        new_count = n - len(slots)
+        # Huecos por debajo del nuevo tamaño y cuerpos vivos por encima que los ocupan
+        holes = [slot for slot in slots if slot < new_count]
+        if holes:
+            movers = [slot for slot in range(new_count, n) if slot not in slots]
+            holes = np.array(holes, dtype=np.intp)
+            movers = np.array(movers, dtype=np.intp)
+            for name in BODY_FIELDS + ("growing", "prev_x", "prev_y"):
+                arr = getattr(self, name)
+                arr[holes] = arr[movers]
+            # El cuerpo movido ocupa un slot que en el orden por radio estaba en otra posición
+            self._radius_slot_keys[holes] = np.nan
+            bodies_list = self._bodies
+            for slot, source in zip(holes.tolist(), movers.tolist()):
+                moved = bodies_list[source]
+                bodies_list[slot] = moved
+                moved._slot = slot
+        del self._bodies[new_count:]
+        self.count = new_count
+        self.version += 1
+
+    def clear(self):
+        self._detach_many(self._bodies, np.arange(self.count))
+        self._radius_slot_keys[:self.count] = np.nan
+        self._radius_order = np.empty(0, dtype=np.intp)
+        self._radius_keys = np.empty(0)
+        self._bodies = []
+        self._extras = {}
+        self._pending_removal = {}
+        self.count = 0
+        self.version += 1
+
+    def update(self):
+        """Versión vectorizada de CelestialBody.update para todos los cuerpos"""
+        n = self.count
+        if n == 0:
+            return
+
+        # Guardar la posición actual como la del paso anterior (los recién añadidos parten de la nueva)
+        fresh = np.isnan(self.prev_x[:n])
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+
+        # Empuje radial con fricción
+        push = self.push_velocity[:n]
+        orbit = self.orbit_radius[:n]
+        moving = np.abs(push) > 0.1
+        orbit += np.where(moving, push, 0.0)
+        push[:] = np.where(moving, push * 0.9, 0.0)
+
+        angle = self.angle[:n]
+        angle += self.angular_speed[:n]
+
+        # Animación de entrada (Elastic Out) solo para los cuerpos que aún la están reproduciendo
+        timer = self.spawn_anim_timer[:n]
+        duration = self.spawn_anim_duration[:n]
+        target = self.target_size[:n]
+        current = self.current_size[:n]
+
+        self.growing[:n] = timer < duration
+        animating = np.flatnonzero(self.growing[:n])
+        current[:] = target
+        if animating.size:
+            timer[animating] += 1
+            t = timer[animating] / duration[animating]
+            scale = np.power(2.0, -10 * t) * np.sin((t * 10 - 0.75) * ELASTIC_C4) + 1
+            scale[t == 1] = 1
+            current[animating] = target[animating] * scale
+
+        # Coordenadas cartesianas (orbitan el centro de la pantalla)
+        self.x[:n] = SCREEN_WIDTH // 2 + orbit * np.cos(angle)
+        self.y[:n] = SCREEN_HEIGHT // 2 + orbit * np.sin(angle)
+        if fresh.any():
+            self.prev_x[:n][fresh] = self.x[:n][fresh]
+            self.prev_y[:n][fresh] = self.y[:n][fresh]
+
+        self.version += 1
+
+        for body in self._extras:
+            body.update_extras()
+
+    @contextmanager
+    def interpolated(self, alpha):
+        """Dentro del bloque, x/y de los cuerpos valen la interpolación entre los dos últimos pasos.
+
+        alpha = 0 es el paso anterior y 1 el actual. Solo para dibujar: lo que se
+        escriba en x/y dentro del bloque se descarta.
+        """
+        n = self.count
+        if alpha >= 1 or n == 0:
+            yield
+            return
+        x, y = self.x, self.y
+        self.x = x.copy()
+        self.y = y.copy()
+        for render, current, prev in ((self.x, x, self.prev_x), (self.y, y, self.prev_y)):
+            lerp = prev[:n] + (current[:n] - prev[:n]) * alpha
+            render[:n] = np.where(np.isnan(lerp), current[:n], lerp)
+        try:
+            yield
+        finally:
+            self.x, self.y = x, y
+
+    def _update_radius_order(self):
+        """Cuerpos ordenados por el radio al que los alcanza una onda (orbit_radius - current_size).
+
+        No se reordena desde cero: entre pasos solo cambia la clave de los cuerpos
+        empujados o en animación de entrada (y de los añadidos o recolocados por
+        un swap-remove, marcados con NaN). Esos se sacan del orden y se reinsertan
+        con searchsorted; el resto sigue ordenado tal cual.
+        """
+        if self._radius_order_version == self.version:
+            return
+        n = self.count
+        keys = self.orbit_radius[:n] - self.current_size[:n]
+        changed = self._radius_slot_keys[:n] != keys # NaN nunca es igual: por colocar
+        order = self._radius_order
+        if len(order) != n:
+            order = order[order < n] # Slots que han dejado de existir tras un swap-remove
+        if changed.any():
+            kept = order[~changed[order]]
+            kept_keys = keys[kept]
+            moved = np.flatnonzero(changed)
+            moved_keys = keys[moved]
+            by_key = np.argsort(moved_keys, kind="stable")
+            moved = moved[by_key]
+            moved_keys = moved_keys[by_key]
+            positions = np.searchsorted(kept_keys, moved_keys, side="right")
+            self._radius_order = np.insert(kept, positions, moved)
+            self._radius_keys = np.insert(kept_keys, positions, moved_keys)
+            self._radius_slot_keys[moved] = moved_keys
+        elif len(order) != len(self._radius_order):
+            self._radius_order = order
+            self._radius_keys = keys[order]
+        self._growing_slots = np.flatnonzero(self.growing[:n])
+        self._radius_order_version = self.version
+
+    def shockwave_hits(self, generation, swept_radius, radius):
+        """Golpea con la onda 'generation' a los cuerpos que su frente ha cruzado y devuelve sus slots.
+
+        Solo se recorren los cuerpos con radio clave en (swept_radius, radius] más los que
+        están creciendo: fuera de la animación de entrada el radio clave nunca disminuye,
+        así que ningún otro cuerpo pendiente puede haber quedado detrás del frente.
+        """
+        self._update_radius_order()
+        keys = self._radius_keys
+        lo = np.searchsorted(keys, swept_radius, side="right")
+        hi = np.searchsorted(keys, radius, side="right")
+        crossed = self._radius_order[lo:hi]
+
+        growing = self._growing_slots
+        if growing.size:
+            reached = self.orbit_radius[growing] - self.current_size[growing] <= radius
+            crossed = np.concatenate((crossed, growing[reached]))
+
+        hit = crossed[self.wave_generation[crossed] < generation]
+        if hit.size:
+            hit = np.unique(hit)
+            self.wave_generation[hit] = generation
+        return hit
+
+    def query_circle(self, x, y, radius):
+        """Slots de los cuerpos cuyo círculo puede tocar el círculo (x, y, radius)"""
+        if self._grid_version != self.version:
+            n = self.count
+            self.grid.rebuild(self.x[:n], self.y[:n], self.current_size[:n])
+            self._grid_version = self.version
+        return self.grid.query_circle(x, y, radius).tolist()
@@ -237,3 +237,39 @@ MOON_SIZE_CURSOR = 9      # Tamaño visual de la luna en cursor (Aumentado de 6)
 MOON_ORBIT_RADIUS = 25    # Distancia de órbita relativa al planeta
 MOON_CURSOR_ORBIT_RADIUS = 50 # Distancia de órbita en el cursor
 MAX_CURSOR_MOONS = 8      # Máximo de lunas orbitando el cursor
+
+# --- Configuración de Rendimiento ---
+SPATIAL_CELL_SIZE = 128   # Tamaño de celda (px de mundo) del índice espacial de cuerpos
+FONT_FACE = "Arial"       # Fuente del sistema usada en toda la UI
+FONT_FILE = "assets/fonts/ui.ttf" # Fuente empaquetada: si existe se usa en lugar de FONT_FACE (sin escanear las del sistema)
+TEXT_CACHE_SIZE = 256     # Máximo de textos rasterizados que se mantienen en caché
+PLANET_TEXTURE_VARIANTS = 4     # Texturas distintas por (nivel, tamaño) en el pool de planetas
+PLANET_TEXTURE_POOL_SIZE = 48   # Máximo de texturas de planeta en memoria (LRU)
+PLANET_MIN_MIP_SIZE = 16        # Lado del mip más pequeño de las texturas de planeta
+GLOW_CACHE_SIZE = 256           # Sprites de atmósfera (color, radio) en caché
+AURA_CACHE_SIZE = 48            # Frames de aura del agujero negro en caché (recortados a pantalla)
+AURA_CACHE_BYTES = 3 * SCREEN_WIDTH * SCREEN_HEIGHT * 4 # Memoria máxima de esa caché (~3 pantallas RGBA)
+AURA_BREATH_STEPS = 24          # Niveles de cuantización de la respiración del aura
+AURA_ENERGY_STEPS = 32          # Niveles de cuantización del factor de energía del aura
+RING_TILE_SIZE = 64             # Tamaño de tile para volcar los anillos de las ondas de choque
+STARFIELD_DENSITY = 1          # Multiplicador del número de estrellas del fondo (10 para pantallas de alta resolución)
+IDLE_FPS = 20                   # FPS máximos en pantallas estáticas (Menú, Resumen, Pausa) sin input
+PAUSE_NOISE_FRAMES = 8          # Frames precalculados del ruido VHS de la pausa
+ASTEROID_SHAPE_VARIANTS = 16    # Formas precalculadas por número de vértices (5..9) de los asteroides
+ASTEROID_SIZE_STEPS = 8         # Tamaños de sprite de asteroide por octava (cuantización geométrica)
+ASTEROID_HEALTH_BANDS = 8       # Niveles de relleno de vida prerrasterizados por sprite de asteroide
+ASTEROID_SPRITE_MIN_SIZE = 4    # Por debajo (px de radio en pantalla) se usa el trazado vectorial
+ASTEROID_SPRITE_MAX_SIZE = 192  # Por encima (zoom extremo) se usa el trazado vectorial
+ASTEROID_SPRITE_CACHE_SIZE = 384  # Sprites de asteroide en caché (LRU)
+SIM_DT = 1 / FPS                # Paso fijo de simulación (s): toda la lógica cuenta en pasos de 1 / FPS
+MAX_FRAME_TIME = 0.25           # Tiempo real máximo que se simula por frame (evita la espiral tras un parón)
+TURBO_FACTOR = 4                # Pasos de simulación por paso real en modo turbo (tecla de debug S)
+PERF_HISTORY_FRAMES = 300       # Frames guardados por el overlay de rendimiento (~5 s a 60 FPS)
+PERF_GRAPH_MAX_MS = 33.3        # Alto del gráfico de tiempos de frame (ms)
+SAVE_DEBOUNCE_SECONDS = 0.5     # Las compras seguidas se agrupan en un solo guardado
+POOL_MAX_FREE = 512             # Objetos libres que guarda cada pool de efectos (textos, ondas)
+GC_MAX_DEFERRED_ALLOCATIONS = 200000 # Con el GC aplazado en PLAYING, recoger la generación joven si se pasa de aquí
+SPAWN_QUEUE_DEPTH = 12          # Cuerpos preconstruidos por (tipo, nivel, lunas) en el pipeline de spawn
+SPAWN_PREFETCH_PER_STEP = 4     # Tope de cuerpos que se preconstruyen por paso durante las transiciones a PLAYING
+SPAWN_STEP_BUDGET = 0.25        # Fracción del frame (desde el inicio de step) para preconstruir en las transiciones a PLAYING
+SPAWN_IDLE_BUDGET = 0.5         # Fracción del frame (desde el inicio del update) hasta la que se preconstruye
@@ -1,10 +1,36 @@
 import pygame
 import math
 import random
+import numpy as np
 from config import *
+from body_store import StoreField
+from fonts import get_font, render_text
+from shapes import ASTEROID_SHAPES, UNIT_CIRCLE
+from pools import Pool
+from render_cache import PLANET_TEXTURES, ATMOSPHERE_GLOWS, BLACK_HOLE_AURA, ASTEROID_SPRITES, draw_ring, draw_polygon_body
 
 class CelestialBody:
+    # Atributos respaldados por el BodyStore (ver body_store.BODY_FIELDS)
+    x = StoreField()
+    y = StoreField()
+    orbit_radius = StoreField()
+    angle = StoreField()
+    angular_speed = StoreField()
+    push_velocity = StoreField()
+    spawn_anim_timer = StoreField()
+    spawn_anim_duration = StoreField()
+    target_size = StoreField()
+    current_size = StoreField()
+    current_health = StoreField()
+    max_health = StoreField()
+    wave_generation = StoreField()
+
+    # Si True, el BodyStore llama a update_extras() tras su paso vectorizado
+    has_extras = False
+
     def __init__(self, level):
+        self._store = None # BodyStore al que pertenece (None = objeto independiente)
+        self._slot = -1
         self.level = level
         self.x = 0
         self.y = 0
@@ -12,7 +38,7 @@ class CelestialBody:
         self.angle = random.uniform(0, 2 * math.pi)
         self.angular_speed = 0
         self.push_velocity = 0
-        self.hit_shockwaves = set()
+        self.wave_generation = 0 # Última onda de choque que lo ha empujado
         
         # Default values (to be overridden by subclasses)
         self.color = (100, 100, 100)
@@ -39,8 +65,8 @@ class CelestialBody:
         pass
 
     def _generate_shape(self):
-        """Genera la forma del cuerpo celeste"""
-        return []
+        """Genera la forma del cuerpo celeste (array (n, 2) de puntos normalizados)"""
+        return np.empty((0, 2))
 
     def set_spawn_position(self, min_dist, max_dist):
         """Asigna una posición orbital válida basada en el radio del agujero negro"""
@@ -49,7 +75,11 @@ class CelestialBody:
         self.angular_speed = (100 / self.orbit_radius) * self.angular_speed_base
 
     def update(self):
-        """Actualiza la posición basada en coordenadas polares"""
+        """Actualiza la posición basada en coordenadas polares.
+
+        Versión escalar para cuerpos sueltos; los cuerpos de un BodyStore se
+        actualizan en bloque con BodyStore.update().
+        """
         # Aplicar empuje radial (si lo hay)
         if abs(self.push_velocity) > 0.1:
             self.orbit_radius += self.push_velocity
@@ -97,67 +127,24 @@ class CelestialBody:
         # Escalar tamaño visual
         screen_size = self.current_size * zoom
         
+        if len(self.points) < 3: return
+
         # Transformar los puntos locales a coordenadas de pantalla
-        screen_points = []
-        for px_norm, py_norm in self.points:
-            # Escalamos los puntos normalizados por el tamaño actual escalado
-            px = px_norm * screen_size
-            py = py_norm * screen_size
-            screen_points.append((screen_x + px, screen_y + py))
-        
-        if len(screen_points) < 3: return
+        # Escalamos los puntos normalizados por el tamaño actual escalado (en un solo paso)
+        points = self.points * screen_size + (screen_x, screen_y)
 
         # Culling simple: Si el bounding box está fuera de pantalla, no dibujar
         # Margen de seguridad de 10px
-        min_x = min(p[0] for p in screen_points)
-        max_x = max(p[0] for p in screen_points)
-        min_y = min(p[1] for p in screen_points)
-        max_y = max(p[1] for p in screen_points)
+        min_x, min_y = points.min(axis=0).tolist()
+        max_x, max_y = points.max(axis=0).tolist()
         
         if (max_x < -10 or min_x > SCREEN_WIDTH + 10 or 
             max_y < -10 or min_y > SCREEN_HEIGHT + 10):
             return
+        screen_points = points.tolist()
 
-        # 1. Dibujar fondo oscuro (parte dañada)
-        dark_color = [max(0, c - 100) for c in self.color]
-        pygame.draw.polygon(surface, dark_color, screen_points)
-        
-        # 2. Dibujar parte viva (recortada verticalmente)
-        # Optimizacion: Usar set_clip en lugar de crear superficies temporales
-        # min_y y max_y ya calculados arriba para el culling
-        height = max_y - min_y
-        
-        if height > 0:
-            health_pct = max(0, self.current_health / self.max_health)
-            # La parte "viva" está abajo. Calculamos Y donde empieza.
-            clip_top = min_y + (height * (1 - health_pct))
-            
-            # Guardar clip actual
-            old_clip = surface.get_clip()
-            
-            # Definir zona de dibujo (desde clip_top hacia abajo)
-            # Usamos coordenadas de pantalla completas para el ancho
-            clip_rect = pygame.Rect(0, int(clip_top), SCREEN_WIDTH, int(SCREEN_HEIGHT - clip_top + 100))
-            
-            # Respetar clip existente si lo hubiera
-            if old_clip:
-                clip_rect = clip_rect.clip(old_clip)
-            
-            surface.set_clip(clip_rect)
-            
-            # Dibujar polígono vivo
-            pygame.draw.polygon(surface, self.color, screen_points)
-            # Brillo interno
-            pygame.draw.aalines(surface, (255, 255, 255), True, screen_points)
-            
-            # Restaurar clip
-            surface.set_clip(old_clip)
-
-        # 3. Dibujar borde (Nuevo)
-        # Usamos el color oscuro para el borde, para definir bien la forma
-        # pygame.draw.polygon(surface, dark_color, screen_points, 2) # Redundante con aalines
-        # Añadimos suavizado al borde
-        pygame.draw.aalines(surface, dark_color, True, screen_points)
+        health_pct = max(0, self.current_health / self.max_health)
+        draw_polygon_body(surface, screen_points, min_y, max_y, self.color, self.dark_color, health_pct)
 
     def take_damage(self, amount):
         # Aplicar defensa (reducción de daño)
@@ -212,43 +199,32 @@ class Asteroid(CelestialBody):
         self.dark_color = tuple(max(0, c - 100) for c in self.color)
 
     def _generate_shape(self):
-        """Genera un polígono irregular suavizado para parecer un asteroide"""
-        # 1. Generar vértices base (picos)
-        num_points = random.randint(5, 9)
-        base_points = []
-        for i in range(num_points):
-            theta = (i / num_points) * 2 * math.pi
-            r = random.uniform(0.8, 1.2)
-            px = r * math.cos(theta)
-            py = r * math.sin(theta)
-            base_points.append((px, py))
-            
-        # 2. Suavizar usando el algoritmo de Chaikin (Corner Cutting)
-        # Esto redondea las esquinas iterativamente
-        points = base_points
-        iterations = 2 # 2 iteraciones es suficiente para que se vea suave pero irregular
-        
-        for _ in range(iterations):
-            new_points = []
-            for i in range(len(points)):
-                p0 = points[i]
-                p1 = points[(i + 1) % len(points)]
-                
-                # Crear dos nuevos puntos entre p0 y p1 (al 25% y 75%)
-                # Q = 0.75*P0 + 0.25*P1
-                # R = 0.25*P0 + 0.75*P1
-                
-                qx = 0.75 * p0[0] + 0.25 * p1[0]
-                qy = 0.75 * p0[1] + 0.25 * p1[1]
-                
-                rx = 0.25 * p0[0] + 0.75 * p1[0]
-                ry = 0.25 * p0[1] + 0.75 * p1[1]
-                
-                new_points.append((qx, qy))
-                new_points.append((rx, ry))
-            points = new_points
-            
-        return points
+        """Polígono irregular suavizado (Chaikin) tomado de la biblioteca de formas precalculadas"""
+        self.shape_index = ASTEROID_SHAPES.random_index()
+        return ASTEROID_SHAPES[self.shape_index]
+
+    def draw(self, surface, zoom=1.0):
+        """Un blit del sprite prerrasterizado; trazado vectorial durante la animación de entrada o con zoom extremo"""
+        screen_size = self.current_size * zoom
+        if self.spawn_anim_timer < self.spawn_anim_duration or not ASTEROID_SPRITES.accepts(screen_size):
+            super().draw(surface, zoom)
+            return
+
+        center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
+        screen_x = center_x + (self.x - center_x) * zoom
+        screen_y = center_y + (self.y - center_y) * zoom
+
+        sprite, (offset_x, offset_y) = ASTEROID_SPRITES.get(
+            self.shape_index, self.points, self.color, self.dark_color,
+            screen_size, self.current_health / self.max_health)
+        left = round(screen_x - offset_x)
+        top = round(screen_y - offset_y)
+
+        # Culling: no dibujar si el sprite queda fuera de pantalla
+        if (left > SCREEN_WIDTH or top > SCREEN_HEIGHT or
+                left + sprite.get_width() < 0 or top + sprite.get_height() < 0):
+            return
+        surface.blit(sprite, (left, top))
 
 class Moon:
     def __init__(self, parent_planet):
@@ -284,6 +260,8 @@ class Moon:
         pygame.draw.circle(surface, (0, 0, 0), (screen_x, screen_y), screen_size, 2)
 
 class Planet(CelestialBody):
+    has_extras = True
+
     def __init__(self, level, has_moon=False):
         super().__init__(level)
         self.moons = []
@@ -328,77 +306,36 @@ class Planet(CelestialBody):
         self._generate_texture()
 
     def _generate_texture(self):
-        # Resolución alta para evitar pixelado al hacer zoom
-        res = int(self.target_size * 4)
-        if res < 100: res = 100
-        
-        # 1. Fondo Base (Color Principal)
-        rect_surf = pygame.Surface((res, res), pygame.SRCALPHA)
-        rect_surf.fill(self.color)
-        
-        # 2. Bandas Sinoidales (Júpiter Style)
-        num_bands = random.randint(5, 10)
-        
-        # Colores para las bandas (Oscuro y Claro)
-        c_dark = self.dark_color
-        c_light = tuple(min(255, c + 40) for c in self.color)
-        
-        for i in range(num_bands):
-            # Alternar entre oscuro y claro
-            band_color = c_dark if i % 2 == 0 else c_light
-            
-            # Propiedades de la banda
-            y_center = (i / num_bands) * res
-            thickness = random.randint(res//20, res//8)
-            amplitude = random.randint(res//50, res//20)
-            freq = random.uniform(0.02, 0.06)
-            phase = random.uniform(0, 6.28)
-            
-            # Dibujar polígono para la banda
-            points = []
-            # Borde superior
-            for x in range(0, res, 4):
-                y = y_center + math.sin(x * freq + phase) * amplitude
-                points.append((x, y))
-            
-            # Borde inferior
-            for x in range(res, -1, -4):
-                y = y_center + thickness + math.sin(x * freq + phase) * amplitude
-                points.append((x, y))
-                
-            pygame.draw.polygon(rect_surf, band_color, points)
-            
-        # 3. Aplicar Máscara Circular
-        mask = pygame.Surface((res, res), pygame.SRCALPHA)
-        pygame.draw.circle(mask, (255, 255, 255, 255), (res//2, res//2), res//2)
-        
-        # Multiplicar para recortar (Mantiene lo que está dentro del círculo blanco)
-        rect_surf.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-        
-        self.texture = rect_surf
-        
-        # 4. Generar versión "Muerta" (Oscura)
-        self.dead_texture = self.texture.copy()
-        # Oscurecer: Multiplicar por gris oscuro
-        dark_overlay = pygame.Surface((res, res), pygame.SRCALPHA)
-        dark_overlay.fill((80, 80, 80, 255))
-        self.dead_texture.blit(dark_overlay, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+        # Las texturas salen del pool compartido: la generación (bandas, máscara y
+        # versión oscura) solo ocurre la primera vez que se pide cada variante
+        self.textures = PLANET_TEXTURES.get(self.level, self.color, self.dark_color, self.target_size)
+        self.texture = self.textures.texture
+        self.dead_texture = self.textures.dead_texture
+        
+        # Caché del último tamaño escalado (en reposo cada frame es solo un blit)
+        self._scaled_size = 0
+        self._scaled_live = None
+        self._scaled_dead = None
+
+    def _get_scaled_textures(self, tex_size):
+        """Texturas viva y muerta al tamaño pedido; solo se reescala si el tamaño cambió"""
+        if tex_size != self._scaled_size:
+            self._scaled_live, self._scaled_dead = self.textures.scaled(tex_size)
+            self._scaled_size = tex_size
+        return self._scaled_live, self._scaled_dead
 
     def _generate_shape(self):
         # Los planetas son círculos perfectos, no necesitamos puntos irregulares
-        # Pero generamos un círculo de alta resolución para mantener compatibilidad con el draw() base si fuera necesario
+        # Pero usamos un círculo de alta resolución (compartido) para mantener compatibilidad con el draw() base si fuera necesario
         # Aunque sobreescribiremos draw() para hacerlo más bonito
-        num_points = 32
-        points = []
-        for i in range(num_points):
-            theta = (i / num_points) * 2 * math.pi
-            px = math.cos(theta)
-            py = math.sin(theta)
-            points.append((px, py))
-        return points
+        return UNIT_CIRCLE
 
     def update(self):
         super().update()
+        self.update_extras()
+
+    def update_extras(self):
+        """Lógica por frame que no cubre el paso vectorizado (atmósfera y lunas)"""
         self.atmosphere_pulse += 0.05
         for moon in self.moons:
             moon.update()
@@ -425,12 +362,10 @@ class Planet(CelestialBody):
         pulse = (math.sin(self.atmosphere_pulse) + 1) / 2 # 0.0 a 1.0
         atmo_size = screen_size + (5 + 5 * pulse) * zoom
         
-        # Superficie temporal para transparencia
-        atmo_surf_size = int(atmo_size * 2)
-        atmo_surf = pygame.Surface((atmo_surf_size, atmo_surf_size), pygame.SRCALPHA)
-        
-        pygame.draw.circle(atmo_surf, (*self.atmosphere_color, 50), (atmo_surf_size//2, atmo_surf_size//2), int(atmo_size))
-        surface.blit(atmo_surf, (screen_x - atmo_surf_size//2, screen_y - atmo_surf_size//2))
+        # Sprite translúcido pre-renderizado (compartido por color y radio)
+        atmo_surf = ATMOSPHERE_GLOWS.get(self.atmosphere_color, atmo_size)
+        atmo_radius = atmo_surf.get_width() // 2
+        surface.blit(atmo_surf, (screen_x - atmo_radius, screen_y - atmo_radius))
         
         # 2. Planeta Base (Círculo)
         # Usamos la misma técnica de clipping que los asteroides para la vida
@@ -440,7 +375,7 @@ class Planet(CelestialBody):
         
         # Primero dibujamos la versión "muerta" (oscura) completa
         if tex_size > 0:
-            scaled_dead = pygame.transform.smoothscale(self.dead_texture, (tex_size, tex_size))
+            scaled_live, scaled_dead = self._get_scaled_textures(tex_size)
             surface.blit(scaled_dead, (screen_x - tex_size//2, screen_y - tex_size//2))
         
         # Luego dibujamos la versión "viva" recortada según la vida restante
@@ -467,7 +402,6 @@ class Planet(CelestialBody):
             
             # Dibujar planeta vivo (Textura original)
             if tex_size > 0:
-                scaled_live = pygame.transform.smoothscale(self.texture, (tex_size, tex_size))
                 surface.blit(scaled_live, (screen_x - tex_size//2, screen_y - tex_size//2))
             
             # Restaurar clip
@@ -539,7 +473,8 @@ class BlackHole:
         self.target_radius = BLACK_HOLE_RADIUS_BASE
         self.anim_speed = 10.0 # Contracción rápida
 
-    def draw(self, surface, zoom=1.0, energy_factor=0.0):
+    def _aura(self, zoom, energy_factor):
+        """Posición, radio y capas del aura tal y como se dibujarán este frame"""
         center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
         
         # Posición en pantalla
@@ -552,6 +487,8 @@ class BlackHole:
         # --- Efecto de Aura / Respiración ---
         
         # Interpolación de parámetros entre Modo Gravedad (0.0) y Modo Energía (1.0)
+        # Cuantizada para que el aura se repita entre frames y pueda cachearse
+        energy_factor = round(energy_factor * AURA_ENERGY_STEPS) / AURA_ENERGY_STEPS
         
         # 1. Calcular distancias base para cada capa
         # Modo Energía: Escala con el radio visual
@@ -569,22 +506,12 @@ class BlackHole:
         alphas_energy = [80, 60, 40]
         alphas_gravity = [65, 50, 35]
         
-        # 4. Calcular Offset Máximo (para el tamaño de la superficie)
-        offset_energy = 60 * scale_factor
-        offset_gravity = 250 * zoom
-        max_aura_offset = offset_gravity * (1 - energy_factor) + offset_energy * energy_factor
-
-        aura_surface_size = int((screen_radius + max_aura_offset) * 2)
-        # Asegurar tamaño mínimo
-        if aura_surface_size < 1: aura_surface_size = 1
-        
-        aura_surface = pygame.Surface((aura_surface_size, aura_surface_size), pygame.SRCALPHA)
-        aura_center = (aura_surface_size // 2, aura_surface_size // 2)
-        
-        # Factor de respiración
+        # Factor de respiración (cuantizado)
         breath = (math.sin(self.pulse_timer * 0.2) + 1) / 2 
+        breath = round(breath * AURA_BREATH_STEPS) / AURA_BREATH_STEPS
         
         # 3 Capas de aura
+        layers = []
         for i in range(2, -1, -1): # 2, 1, 0 (Indices de listas)
             # Interpolación Lineal (Lerp) de distancia
             dist = dists_gravity[i] * (1 - energy_factor) + dists_energy[i] * energy_factor
@@ -608,84 +535,76 @@ class BlackHole:
             # Modulamos alpha con la respiración
             current_alpha = int(base_alpha * (0.7 + 0.3 * breath))
             
-            color = (r, g, b, current_alpha)
+            layers.append((int(current_radius), (r, g, b, current_alpha)))
             
-            pygame.draw.circle(aura_surface, color, aura_center, int(current_radius))
-            
-        # Dibujar el aura en la pantalla principal
-        surface.blit(aura_surface, (screen_x - aura_center[0], screen_y - aura_center[1]))
+        # La geometría estable (sin animación de radio ni zoom) permite cachear el ciclo de respiración
+        geometry = (round(screen_radius, 2), round(zoom, 4), energy_factor)
+        return screen_x, screen_y, screen_radius, layers, geometry
+
+    def appearance(self, zoom=1.0, energy_factor=0.0):
+        """Clave que cambia solo cuando cambia lo que dibujaría draw() (para cachear frames estáticos)"""
+        screen_x, screen_y, _, layers, geometry = self._aura(zoom, energy_factor)
+        return (int(screen_x), int(screen_y), geometry, tuple(layers))
+
+    def draw(self, surface, zoom=1.0, energy_factor=0.0):
+        screen_x, screen_y, screen_radius, layers, geometry = self._aura(zoom, energy_factor)
+
+        # Dibujar el aura en la pantalla principal (recortada a la zona visible)
+        BLACK_HOLE_AURA.draw(surface, (int(screen_x), int(screen_y)), layers, geometry, int(screen_radius))
         
         # Cuerpo principal (Agujero Negro)
         pygame.draw.circle(surface, COLOR_BLACK_HOLE, (screen_x, screen_y), int(screen_radius))
 
 class Shockwave:
-    def __init__(self, x, y):
-        self.id = random.randint(0, 1000000) # ID único para evitar golpes múltiples
+    def __init__(self, x, y, generation):
+        self.reset(x, y, generation)
+
+    def reset(self, x, y, generation):
+        """Reinicia la onda en el sitio (reutilizada desde SHOCKWAVES)"""
+        # Generación monótona: cada cuerpo recuerda la última que le golpeó para no repetir golpe
+        self.generation = generation
+        self.swept_radius = -math.inf # Radio hasta el que ya se han procesado los cuerpos
         self.x = x
         self.y = y
         self.radius = 10
+        self.prev_radius = self.radius # Radio del paso anterior (interpolación del dibujado)
         self.max_radius = SCREEN_WIDTH  # Cubrir pantalla
         self.alpha = 255
         self.speed = 25 # Más rápida para que el golpe se sienta potente
         self.active = True
 
     def update(self):
+        self.prev_radius = self.radius
         self.radius += self.speed
         self.alpha -= 5
         if self.alpha <= 0:
             self.active = False
 
-    def draw(self, surface, zoom=1.0):
+    def draw(self, surface, zoom=1.0, alpha=1.0):
+        """alpha interpola el radio entre el paso anterior (0) y el actual (1)"""
         if not self.active: return
         
         center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
         screen_x = center_x + (self.x - center_x) * zoom
         screen_y = center_y + (self.y - center_y) * zoom
-        screen_radius = self.radius * zoom
-        
-        s = pygame.Surface((int(screen_radius*2), int(screen_radius*2)), pygame.SRCALPHA)
-        pygame.draw.circle(s, (255, 255, 255, max(0, self.alpha)), (int(screen_radius), int(screen_radius)), int(screen_radius), int(5 * zoom))
-        surface.blit(s, (screen_x - screen_radius, screen_y - screen_radius))
-
-class Debris:
-    def __init__(self, x, y, color, radius, angle, size_multiplier=1.0):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.orbit_radius = radius
-        self.angle = angle
-        self.size = random.randint(3, 6) * size_multiplier # Tamaño escalable
-        self.speed = random.uniform(0.02, 0.05) # Velocidad angular rápida
-        self.decay_speed = random.uniform(1.0, 2.0) # Velocidad de caída al centro
-
-    def update(self):
-        # Movimiento espiral hacia el centro
-        self.angle += self.speed
-        self.orbit_radius -= self.decay_speed
-        
-        center_x = SCREEN_WIDTH // 2
-        center_y = SCREEN_HEIGHT // 2
-        
-        self.x = center_x + self.orbit_radius * math.cos(self.angle)
-        self.y = center_y + self.orbit_radius * math.sin(self.angle)
-
-    def draw(self, surface, zoom=1.0):
-        center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
-        screen_x = center_x + (self.x - center_x) * zoom
-        screen_y = center_y + (self.y - center_y) * zoom
-        screen_size = max(1, int(self.size * zoom))
+        screen_radius = (self.prev_radius + (self.radius - self.prev_radius) * alpha) * zoom
         
-        pygame.draw.circle(surface, self.color, (int(screen_x), int(screen_y)), screen_size)
+        # Anillo sobre la capa auxiliar de pantalla: coste acotado por el área visible
+        draw_ring(surface, (int(screen_x), int(screen_y)), int(screen_radius), int(5 * zoom), (255, 255, 255, max(0, self.alpha)))
 
 class FloatingText:
     def __init__(self, x, y, text, color=COLOR_DAMAGE_TEXT, size=16):
+        self.reset(x, y, text, color, size)
+
+    def reset(self, x, y, text, color=COLOR_DAMAGE_TEXT, size=16):
+        """Reinicia el texto en el sitio (reutilizado desde FLOATING_TEXTS)"""
         self.x = x
         self.y = y
         self.text = str(text)
         self.color = color
         self.life = 60 # frames
         self.alpha = 255
-        self.font = pygame.font.SysFont("Arial", size, bold=True)
+        self.font = get_font(size, bold=True)
 
     def update(self):
         self.y -= 1 # Subir
@@ -699,9 +618,15 @@ class FloatingText:
         screen_x = center_x + (self.x - center_x) * zoom
         screen_y = center_y + (self.y - center_y) * zoom
         
-        text_surf = self.font.render(self.text, True, self.color)
+        # La superficie viene de la caché compartida: restauramos su alpha tras usarla
+        text_surf = render_text(self.font, self.text, self.color)
         text_surf.set_alpha(self.alpha)
         surface.blit(text_surf, (screen_x, screen_y))
+        text_surf.set_alpha(None)
+
+# Pools de efectos de vida corta: en plena run se reciclan en vez de crear objetos nuevos
+SHOCKWAVES = Pool(Shockwave)
+FLOATING_TEXTS = Pool(FloatingText)
 
 class PlayerCursor:
     def __init__(self):
@@ -709,15 +634,18 @@ class PlayerCursor:
         self.x = 0
         self.y = 0
         self.angle_offset = 0 # Para rotar el borde discontinuo
+        self.pointer = pygame.mouse.get_pos # Origen de la posición (el simulador headless usa una política)
 
     def update(self):
-        self.x, self.y = pygame.mouse.get_pos()
+        self.x, self.y = self.pointer()
         self.angle_offset += 0.02
 
     def draw(self, surface, zoom=1.0):
+        """Dibuja el cursor y devuelve el rectángulo de pantalla que ha tocado"""
         # El cursor se dibuja en coordenadas de pantalla (mouse), pero su radio visual debe escalar
         # para representar el área de efecto en el mundo "zoomeado"
         visual_radius = self.radius * zoom
+        dirty = []
         
         # Dibujar línea discontinua real
         num_segments = 20
@@ -740,58 +668,72 @@ class PlayerCursor:
             
             # Dibujar línea del cursor
             # Usamos un solo color oscuro y sólido para mejor visibilidad en fondo claro
-            pygame.draw.line(surface, COLOR_CURSOR, start_pos, end_pos, 3)
+            dirty.append(pygame.draw.line(surface, COLOR_CURSOR, start_pos, end_pos, 3))
             
         # Punto central para precisión (Opcional, comentado por ahora)
         # pygame.draw.circle(surface, (0, 0, 0), (self.x, self.y), 4)
         # pygame.draw.circle(surface, (255, 255, 255), (self.x, self.y), 2)
+        return dirty[0].unionall(dirty[1:])
 
 class Starfield:
-    def __init__(self):
-        self.stars = []
+    """Fondo de estrellas en 3 capas (parallax) guardado como arrays NumPy.
+
+    Cada atributo de estrella es un array; update() y draw() trabajan en una
+    sola pasada vectorizada y los píxeles se escriben directamente con
+    surfarray.pixels3d.
+    """
+
+    # Capa 0: Fondo (Lentas, pequeñas, muchas)
+    # Capa 1: Medio (Velocidad media)
+    # Capa 2: Frente (Rápidas, menos cantidad)
+    LAYER_COUNTS = (200, 100, 50)
+    LAYER_SPEEDS = (0.0002, 0.0005, 0.001) # Velocidad angular
+    LAYER_COLORS = ((100, 100, 120), (150, 150, 180), (200, 200, 255))
+    LAYER_SIZES = (1, 2, 2)
+
+    def __init__(self, density=STARFIELD_DENSITY):
+        self.rng = np.random.default_rng(random.getrandbits(64))
         center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
-        
-        # Crear 3 capas de estrellas
-        # Capa 0: Fondo (Lentas, pequeñas, muchas)
-        # Capa 1: Medio (Velocidad media)
-        # Capa 2: Frente (Rápidas, menos cantidad)
-        
-        counts = [200, 100, 50]
-        speeds = [0.0002, 0.0005, 0.001] # Velocidad angular
-        colors = [(100, 100, 120), (150, 150, 180), (200, 200, 255)]
-        sizes = [1, 2, 2]
-        
-        for layer in range(3):
-            for _ in range(counts[layer]):
-                # Generar en coordenadas polares para facilitar rotación
-                angle = random.uniform(0, 2 * math.pi)
-                # Radio hasta la esquina para cubrir todo al rotar
-                max_radius = math.sqrt(center_x**2 + center_y**2) + 50
-                radius = random.uniform(0, max_radius)
-                
-                self.stars.append({
-                    'layer': layer,
-                    'angle': angle,
-                    'base_radius': radius, # Guardar radio original
-                    'radius': radius,
-                    'speed': speeds[layer],
-                    'color': colors[layer],
-                    'size': sizes[layer],
-                    'twinkle_offset': random.uniform(0, 2*math.pi),
-                    'radial_speed': 0 # Velocidad de expansión
-                })
-        
+        # Radio hasta la esquina para cubrir todo al rotar
+        max_radius = math.sqrt(center_x**2 + center_y**2) + 50
+
+        counts = [int(c * density) for c in self.LAYER_COUNTS]
+        self.layer = np.repeat(np.arange(3), counts)
+        n = len(self.layer)
+
+        # Generar en coordenadas polares para facilitar rotación
+        self.angle = self.rng.uniform(0, 2 * math.pi, n)
+        self.base_radius = self.rng.uniform(0, max_radius, n) # Radio original
+        self.radius = self.base_radius.copy()
+        self.speed = np.take(self.LAYER_SPEEDS, self.layer)
+        self.color = np.take(np.array(self.LAYER_COLORS, dtype=np.float64), self.layer, axis=0)
+        self.size = np.take(self.LAYER_SIZES, self.layer)
+        self.twinkle_offset = self.rng.uniform(0, 2 * math.pi, n)
+        self.radial_speed = np.zeros(n) # Velocidad de expansión
+
+        # Las capas van en orden y los tamaños no decrecen: el orden de pintado se conserva
+        self._stamps = {size: self._circle_offsets(size) for size in sorted(set(self.LAYER_SIZES))}
+
         self.exploding = False
         self.imploding = False
 
+    @staticmethod
+    def _circle_offsets(size):
+        # Píxeles que pinta pygame.draw.circle con ese radio, relativos al centro
+        if size == 1:
+            return np.zeros((1, 2), dtype=np.intp)
+        stamp = pygame.Surface((size * 2 + 1, size * 2 + 1))
+        pygame.draw.circle(stamp, (255, 255, 255), (size, size), size)
+        xs, ys = np.nonzero(pygame.surfarray.array_red(stamp))
+        return np.stack((xs - size, ys - size), axis=1)
+
     def trigger_explosion(self):
         """Inicia el efecto de warp/explosión (Salida)"""
         self.exploding = True
         self.imploding = False
-        for star in self.stars:
-            # Velocidad basada en la capa (más cerca = más rápido)
-            # REDUCIDO: Velocidad inicial mucho más baja para que se vea la aceleración
-            star['radial_speed'] = 2 + (star['layer'] * 2)
+        # Velocidad basada en la capa (más cerca = más rápido)
+        # REDUCIDO: Velocidad inicial mucho más baja para que se vea la aceleración
+        self.radial_speed[:] = 2 + (self.layer * 2)
 
     def trigger_implosion(self):
         """Inicia el efecto de warp inverso (Entrada)"""
@@ -799,87 +741,80 @@ class Starfield:
         self.exploding = False
         center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
         max_dist = math.sqrt(center_x**2 + center_y**2) + 200
-        
-        for star in self.stars:
-            # Empezar lejos
-            star['radius'] = star['base_radius'] + max_dist
-            # Velocidad negativa (hacia adentro)
-            # Más rápido cuanto más lejos para que lleguen a la vez aprox
-            star['radial_speed'] = -20 - (star['layer'] * 10)
+
+        # Empezar lejos
+        self.radius[:] = self.base_radius + max_dist
+        # Velocidad negativa (hacia adentro)
+        # Más rápido cuanto más lejos para que lleguen a la vez aprox
+        self.radial_speed[:] = -20 - (self.layer * 10)
 
     def reset(self):
         """Reinicia las estrellas a su estado normal"""
         self.exploding = False
         self.imploding = False
-        center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
-        max_radius = math.sqrt(center_x**2 + center_y**2) + 50
-        
-        for star in self.stars:
-            star['radial_speed'] = 0
-            star['radius'] = star['base_radius'] # Volver a posición base
+        self.radial_speed[:] = 0
+        self.radius[:] = self.base_radius # Volver a posición base
 
     def update(self):
         center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
         max_radius = math.sqrt(center_x**2 + center_y**2) + 100
-        
-        for star in self.stars:
-            if self.exploding:
-                # Movimiento radial explosivo (Hacia afuera)
-                star['radius'] += star['radial_speed']
-                star['radial_speed'] *= 1.02 # Aceleración suave (antes 1.05)
-                
-            elif self.imploding:
-                # Movimiento radial implosivo (Hacia adentro)
-                star['radius'] += star['radial_speed']
-                
-                # Frenado suave al llegar
-                if star['radius'] <= star['base_radius']:
-                    star['radius'] = star['base_radius']
-                    # No paramos la velocidad aquí, simplemente clampamos el radio
-                    # para que se queden en su órbita
-                else:
-                    # Aceleración inversa (frenado) o velocidad constante?
-                    # Vamos a hacer que aceleren hacia adentro para efecto "succión"
-                    pass 
-                    
-            else:
-                # Movimiento rotacional normal
-                star['angle'] += star['speed']
-                
+
+        if self.exploding:
+            # Movimiento radial explosivo (Hacia afuera)
+            self.radius += self.radial_speed
+            self.radial_speed *= 1.02 # Aceleración suave (antes 1.05)
+
+        elif self.imploding:
+            # Movimiento radial implosivo (Hacia adentro)
+            self.radius += self.radial_speed
+            # Al llegar se clampa el radio para que se queden en su órbita
+            np.maximum(self.radius, self.base_radius, out=self.radius)
+
+        else:
+            # Movimiento rotacional normal
+            self.angle += self.speed
+
             # Si se salen del rango máximo en modo normal, reaparecen (loop)
             # En modo explosión dejamos que se vayan
-            if not self.exploding and not self.imploding and star['radius'] > max_radius:
-                star['radius'] = random.uniform(0, max_radius)
+            outside = np.flatnonzero(self.radius > max_radius)
+            if outside.size:
+                self.radius[outside] = self.rng.uniform(0, max_radius, outside.size)
 
     def draw(self, surface, black_hole_radius=0):
         center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
-        
-        for star in self.stars:
-            # No dibujar si está dentro del agujero negro
-            if star['radius'] < black_hole_radius:
-                continue
-                
-            # Convertir a cartesianas
-            x = center_x + star['radius'] * math.cos(star['angle'])
-            y = center_y + star['radius'] * math.sin(star['angle'])
-            
-            # Solo dibujar si está en pantalla
-            if 0 <= x <= SCREEN_WIDTH and 0 <= y <= SCREEN_HEIGHT:
-                # Efecto de parpadeo (Twinkle)
-                # Usamos el tiempo para variar el alpha o el color
-                time = pygame.time.get_ticks() * 0.005
-                twinkle = (math.sin(time + star['twinkle_offset']) + 1) / 2 # 0.0 a 1.0
-                
-                # Modificar alpha (simulado con color porque draw.circle no usa alpha por defecto sin surface)
-                # O podemos dibujar rects pequeños o circulos.
-                # Para optimizar, usamos el color base y lo oscurecemos un poco según el twinkle
-                base_c = star['color']
-                factor = 0.7 + 0.3 * twinkle # Brillo entre 70% y 100%
-                color = (int(base_c[0]*factor), int(base_c[1]*factor), int(base_c[2]*factor))
-                
-                if star['size'] == 1:
-                    surface.set_at((int(x), int(y)), color)
-                else:
-                    pygame.draw.circle(surface, color, (int(x), int(y)), star['size'])
 
+        # Convertir a cartesianas
+        x = center_x + self.radius * np.cos(self.angle)
+        y = center_y + self.radius * np.sin(self.angle)
+
+        # No dibujar si está dentro del agujero negro; solo dibujar si está en pantalla
+        visible = ((self.radius >= black_hole_radius) &
+                   (x >= 0) & (x <= SCREEN_WIDTH) & (y >= 0) & (y <= SCREEN_HEIGHT))
+        stars = np.flatnonzero(visible)
+        if stars.size == 0:
+            return
 
+        # Efecto de parpadeo (Twinkle): brillo entre 70% y 100% del color base
+        time = pygame.time.get_ticks() * 0.005
+        twinkle = (np.sin(time + self.twinkle_offset[stars]) + 1) / 2 # 0.0 a 1.0
+        factor = 0.7 + 0.3 * twinkle
+        colors = (self.color[stars] * factor[:, None]).astype(np.uint8)
+        px = x[stars].astype(np.intp)
+        py = y[stars].astype(np.intp)
+        sizes = self.size[stars]
+
+        width, height = surface.get_size()
+        pixels = pygame.surfarray.pixels3d(surface)
+        try:
+            for size, offsets in self._stamps.items():
+                group = np.flatnonzero(sizes == size)
+                if group.size == 0:
+                    continue
+                # Una fila por (estrella, píxel del sello), en orden de estrella
+                gx = (px[group, None] + offsets[:, 0]).ravel()
+                gy = (py[group, None] + offsets[:, 1]).ravel()
+                gc = np.repeat(colors[group], len(offsets), axis=0)
+                inside = (gx >= 0) & (gx < width) & (gy >= 0) & (gy < height)
+                pixels[gx[inside], gy[inside]] = gc[inside]
+        finally:
+            del pixels # Desbloquear la superficie
@@ -0,0 +1,86 @@
+import os
+import sys
+import pygame
+from collections import OrderedDict
+from config import *
+
+# Registro de fuentes compartido por todo el proceso: (face, size, bold) -> Font
+_fonts = {}
+
+
+def resource_path(relative):
+    """Ruta de un recurso junto al código (o dentro del ejecutable de PyInstaller)"""
+    base = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base, relative)
+
+
+def _bundled_font_path():
+    if not FONT_FILE:
+        return None
+    path = resource_path(FONT_FILE)
+    return path if os.path.isfile(path) else None
+
+
+_font_file = _bundled_font_path()
+
+
+def get_font(size, bold=False, face=FONT_FACE):
+    """Devuelve la fuente pedida, resolviendo la búsqueda en el sistema solo la primera vez.
+
+    Con FONT_FILE empaquetado la fuente por defecto se carga directamente del
+    archivo y el arranque no depende del escaneo de fuentes del sistema
+    (fontconfig / registro), que es lo más lento de SysFont en frío.
+    """
+    key = (face, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        if _font_file is not None and face == FONT_FACE:
+            font = pygame.font.Font(_font_file, size)
+            font.set_bold(bold)
+        else:
+            font = pygame.font.SysFont(face, size, bold=bold)
+        _fonts[key] = font
+    return font
+
+
+class TextCache:
+    """Caché LRU de textos ya rasterizados, por (fuente, texto, color)"""
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color):
+        key = (font, text, tuple(color))
+        surf = self._entries.get(key)
+        if surf is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, True, color)
+        self._entries[key] = surf
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return surf
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._entries),
+            "fonts": len(_fonts),
+        }
+
+
+TEXT_CACHE = TextCache()
+
+
+def render_text(font, text, color):
+    """Equivalente a font.render(text, True, color) pasando por la caché global"""
+    return TEXT_CACHE.render(font, text, color)
@@ -1,11 +1,23 @@
 import pygame
+import numpy as np
 import random
 import math
 import json
 import os
+import time
 from enum import Enum
 from config import *
-from entities import CelestialBody, Asteroid, Planet, BlackHole, PlayerCursor, FloatingText, Shockwave, Debris, Starfield
+from entities import CelestialBody, Asteroid, Planet, BlackHole, PlayerCursor, FloatingText, Shockwave, Starfield, FLOATING_TEXTS, SHOCKWAVES
+from body_store import BodyStore
+from spawner import SpawnPipeline
+from particles import DebrisField
+from fonts import get_font, render_text, TEXT_CACHE
+from render_cache import FrameCache, NoiseLoop
+from profiler import FrameProfiler, PerfOverlay
+from shop import ShopScene
+from save_writer import SaveWriter
+from startup import STARTUP
+from gc_policy import GC_POLICY
 
 class GameState(Enum):
     MENU = 0
@@ -20,16 +32,40 @@ class GameState(Enum):
     TRANSITION_FROM_MENU = 9  # Transición desde menú
     TRANSITION_TO_MENU = 10   # Transición hacia menú
 
+# Colecciones completas del GC: al entrar en pausa o en cualquier transición
+GC_COLLECT_STATES = {
+    GameState.PAUSED,
+    GameState.TRANSITION_TO_SUMMARY,
+    GameState.TRANSITION_TO_PLAY,
+    GameState.TRANSITION_TO_SHOP,
+    GameState.TRANSITION_FROM_SHOP,
+    GameState.TRANSITION_FROM_MENU,
+    GameState.TRANSITION_TO_MENU,
+}
+
+
+def _text_alive(text):
+    return text.life > 0
+
+
+def _wave_alive(wave):
+    return wave.active
+
+
 class GameManager:
-    def __init__(self):
+    def __init__(self, persistent=True):
+        # persistent=False: no lee ni escribe la partida guardada (simulaciones headless)
+        self.persistent = persistent
         self.state = GameState.MENU  # Empezamos en el Menú Principal
         self.black_hole = BlackHole()
         self.cursor = PlayerCursor()
-        self.bodies = []
+        self.bodies = BodyStore() # Cuerpos celestes en arrays contiguos (update vectorizado)
+        self.spawner = SpawnPipeline() # Cuerpos preconstruidos para spawns y fisiones
         self.floating_texts = []
         self.shockwaves = []
-        self.debris_list = []
-        self.starfield = Starfield() # Fondo dinámico para el menú de mejoras
+        self.debris = DebrisField() # Partículas de debris (arrays + dibujado en bloque)
+        self.shockwave_generation = 0 # Contador monótono de ondas (nunca se reinicia)
+        self._starfield = None # Fondo dinámico para el menú de mejoras (se crea al ir a la tienda)
         
         # Stats de la Run
         self.time_remaining = GAME_DURATION
@@ -88,31 +124,87 @@ class GameManager:
         # Zoom
         self.current_zoom = 1.0
 
+        # --- Paso Fijo de Simulación ---
+        # update() avanza exactamente SIM_DT; step() lo llama según el tiempo real transcurrido
+        self.sim_accumulator = 0.0
+        self.render_alpha = 1.0 # Fracción del paso en curso (interpolación del dibujado)
+        self.time_scale = 1     # Pasos de simulación por cada SIM_DT real (turbo)
+        self.step_deadline = None # perf_counter límite del trabajo adelantado mientras step() ejecuta pasos
+
+        # --- Overlay de Rendimiento (debug) ---
+        self.profiler = FrameProfiler()
+        self.perf_overlay = None # Se crea al activarlo
+
+        # --- Optimización: Pantallas Estáticas (Menú, Resumen, Pausa) ---
+        self.frame_cache = FrameCache()
+        self._pause_noise = None   # Ruido VHS, se crea la primera vez que se pausa
+        self._pause_overlay = None # Oscurecido + scanlines, se crea la primera vez que se pausa
+        STARTUP.mark("game.state")
+
         # --- Optimización: Fuentes Precargadas ---
-        self.font_ui = pygame.font.SysFont("Arial", 24)
-        self.font_ui_large = pygame.font.SysFont("Arial", 60, bold=True)
-        self.font_ui_small = pygame.font.SysFont("Arial", 30)
-        self.font_btn = pygame.font.SysFont("Arial", 24, bold=True)
-        self.font_stats = pygame.font.SysFont("Arial", 20)
-        self.font_title = pygame.font.SysFont("Arial", 20, bold=True)
-        self.font_desc = pygame.font.SysFont("Arial", 14)
-        self.font_cost = pygame.font.SysFont("Arial", 16, bold=True)
-
-        # Cargar partida guardada
-        self.load_game()
+        self.font_ui = get_font(24)
+        self.font_ui_large = get_font(60, bold=True)
+        self.font_ui_small = get_font(30)
+        self.font_btn = get_font(24, bold=True)
+        self.font_stats = get_font(20)
+        self.font_title = get_font(20, bold=True)
+        self.font_desc = get_font(14)
+        self.font_cost = get_font(16, bold=True)
+
+        STARTUP.mark("game.fonts")
+
+        # --- Tienda (escena retenida: layout, costes y sprites de nodos cacheados) ---
+        self.shop = ShopScene(self)
+
+        # Cargar partida guardada (los guardados se escriben en segundo plano)
+        self.save_writer = SaveWriter(SAVE_FILE)
+        if self.persistent:
+            self.load_game()
+        STARTUP.mark("game.save")
+
+    @property
+    def state(self):
+        return self._state
+
+    @state.setter
+    def state(self, new_state):
+        old_state = getattr(self, "_state", None)
+        self._state = new_state
+        if new_state != old_state:
+            # GC aplazado durante la run; colecciones completas en pausas y transiciones
+            GC_POLICY.on_state_change(
+                playing=new_state == GameState.PLAYING,
+                collect=new_state in GC_COLLECT_STATES,
+                new_run=old_state != GameState.PAUSED,
+            )
+
+    @property
+    def starfield(self):
+        """Starfield de la tienda y sus transiciones: no hace falta para arrancar, se crea al usarlo"""
+        if self._starfield is None:
+            self._starfield = Starfield()
+        return self._starfield
+
+    @property
+    def pause_noise(self):
+        if self._pause_noise is None:
+            self._pause_noise = NoiseLoop((SCREEN_WIDTH, SCREEN_HEIGHT), dots=500)
+        return self._pause_noise
 
     def save_game(self):
         """Guarda el progreso del juego en un archivo JSON"""
+        if not self.persistent:
+            return
         data = {
             "total_money": self.total_money,
-            "upgrades": self.upgrades
+            "upgrades": dict(self.upgrades) # Copia: el hilo de guardado la escribe más tarde
         }
-        try:
-            with open(SAVE_FILE, "w") as f:
-                json.dump(data, f, indent=4)
-            print("Juego guardado correctamente.")
-        except Exception as e:
-            print(f"Error al guardar el juego: {e}")
+        self.save_writer.request(data)
+
+    def flush_saves(self):
+        """Espera a que se escriba el último guardado pendiente (al cerrar el juego)"""
+        if self.persistent:
+            self.save_writer.flush()
 
     def load_game(self):
         """Carga el progreso del juego desde un archivo JSON"""
@@ -133,6 +225,7 @@ class GameManager:
             
             # Recalcular stats con los valores cargados
             self._recalculate_stats()
+            self.shop.invalidate()
             print("Juego cargado correctamente.")
         except Exception as e:
             print(f"Error al cargar el juego: {e}")
@@ -145,7 +238,7 @@ class GameManager:
         if key == pygame.K_m:
             self.total_money += 1000000
             self.money_earned += 1000000 # Para ver el efecto visual en summary si estamos ahí
-            self.floating_texts.append(FloatingText(SCREEN_WIDTH//2, SCREEN_HEIGHT//2, "+$1M (DEBUG)", COLOR_MONEY_TEXT, size=40))
+            self.floating_texts.append(FLOATING_TEXTS.acquire(SCREEN_WIDTH//2, SCREEN_HEIGHT//2, "+$1M (DEBUG)", COLOR_MONEY_TEXT, size=40))
             print("DEBUG: Added 1,000,000 money")
             
         elif key == pygame.K_r:
@@ -154,12 +247,36 @@ class GameManager:
             print("DEBUG: Run reset")
             
         elif key == pygame.K_s:
-            # Acelerar tiempo (Speed Up)
-            # Implementación simple: Reducir el tiempo restante drásticamente o aumentar FPS (no recomendado cambiar FPS)
-            # Mejor: Aumentar time scale o simplemente restar tiempo para acabar rápido
-            if self.state == GameState.PLAYING:
-                self.time_remaining = max(1, self.time_remaining - 10)
-                print("DEBUG: Time skipped")
+            # Acelerar tiempo (Speed Up): turbo de TURBO_FACTOR pasos de simulación por paso real
+            self.time_scale = TURBO_FACTOR if self.time_scale == 1 else 1
+            print(f"DEBUG: Time scale x{self.time_scale}")
+
+        elif key == pygame.K_p:
+            # Overlay de rendimiento (tiempos por fase + contadores)
+            self.profiler.enabled = not self.profiler.enabled
+            if self.profiler.enabled and self.perf_overlay is None:
+                self.perf_overlay = PerfOverlay(self.profiler)
+            self.frame_cache.invalidate()
+            print(f"DEBUG: Perf overlay {'on' if self.profiler.enabled else 'off'}")
+
+        elif key == pygame.K_f:
+            # Estadísticas de la caché de textos (confirmar que no se rasteriza texto por frame)
+            stats = TEXT_CACHE.stats()
+            print(f"DEBUG: Text cache hits={stats['hits']} misses={stats['misses']} "
+                  f"hit_rate={stats['hit_rate']:.1%} entries={stats['entries']} fonts={stats['fonts']}")
+            # Guardados: el hilo principal no debería esperar nunca (main_wait ~0)
+            stats = self.save_writer.stats()
+            print(f"DEBUG: Saves requests={stats['requests']} writes={stats['writes']} coalesced={stats['coalesced']} "
+                  f"failures={stats['failures']} main_wait={stats['main_wait_ms']:.3f}ms last_write={stats['last_write_ms']:.2f}ms")
+            # GC: pausas durante la run actual (deberían ser ~0 con la recolección aplazada)
+            stats = GC_POLICY.stats()
+            print(f"DEBUG: GC run_pauses={stats['run_pauses']} run_pause={stats['run_pause_ms']:.2f}ms "
+                  f"run_max={stats['run_max_pause_ms']:.2f}ms total_pauses={stats['pauses']} "
+                  f"total={stats['pause_ms']:.2f}ms frozen={stats['frozen']}")
+            # Spawns: con el pipeline al día los stalls no deberían crecer durante la run
+            stats = self.spawner.stats()
+            print(f"DEBUG: Spawns queued={stats['queued']} built={stats['built']} hits={stats['hits']} "
+                  f"stalls={stats['stalls']} prefetch={stats['prefetch_ms']:.2f}ms")
 
     def get_upgrade_cost(self, key):
         """Calcula el coste del siguiente nivel de una mejora"""
@@ -181,6 +298,7 @@ class GameManager:
             self.total_money -= cost
             self.upgrades[key] += 1
             self._recalculate_stats()
+            self.shop.invalidate()
             self.save_game() # Guardar tras compra
             return True
         return False
@@ -241,7 +359,28 @@ class GameManager:
         # self.planets_unlocked = self.upgrades.get("planet_unlock", 0) > 0
         # ...
 
+    def step(self, frame_time):
+        """Avanza la simulación en pasos fijos de SIM_DT según el tiempo real transcurrido.
+
+        El tiempo sobrante se acumula para el siguiente frame y queda en render_alpha
+        como fracción de paso para interpolar el dibujado. Devuelve los pasos ejecutados.
+        """
+        self.profiler.begin_frame()
+        # Límite de tiempo de este frame para el trabajo adelantado de los pasos (pipeline de spawn)
+        self.step_deadline = time.perf_counter() + SIM_DT * SPAWN_STEP_BUDGET
+        # Limitar el tiempo de un frame para no entrar en espiral tras un parón (carga, ventana arrastrada...)
+        self.sim_accumulator += min(frame_time, MAX_FRAME_TIME) * self.time_scale
+        steps = 0
+        while self.sim_accumulator >= SIM_DT:
+            self.update()
+            self.sim_accumulator -= SIM_DT
+            steps += 1
+        self.render_alpha = self.sim_accumulator / SIM_DT
+        self.step_deadline = None
+        return steps
+
     def update(self):
+        """Un paso de simulación de SIM_DT segundos (toda la lógica cuenta en pasos de 1 / FPS)"""
         if self.state == GameState.MENU:
             self._update_menu()
         elif self.state == GameState.TRANSITION_FROM_MENU:
@@ -265,6 +404,7 @@ class GameManager:
         
         # El cursor siempre se actualiza para poder navegar menús
         self.cursor.update()
+        self.profiler.lap("update.other")
 
     def _update_menu(self):
         # Solo actualizamos el agujero negro para que pulse
@@ -275,6 +415,9 @@ class GameManager:
         # Animación: Aumentar offset
         self.menu_anim_offset += 15 # Velocidad de animación
         
+        # La run empieza al acabar: preparar su primera oleada
+        self._prefetch_first_wave()
+        
         # Si ya salieron de pantalla (aprox 400px)
         if self.menu_anim_offset > 400:
             self.state = GameState.PLAYING
@@ -314,68 +457,11 @@ class GameManager:
         # Actualizar fondo de estrellas
         self.starfield.update()
 
-    def _get_visible_nodes_positions(self):
-        """Calcula las posiciones de todos los nodos visibles en el árbol de mejoras"""
-        center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
-        
-        branches = {
-            "asteroid": {"angle": math.pi},
-            "blackhole": {"angle": 0},
-            "unique": {"angle": -math.pi/2},
-            "planet": {"angle": math.pi/2}
-        }
-        
-        grouped_upgrades = {"asteroid": [], "blackhole": [], "unique": [], "planet": []}
-        for key, data in UPGRADES.items():
-            cat = data.get("category", "asteroid")
-            if cat in grouped_upgrades:
-                grouped_upgrades[cat].append(key)
-                
-        node_positions = {}
-        spacing = 80
-        branch_start_dist = 100
-        
-        for cat, keys in grouped_upgrades.items():
-            branch_angle = branches[cat]["angle"]
-            start_x = center_x + branch_start_dist * math.cos(branch_angle)
-            start_y = center_y + branch_start_dist * math.sin(branch_angle)
-            
-            u_x = math.cos(branch_angle)
-            u_y = math.sin(branch_angle)
-            v_x = math.cos(branch_angle + math.pi/2)
-            v_y = math.sin(branch_angle + math.pi/2)
-            
-            for key in keys:
-                data = UPGRADES[key]
-                parent_key = data.get("parent")
-                
-                # Visibilidad
-                is_visible = True
-                if parent_key:
-                    # Si tiene padre, solo es visible si el padre está comprado (nivel > 0)
-                    if self.upgrades.get(parent_key, 0) == 0:
-                        is_visible = False
-                
-                if not is_visible:
-                    continue
-                    
-                col, row = data.get("tree_pos", (0, 0))
-                spacing_y = spacing * 0.8
-                
-                x = int(start_x + (col * spacing * u_x) + (row * spacing_y * v_x))
-                y = int(start_y + (col * spacing * u_y) + (row * spacing_y * v_y))
-                
-                node_positions[key] = (x, y)
-                
-        return node_positions
-
     def handle_input(self, event):
         """Maneja inputs específicos que no son continuos (como clicks)"""
         if self.state == GameState.MENU and event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 1: # Click izquierdo
-                # Botón más abajo (+150)
-                play_rect = pygame.Rect(SCREEN_WIDTH//2 - 100, SCREEN_HEIGHT//2 + 150, 200, 60)
-                if play_rect.collidepoint(event.pos):
+                if self._get_menu_play_rect().collidepoint(event.pos):
                     self.state = GameState.TRANSITION_FROM_MENU
 
         if self.state == GameState.SUMMARY and event.type == pygame.MOUSEBUTTONDOWN:
@@ -394,16 +480,12 @@ class GameManager:
             if event.button == 1: # Click izquierdo
                 mx, my = event.pos
                 
-                # Usar la misma lógica de posicionamiento que el dibujado
-                node_positions = self._get_visible_nodes_positions()
-                
-                # Verificar clicks en nodos
-                for key, (x, y) in node_positions.items():
-                    # Radio de click un poco más generoso que el visual (15 -> 25)
-                    if math.sqrt((mx - x)**2 + (my - y)**2) < 25:
-                        if self.buy_upgrade(key):
-                            # Feedback sonoro o visual podría ir aquí
-                            pass
+                # Verificar clicks en nodos (posiciones del layout cacheado de la tienda)
+                # Se intentan comprar todos los nodos bajo el click, con el layout de antes de comprar
+                for key in self.shop.nodes_at(event.pos):
+                    if self.buy_upgrade(key):
+                        # Feedback sonoro o visual podría ir aquí
+                        pass
                             
                 # Botón Volver (Centro) -> AHORA ES JUGAR
                 center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
@@ -422,16 +504,16 @@ class GameManager:
         # Seguir actualizando textos flotantes para que terminen su animación
         for text in self.floating_texts:
             text.update()
-        self.floating_texts = [t for t in self.floating_texts if t.life > 0]
+        FLOATING_TEXTS.compact(self.floating_texts, _text_alive)
         
         # Si ya cubre la pantalla (radio > diagonal/2 aprox + margen)
         diagonal = (SCREEN_WIDTH**2 + SCREEN_HEIGHT**2)**0.5
         if self.black_hole.radius >= diagonal:
             self.state = GameState.SUMMARY
-            self.floating_texts = [] # Limpiar textos restantes al llegar al resumen
-            self.bodies = []         # Limpiar cuerpos
-            self.debris_list = []    # Limpiar debris
-            self.shockwaves = []     # Limpiar ondas
+            FLOATING_TEXTS.release_all(self.floating_texts) # Limpiar textos restantes al llegar al resumen
+            self.bodies.clear()      # Limpiar cuerpos
+            self.debris.clear()      # Limpiar debris
+            SHOCKWAVES.release_all(self.shockwaves)         # Limpiar ondas
             self.save_game()         # Guardar al terminar la run
 
     def _update_transition_play(self):
@@ -441,11 +523,71 @@ class GameManager:
         # Actualizar explosión de estrellas si está activa
         self.starfield.update()
         
+        # Preparar por adelantado los cuerpos de la primera oleada
+        self._prefetch_first_wave()
+        
         # Si ya llegó al tamaño base
         if abs(self.black_hole.radius - self.black_hole.target_radius) < 1:
             self.state = GameState.PLAYING
             self.starfield.reset() # Resetear estrellas para la próxima vez
 
+    def _prefetch_first_wave(self):
+        """Preconstruye cuerpos en las transiciones que desembocan en PLAYING.
+
+        Con un presupuesto de tiempo por frame, compartido por todos los pasos del
+        frame (tras un parón no se multiplica); max_bodies es solo un tope extra.
+        """
+        deadline = self.step_deadline
+        if deadline is None:
+            deadline = time.perf_counter() + SIM_DT * SPAWN_STEP_BUDGET
+        self.spawner.prefetch(self._spawn_plan(), max_bodies=SPAWN_PREFETCH_PER_STEP, deadline=deadline)
+
+    def _asteroid_level_range(self, black_hole_level):
+        """(mínimo, máximo) de nivel de los asteroides que spawnean con el agujero a ese nivel"""
+        # El nivel máximo está determinado por la mejora de Masa (Nucleosíntesis)
+        # Nivel base 1 + bonus de masa
+        max_unlocked_level = min(6, 1 + int(self.asteroid_mass_bonus))
+        
+        # Spawneamos un nivel aleatorio entre el mínimo (basado en agujero) y el máximo desbloqueado
+        # Mínimo: Nivel del agujero - 3
+        min_level = max(1, black_hole_level - 3)
+        
+        # Aseguramos que min_level no supere a max_unlocked_level
+        return min(min_level, max_unlocked_level), max_unlocked_level
+
+    def _planet_level_range(self, black_hole_level):
+        """(mínimo, máximo) de nivel de los planetas que spawnean con el agujero a ese nivel"""
+        # Nivel máximo determinado por mejoras
+        max_planet_level = min(6, 1 + int(self.planet_mass_bonus))
+        
+        # Nivel mínimo determinado por el nivel del agujero negro
+        # Los planetas empiezan en nivel 5. Mantenemos los niveles bajos durante 3 niveles (5, 6, 7).
+        # A partir del nivel 8, el mínimo sube a 2.
+        min_planet_level = max(1, black_hole_level - 6)
+        
+        # Asegurar rango válido
+        return min(min_planet_level, max_planet_level), max_planet_level
+
+    def _spawn_plan(self):
+        """Claves del pipeline que se espera pedir en la oleada actual"""
+        black_hole_level = self.black_hole.level
+        lo, hi = self._asteroid_level_range(black_hole_level)
+        keys = [("asteroid", level, False) for level in range(lo, hi + 1)]
+        if self.planets_unlocked:
+            lo, hi = self._planet_level_range(black_hole_level)
+            moons = (False, True) if self.moons_unlocked else (False,)
+            keys += [("planet", level, has_moon) for level in range(lo, hi + 1) for has_moon in moons]
+        return keys
+
+    def prefetch_spawns(self, deadline):
+        """Usa el tiempo sobrante del frame (hasta 'deadline') para construir los próximos cuerpos.
+
+        Solo durante la run (y las transiciones que llevan a ella): es cuando se piden cuerpos.
+        """
+        if self.state not in (GameState.PLAYING, GameState.TRANSITION_TO_PLAY, GameState.TRANSITION_FROM_MENU):
+            return 0
+        return self.spawner.prefetch(self._spawn_plan(), deadline=deadline)
+
     def _update_playing(self):
         # 1. Timer de la Run
         self.time_remaining -= 1 / FPS
@@ -474,40 +616,17 @@ class GameManager:
                         should_spawn_planet = True
                 
                 if should_spawn_planet:
-                    # Lógica de nivel de Planeta
-                    # Nivel máximo determinado por mejoras
-                    max_planet_level = min(6, 1 + int(self.planet_mass_bonus))
-                    
-                    # Nivel mínimo determinado por el nivel del agujero negro
-                    # Los planetas empiezan en nivel 5. Mantenemos los niveles bajos durante 3 niveles (5, 6, 7).
-                    # A partir del nivel 8, el mínimo sube a 2.
-                    min_planet_level = max(1, self.black_hole.level - 6)
-                    
-                    # Asegurar rango válido
-                    real_min_level = min(min_planet_level, max_planet_level)
-                    
-                    level = random.randint(real_min_level, max_planet_level)
+                    level = random.randint(*self._planet_level_range(self.black_hole.level))
                     
                     has_moon = False
                     if self.moons_unlocked and random.random() < self.moon_chance:
                         has_moon = True
                         
-                    new_body = Planet(level=level, has_moon=has_moon)
+                    # El cuerpo sale ya construido del pipeline: aquí solo se coloca
+                    new_body = self.spawner.planet(level, has_moon)
                 else:
-                    # Lógica de nivel de Asteroide
-                    # El nivel máximo está determinado por la mejora de Masa (Nucleosíntesis)
-                    # Nivel base 1 + bonus de masa
-                    max_unlocked_level = min(6, 1 + int(self.asteroid_mass_bonus))
-                    
-                    # Spawneamos un nivel aleatorio entre el mínimo (basado en agujero) y el máximo desbloqueado
-                    # Mínimo: Nivel del agujero - 3
-                    min_level = max(1, self.black_hole.level - 3)
-                    
-                    # Aseguramos que min_level no supere a max_unlocked_level
-                    real_min_level = min(min_level, max_unlocked_level)
-                    
-                    level = random.randint(real_min_level, max_unlocked_level)
-                    new_body = Asteroid(level=level)
+                    level = random.randint(*self._asteroid_level_range(self.black_hole.level))
+                    new_body = self.spawner.asteroid(level)
                 
                 # Calcular distancia de spawn dinámica
                 
@@ -522,6 +641,7 @@ class GameManager:
                 
                 self.bodies.append(new_body)
                 self.spawned_count += 1
+        self.profiler.lap("update.spawn")
 
         # 3. Actualizar Entidades
         self.black_hole.update()
@@ -534,46 +654,46 @@ class GameManager:
         else:
             self.current_zoom = target_zoom
             
-        for body in self.bodies:
-            body.update()
+        # Paso vectorizado de todos los cuerpos (+ atmósfera/lunas de los planetas)
+        self.bodies.update()
+        self.profiler.lap("update.bodies")
             
         # Actualizar efectos visuales
         for text in self.floating_texts:
             text.update()
-        self.floating_texts = [t for t in self.floating_texts if t.life > 0]
+        FLOATING_TEXTS.compact(self.floating_texts, _text_alive)
+        self.profiler.lap("update.texts")
         
         for wave in self.shockwaves:
             wave.update()
             
             # Lógica de Empuje de Onda de Choque
-            # Si la onda alcanza a un cuerpo, lo empuja hacia afuera
-            for body in self.bodies:
-                if wave.id not in body.hit_shockwaves:
-                    # Si la onda ha alcanzado o superado el radio orbital del cuerpo
-                    # Usamos un margen para que no empuje cosas que ya están muy lejos si la onda nace lejos (aunque siempre nace en el centro)
-                    if wave.radius >= body.orbit_radius - body.current_size:
-                        # ¡IMPACTO!
-                        body.hit_shockwaves.add(wave.id)
-                        
-                        # Calcular fuerza de empuje
-                        # Queremos que los aleje lo suficiente para compensar el crecimiento del agujero
-                        # Y un poco más para dar sensación de impacto
-                        # REDUCIDO: Antes era 15 + level*2, ahora es mucho más suave
-                        base_force = 5.0 + (self.black_hole.level * 1.5)
-                        
-                        # Atenuación por distancia: Cuanto más lejos, menos empuje
-                        # Usamos 800 como distancia de referencia donde el empuje es mínimo
-                        distance_factor = max(0.1, 1.0 - (body.orbit_radius / 800))
-                        
-                        body.push_velocity = base_force * distance_factor
+            # Si la onda alcanza a un cuerpo (wave.radius >= orbit_radius - current_size), lo empuja hacia afuera.
+            # Solo se procesan los cuerpos que el frente ha cruzado desde el frame anterior
+            hit_slots = self.bodies.shockwave_hits(wave.generation, wave.swept_radius, wave.radius)
+            wave.swept_radius = wave.radius
+            
+            if hit_slots.size:
+                # ¡IMPACTO!
+                # Calcular fuerza de empuje
+                # Queremos que los aleje lo suficiente para compensar el crecimiento del agujero
+                # Y un poco más para dar sensación de impacto
+                # REDUCIDO: Antes era 15 + level*2, ahora es mucho más suave
+                base_force = 5.0 + (self.black_hole.level * 1.5)
+                
+                # Atenuación por distancia: Cuanto más lejos, menos empuje
+                # Usamos 800 como distancia de referencia donde el empuje es mínimo
+                distance_factor = np.maximum(0.1, 1.0 - (self.bodies.orbit_radius[hit_slots] / 800))
+                
+                self.bodies.push_velocity[hit_slots] = base_force * distance_factor
                         
-        self.shockwaves = [w for w in self.shockwaves if w.active]
+        SHOCKWAVES.compact(self.shockwaves, _wave_alive)
+        self.profiler.lap("update.shockwaves")
 
         # Actualizar Debris
-        for debris in self.debris_list:
-            debris.update()
         # Eliminar debris que ha llegado al centro (radio < radio agujero negro)
-        self.debris_list = [d for d in self.debris_list if d.orbit_radius > self.black_hole.radius]
+        self.debris.update(self.black_hole.radius)
+        self.profiler.lap("update.debris")
 
         # Update Cursor Moons
         active_moons = []
@@ -605,6 +725,10 @@ class GameManager:
         if self.damage_tick_timer >= current_tick_rate:
             self.damage_tick_timer = 0
             self._apply_damage()
+        self.profiler.lap("update.damage")
+
+        # Con el GC aplazado, solo se recoge la generación joven si se acumula demasiado
+        GC_POLICY.poll()
 
     def _apply_damage(self):
         bodies_to_remove = []
@@ -618,7 +742,7 @@ class GameManager:
         mouse_world_x = center_x + (self.cursor.x - center_x) / zoom
         mouse_world_y = center_y + (self.cursor.y - center_y) / zoom
 
-        for body in self.bodies:
+        for body in self._bodies_near_cursor(mouse_world_x, mouse_world_y):
             # Distancia al cuadrado entre cursor (en mundo) y cuerpo (en mundo)
             dx = body.x - mouse_world_x
             dy = body.y - mouse_world_y
@@ -645,9 +769,9 @@ class GameManager:
                 dmg_str = f"{actual_damage:.1f}" if actual_damage < 10 else str(int(actual_damage))
                 if is_crit:
                     dmg_str += "!"
-                    self.floating_texts.append(FloatingText(body.x, body.y, dmg_str, COLOR_CRIT_TEXT, size=28))
+                    self.floating_texts.append(FLOATING_TEXTS.acquire(body.x, body.y, dmg_str, COLOR_CRIT_TEXT, size=28))
                 else:
-                    self.floating_texts.append(FloatingText(body.x, body.y, dmg_str))
+                    self.floating_texts.append(FLOATING_TEXTS.acquire(body.x, body.y, dmg_str))
                 
                 if destroyed:
                     bodies_to_remove.append(body)
@@ -676,9 +800,9 @@ class GameManager:
                                 m.life_timer = MOON_ORBIT_DURATION * FPS
                             
                             if moons_added:
-                                self.floating_texts.append(FloatingText(body.x, body.y - 50, "MOON CAPTURED!", (200, 200, 255)))
+                                self.floating_texts.append(FLOATING_TEXTS.acquire(body.x, body.y - 50, "MOON CAPTURED!", (200, 200, 255)))
                             else:
-                                self.floating_texts.append(FloatingText(body.x, body.y - 50, "MOON REFRESH!", (200, 200, 255)))
+                                self.floating_texts.append(FLOATING_TEXTS.acquire(body.x, body.y - 50, "MOON REFRESH!", (200, 200, 255)))
 
                     self.money_earned += body.value
                     self.total_money += body.value # Sumar al banco global
@@ -687,13 +811,13 @@ class GameManager:
                     
                     # Feedback visual de dinero (Verde)
                     # Offset vertical para que no se solape con el daño
-                    self.floating_texts.append(FloatingText(body.x, body.y - 30, f"+${body.value}", COLOR_MONEY_TEXT))
+                    self.floating_texts.append(FLOATING_TEXTS.acquire(body.x, body.y - 30, f"+${body.value}", COLOR_MONEY_TEXT))
                     
                     # Probabilidad de Reembolso de Tiempo
                     if random.random() < self.time_refund_chance:
                         self.time_remaining += 1.0
                         # Feedback visual de tiempo (Azul)
-                        self.floating_texts.append(FloatingText(body.x, body.y - 50, "+1s", COLOR_TIME_TEXT))
+                        self.floating_texts.append(FLOATING_TEXTS.acquire(body.x, body.y - 50, "+1s", COLOR_TIME_TEXT))
                     
                     # Probabilidad de Fisión (Dividir) - SOLO ASTEROIDES
                     # Verificamos si es instancia de Asteroid (aunque por ahora todos lo son)
@@ -703,8 +827,8 @@ class GameManager:
                         max_unlocked_level = min(6, 1 + int(self.asteroid_mass_bonus))
                         new_level = min(max_unlocked_level, body.level + random.randint(0, 1))
                         
-                        # Crear nuevo cuerpo
-                        new_body = Asteroid(level=new_level)
+                        # Crear nuevo cuerpo (del pipeline)
+                        new_body = self.spawner.asteroid(new_level)
                         
                         # Heredar posición aproximada del padre pero con variación
                         # Usamos el radio actual del padre +/- un poco
@@ -719,7 +843,7 @@ class GameManager:
                         # No incrementamos spawned_count para que sea un "bonus" real
                         
                         # El texto aparece donde murió el padre
-                        self.floating_texts.append(FloatingText(body.x, body.y - 70, "SPLIT!", COLOR_XP_BAR_FILL))
+                        self.floating_texts.append(FLOATING_TEXTS.acquire(body.x, body.y - 70, "SPLIT!", COLOR_XP_BAR_FILL))
 
                     # Probabilidad de Fisión (Dividir) - PLANETAS
                     if isinstance(body, Planet) and random.random() < self.planet_fission_chance:
@@ -728,7 +852,7 @@ class GameManager:
                         new_level = min(max_planet_level, body.level + random.randint(0, 1))
                         
                         # Crear nuevo planeta (sin lunas para evitar cascada infinita de lunas gratis)
-                        new_body = Planet(level=new_level, has_moon=False)
+                        new_body = self.spawner.planet(new_level)
                         
                         # Heredar posición
                         min_spawn = max(SPAWN_DISTANCE_MIN, body.orbit_radius - 50)
@@ -738,7 +862,7 @@ class GameManager:
                         
                         new_body.update()
                         self.bodies.append(new_body)
-                        self.floating_texts.append(FloatingText(body.x, body.y - 70, "PLANET SPLIT!", COLOR_XP_BAR_FILL))
+                        self.floating_texts.append(FLOATING_TEXTS.acquire(body.x, body.y - 70, "PLANET SPLIT!", COLOR_XP_BAR_FILL))
 
                     # Generar Debris (Escalado con tamaño)
                     # Más debris para cuerpos más grandes
@@ -751,14 +875,22 @@ class GameManager:
                         num_debris = int(random.randint(3, 6) * body.size_multiplier)
                         debris_size_mult = 1.0
                         
-                    for _ in range(num_debris):
-                        self.debris_list.append(Debris(body.x, body.y, body.dark_color, body.orbit_radius, body.angle, size_multiplier=debris_size_mult))
+                    self.debris.emit(num_debris, body.dark_color, body.orbit_radius, body.angle, size_multiplier=debris_size_mult)
 
-        # Eliminar cuerpos destruidos
-        for body in bodies_to_remove:
-            if body in self.bodies:
-                self.bodies.remove(body)
-            # Aquí podríamos generar Debris en el futuro
+        # Eliminar cuerpos destruidos (una sola compactación de los arrays)
+        self.bodies.remove_many(bodies_to_remove)
+
+    def _bodies_near_cursor(self, mouse_world_x, mouse_world_y):
+        """Candidatos a colisión con el cursor, en el mismo orden que un recorrido completo de self.bodies"""
+        initial_count = len(self.bodies)
+        for slot in self.bodies.query_circle(mouse_world_x, mouse_world_y, self.cursor.radius):
+            yield self.bodies[slot]
+        
+        # Los cuerpos nacidos durante este tick (fisión) no están indexados: se comprueban todos
+        index = initial_count
+        while index < len(self.bodies):
+            yield self.bodies[index]
+            index += 1
 
     def _add_xp(self, amount):
         self.current_xp += amount
@@ -767,20 +899,104 @@ class GameManager:
             self.xp_to_next_level = int(self.xp_to_next_level * XP_SCALING_FACTOR)
             self.black_hole.level_up()
             # Crear onda expansiva
-            self.shockwaves.append(Shockwave(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
+            self.shockwave_generation += 1
+            self.shockwaves.append(SHOCKWAVES.acquire(SCREEN_WIDTH//2, SCREEN_HEIGHT//2, self.shockwave_generation))
             
             # REFILL AUTOMÁTICO AL SUBIR DE NIVEL
             # Solo si se tiene la mejora de Resonancia
             if self.resonance_pct > 0:
                 # Reiniciamos el contador de spawns para que salga una nueva oleada completa
+                # (el pipeline la va preparando con el plan del nuevo nivel en el tiempo sobrante de cada frame)
                 self.spawned_count = 0
-                self.floating_texts.append(FloatingText(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 100, "RESONANCE!", COLOR_XP_BAR_FILL))
+                self.floating_texts.append(FLOATING_TEXTS.acquire(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 100, "RESONANCE!", COLOR_XP_BAR_FILL))
 
     def get_zoom(self):
         """Devuelve el nivel de zoom actual (suavizado)"""
         return self.current_zoom
 
+    def is_idle(self):
+        """True si la pantalla actual es estática y solo cambia con input (permite bajar los FPS)"""
+        if self.state not in (GameState.MENU, GameState.SUMMARY, GameState.PAUSED):
+            return False
+        return self.black_hole.radius == self.black_hole.target_radius
+
+    def invalidate_frame(self):
+        """Fuerza a recomponer y presentar el frame completo (p.ej. tras exponerse la ventana)"""
+        self.frame_cache.invalidate()
+
+    def _static_frame_key(self):
+        """Clave del frame (sin el cursor) en pantallas estáticas; None si hay que redibujarlo todo"""
+        if self.state == GameState.PAUSED:
+            return (self.state,)
+        mx, my = pygame.mouse.get_pos()
+        if self.state == GameState.SUMMARY:
+            hover = tuple(rect.collidepoint(mx, my) for rect in self._get_summary_buttons_rects())
+            return (self.state, hover, self.money_earned, self.total_money)
+        if self.state == GameState.MENU:
+            hover = self._get_menu_play_rect().collidepoint(mx, my)
+            return (self.state, hover, self.menu_anim_offset, self.black_hole.appearance(self.get_zoom()))
+        return None
+
     def draw(self, surface):
+        """Dibuja el frame y devuelve los rectángulos a presentar (None = pantalla completa)"""
+        dirty = self._draw_frame(surface)
+        if self.profiler.enabled:
+            self.profiler.end_frame()
+        if self.perf_overlay is not None and self.profiler.enabled:
+            counts = {
+                "bodies": len(self.bodies),
+                "debris": len(self.debris),
+                "texts": len(self.floating_texts),
+                "waves": len(self.shockwaves),
+                "gc": GC_POLICY.run_pauses,
+                "spawnq": self.spawner.queued(),
+                "stalls": self.spawner.stalls,
+            }
+            overlay_rect = self.perf_overlay.draw(surface, counts)
+            if dirty is not None:
+                dirty.append(overlay_rect)
+        return dirty
+
+    def _draw_frame(self, surface):
+        zoom = self.get_zoom()
+        key = self._static_frame_key()
+        if key is None:
+            self.frame_cache.invalidate()
+            with self.bodies.interpolated(self.render_alpha):
+                self._draw_scene(surface)
+            # Dibujar Cursor (siempre encima de todo, incluso UI)
+            # El cursor recibe el zoom para escalar su radio visualmente
+            self.cursor.draw(surface, zoom)
+            self.profiler.lap("draw.cursor")
+            return None
+
+        # Pantalla estática: la escena compuesta solo se redibuja cuando cambia la clave
+        dirty = None
+        if not self.frame_cache.is_valid(key):
+            self._draw_scene(surface)
+            if self.state == GameState.PAUSED:
+                self.pause_noise.bake(surface)
+                surface.blit(self._get_pause_overlay(), (0, 0))
+            self.frame_cache.store(surface, key)
+        elif self.state == GameState.PAUSED:
+            # El ruido cubre toda la pantalla
+            self.frame_cache.restore(surface)
+        else:
+            # Solo cambia la zona del cursor
+            self.frame_cache.restore(surface, self.frame_cache.cursor_rect)
+            dirty = [self.frame_cache.cursor_rect]
+
+        if self.state == GameState.PAUSED:
+            self._draw_pause_overlay(surface)
+
+        cursor_rect = self.cursor.draw(surface, zoom)
+        self.profiler.lap("draw.cursor")
+        self.frame_cache.cursor_rect = cursor_rect
+        if dirty is not None:
+            dirty.append(cursor_rect)
+        return dirty
+
+    def _draw_scene(self, surface):
         # Factor de energía para el aura (0.0 = Gravedad/Juego, 1.0 = Energía/Tienda)
         energy_factor = 0.0
         
@@ -828,29 +1044,8 @@ class GameManager:
                     expansion = 1.0 + (progress * 5.0) # 1.0 -> 6.0
                     alpha = int(255 * (1.0 - progress * 1.5)) # Desvanecimiento rápido
                     if alpha > 0:
-                        # Dibujar nodos expandiéndose
-                        center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
-                        node_positions = self._get_visible_nodes_positions()
-                        
-                        # Superficie temporal para transparencia
-                        nodes_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-                        
-                        for key, (x, y) in node_positions.items():
-                            # Expandir desde el centro
-                            dx = x - center_x
-                            dy = y - center_y
-                            ex = center_x + dx * expansion
-                            ey = center_y + dy * expansion
-                            
-                            # Solo dibujar si está en pantalla
-                            if 0 <= ex <= SCREEN_WIDTH and 0 <= ey <= SCREEN_HEIGHT:
-                                # Dibujar nodo simplificado (solo círculo)
-                                pygame.draw.circle(nodes_surf, (100, 200, 255, alpha), (int(ex), int(ey)), 10)
-                                # Línea de velocidad (Trail) hacia el centro
-                                start_trail = (int(ex - dx*0.1), int(ey - dy*0.1))
-                                pygame.draw.line(nodes_surf, (100, 200, 255, alpha//2), start_trail, (int(ex), int(ey)), 2)
-                        
-                        surface.blit(nodes_surf, (0, 0))
+                        # Dibujar nodos expandiéndose (capa auxiliar persistente, sin superficie por frame)
+                        self.shop.draw_exit(surface, expansion, alpha)
             
         elif self.state == GameState.TRANSITION_TO_SHOP:
              # Aquí el agujero negro cubre casi todo al principio
@@ -866,6 +1061,7 @@ class GameManager:
         
         # Calcular Zoom
         zoom = self.get_zoom()
+        self.profiler.lap("draw.background")
         
         # Determinar orden de dibujado
         draw_black_hole_on_top = self.state in [GameState.TRANSITION_TO_SUMMARY, GameState.SUMMARY, GameState.TRANSITION_TO_SHOP, GameState.TRANSITION_FROM_SHOP, GameState.PROGRESSION]
@@ -874,10 +1070,11 @@ class GameManager:
             # Dibujado normal (Juego y Transición a Juego)
             # Pasamos el energy_factor calculado
             self.black_hole.draw(surface, zoom, energy_factor=energy_factor)
+            self.profiler.lap("draw.black_hole")
         
         # Dibujar Debris (detrás de los cuerpos pero delante del agujero si es normal)
-        for debris in self.debris_list:
-            debris.draw(surface, zoom)
+        self.debris.draw(surface, zoom, self.render_alpha)
+        self.profiler.lap("draw.debris")
         
         for body in self.bodies:
             body.draw(surface, zoom)
@@ -885,6 +1082,7 @@ class GameManager:
         # Draw Cursor Moons (Screen Space)
         for moon in self.cursor_moons:
             moon.draw(surface, 1.0) # Zoom 1.0 because they are screen space
+        self.profiler.lap("draw.bodies")
 
         if draw_black_hole_on_top:
             # En transiciones a pantalla completa, ignoramos el zoom para que cubra todo bien
@@ -897,13 +1095,15 @@ class GameManager:
                 self.black_hole.draw(surface, 1.0, energy_factor=1.0)
             else:
                 self.black_hole.draw(surface, zoom, energy_factor=energy_factor)
+            self.profiler.lap("draw.black_hole")
             
         # Efectos visuales (detrás del cursor)
         for wave in self.shockwaves:
-            wave.draw(surface, zoom)
+            wave.draw(surface, zoom, self.render_alpha)
             
         for text in self.floating_texts:
             text.draw(surface, zoom)
+        self.profiler.lap("draw.effects")
             
                 # UI Básica
         self._draw_ui(surface)
@@ -930,22 +1130,20 @@ class GameManager:
             # O simplemente dejar que el draw principal lo maneje (usará modo normal por defecto)
             # Para suavidad, podríamos interpolar, pero por ahora dejemos que cambie al llegar a PROGRESSION
         
-        if self.state == GameState.PAUSED:
-            self._draw_pause_overlay(surface)
-            
-        # Dibujar Cursor (siempre encima de todo, incluso UI)
-        # El cursor recibe el zoom para escalar su radio visualmente
-        self.cursor.draw(surface, zoom)
+
+    def _get_menu_play_rect(self):
+        # Botón más abajo (+150) - Se mueve hacia ABAJO (+offset)
+        return pygame.Rect(SCREEN_WIDTH//2 - 100, SCREEN_HEIGHT//2 + 150 + self.menu_anim_offset, 200, 60)
 
     def _draw_menu(self, surface):
         offset = self.menu_anim_offset
         
         # Título Grande (Más arriba: -250) - Se mueve hacia ARRIBA (-offset)
-        title_text = self.font_ui_large.render(TITLE, True, COLOR_TEXT)
+        title_text = render_text(self.font_ui_large, TITLE, COLOR_TEXT)
         surface.blit(title_text, (SCREEN_WIDTH//2 - title_text.get_width()//2, SCREEN_HEIGHT//2 - 250 - offset))
         
         # Botón Jugar (Más abajo: +150) - Se mueve hacia ABAJO (+offset)
-        play_rect = pygame.Rect(SCREEN_WIDTH//2 - 100, SCREEN_HEIGHT//2 + 150 + offset, 200, 60)
+        play_rect = self._get_menu_play_rect()
         
         mx, my = pygame.mouse.get_pos()
         is_hover = play_rect.collidepoint(mx, my)
@@ -954,11 +1152,11 @@ class GameManager:
         pygame.draw.rect(surface, color_bg, play_rect, border_radius=15)
         pygame.draw.rect(surface, COLOR_TEXT, play_rect, width=2, border_radius=15)
         
-        play_text = self.font_btn.render("JUGAR", True, COLOR_TEXT_INVERTED)
+        play_text = render_text(self.font_btn, "JUGAR", COLOR_TEXT_INVERTED)
         surface.blit(play_text, (play_rect.centerx - play_text.get_width()//2, play_rect.centery - play_text.get_height()//2))
         
         # Instrucciones (También se mueven hacia abajo)
-        instr_text = self.font_desc.render("Usa el mouse para mover el agujero negro", True, COLOR_TEXT)
+        instr_text = render_text(self.font_desc, "Usa el mouse para mover el agujero negro", COLOR_TEXT)
         surface.blit(instr_text, (SCREEN_WIDTH//2 - instr_text.get_width()//2, SCREEN_HEIGHT - 50 + offset))
 
     def end_run_from_pause(self):
@@ -974,50 +1172,48 @@ class GameManager:
         # Resetear estado de juego
         self.time_remaining = GAME_DURATION
         self.money_earned = 0
-        self.bodies = []
+        self.bodies.clear()
         self.bodies_destroyed = {level: 0 for level in MASS_COLORS.keys()}
         self.current_xp = 0
         self.xp_to_next_level = XP_BASE_REQUIREMENT
-        self.shockwaves = []
-        self.floating_texts = []
-        self.debris_list = []
+        SHOCKWAVES.release_all(self.shockwaves)
+        FLOATING_TEXTS.release_all(self.floating_texts)
+        self.debris.clear()
         self.spawned_count = 0
         
         # Resetear agujero negro
         self.black_hole.shrink_to_game()
         # Eliminamos la linea que forzaba el radio para permitir la animación
 
-    def _draw_pause_overlay(self, surface):
-        # Efecto VHS: Scanlines y Ruido
-        # Usamos una superficie temporal con alpha
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        
-        # 1. Oscurecer fondo
-        overlay.fill((0, 0, 0, 100))
-        
-        # 2. Scanlines (Líneas horizontales)
-        for y in range(0, SCREEN_HEIGHT, 4):
-            pygame.draw.line(overlay, (0, 0, 0, 50), (0, y), (SCREEN_WIDTH, y))
+    def _get_pause_overlay(self):
+        # Efecto VHS: oscurecido + scanlines (estático, se crea una sola vez)
+        if self._pause_overlay is None:
+            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
             
-        # 3. Ruido estático (Puntos aleatorios)
-        for _ in range(500):
-            x = random.randint(0, SCREEN_WIDTH - 1)
-            y = random.randint(0, SCREEN_HEIGHT - 1)
-            # Ruido blanco/gris con transparencia
-            overlay.set_at((x, y), (200, 200, 200, 50))
+            # 1. Oscurecer fondo
+            overlay.fill((0, 0, 0, 100))
             
-        surface.blit(overlay, (0, 0))
+            # 2. Scanlines (Líneas horizontales)
+            for y in range(0, SCREEN_HEIGHT, 4):
+                pygame.draw.line(overlay, (0, 0, 0, 50), (0, y), (SCREEN_WIDTH, y))
+            self._pause_overlay = overlay
+        return self._pause_overlay
+
+    def _draw_pause_overlay(self, surface):
+        # El fondo oscurecido con scanlines ya está en el frame cacheado (ver draw)
+        # 3. Ruido estático: bucle de frames precalculados (blanco/gris con transparencia)
+        self.pause_noise.draw(surface)
         
         # Texto "PAUSA" parpadeante
         if (pygame.time.get_ticks() // 500) % 2 == 0:
-            text = self.font_ui_large.render("PAUSA", True, COLOR_TEXT)
+            text = render_text(self.font_ui_large, "PAUSA", COLOR_TEXT)
             # Efecto de sombra/glitch simple
             surface.blit(text, (SCREEN_WIDTH//2 - text.get_width()//2 + 2, SCREEN_HEIGHT//2 - 100 + 2))
             surface.blit(text, (SCREEN_WIDTH//2 - text.get_width()//2, SCREEN_HEIGHT//2 - 100))
             
         # Opciones del menú
-        resume_text = self.font_ui_small.render("ESC - Reanudar", True, COLOR_TEXT)
-        end_text = self.font_ui_small.render("Q - Terminar Run", True, COLOR_TEXT)
+        resume_text = render_text(self.font_ui_small, "ESC - Reanudar", COLOR_TEXT)
+        end_text = render_text(self.font_ui_small, "Q - Terminar Run", COLOR_TEXT)
         
         # Centrar textos
         surface.blit(resume_text, (SCREEN_WIDTH//2 - resume_text.get_width()//2, SCREEN_HEIGHT//2))
@@ -1041,15 +1237,15 @@ class GameManager:
                 pygame.draw.rect(surface, COLOR_XP_BAR_FILL, (bar_x, bar_y, fill_width, bar_height), border_radius=10)
             
             # Texto Nivel
-            level_text = self.font_ui.render(f"Nivel {self.black_hole.level}", True, COLOR_TEXT)
+            level_text = render_text(self.font_ui, f"Nivel {self.black_hole.level}", COLOR_TEXT)
             surface.blit(level_text, (bar_x + bar_width + 10, bar_y - 2))
 
             # Tiempo
-            time_text = self.font_ui.render(f"Tiempo: {int(self.time_remaining)}s", True, COLOR_TEXT)
+            time_text = render_text(self.font_ui, f"Tiempo: {int(self.time_remaining)}s", COLOR_TEXT)
             surface.blit(time_text, (20, 20))
             
             # Dinero
-            money_text = self.font_ui.render(f"Dinero: ${self.money_earned}", True, COLOR_TEXT)
+            money_text = render_text(self.font_ui, f"Dinero: ${self.money_earned}", COLOR_TEXT)
             surface.blit(money_text, (20, 50))
 
     def _get_summary_buttons_rects(self):
@@ -1072,9 +1268,9 @@ class GameManager:
         
         # Usamos color invertido (claro)
         # Subimos el título y los dineros
-        title = self.font_ui.render("¡RUN TERMINADA!", True, COLOR_TEXT_INVERTED)
-        score = self.font_ui.render(f"Ganancias: ${self.money_earned}", True, COLOR_TEXT_INVERTED)
-        total = self.font_ui.render(f"Banco Total: ${self.total_money}", True, COLOR_MONEY_TEXT)
+        title = render_text(self.font_ui, "¡RUN TERMINADA!", COLOR_TEXT_INVERTED)
+        score = render_text(self.font_ui, f"Ganancias: ${self.money_earned}", COLOR_TEXT_INVERTED)
+        total = render_text(self.font_ui, f"Banco Total: ${self.total_money}", COLOR_MONEY_TEXT)
         
         surface.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, SCREEN_HEIGHT//2 - 200))
         surface.blit(score, (SCREEN_WIDTH//2 - score.get_width()//2, SCREEN_HEIGHT//2 - 160))
@@ -1085,7 +1281,7 @@ class GameManager:
         line_height = 25
         
         # Título de sección
-        stats_title = self.font_stats.render("Cuerpos Absorbidos:", True, (200, 200, 200))
+        stats_title = render_text(self.font_stats, "Cuerpos Absorbidos:", (200, 200, 200))
         surface.blit(stats_title, (SCREEN_WIDTH//2 - stats_title.get_width()//2, stats_start_y))
         
         current_y = stats_start_y + 30
@@ -1099,7 +1295,7 @@ class GameManager:
                 
                 # Texto: "Asteroides Nivel X: Y"
                 text_str = f"Asteroides Nivel {level}: {count}"
-                text_surf = self.font_stats.render(text_str, True, color)
+                text_surf = render_text(self.font_stats, text_str, color)
                 
                 surface.blit(text_surf, (SCREEN_WIDTH//2 - text_surf.get_width()//2, current_y))
                 current_y += line_height
@@ -1114,7 +1310,7 @@ class GameManager:
         pygame.draw.rect(surface, color_restart_bg, restart_rect, border_radius=12)
         pygame.draw.rect(surface, COLOR_TEXT_INVERTED, restart_rect, width=2, border_radius=12)
         
-        restart_text = self.font_btn.render("Repetir (R)", True, COLOR_TEXT_INVERTED)
+        restart_text = render_text(self.font_btn, "Repetir (R)", COLOR_TEXT_INVERTED)
         surface.blit(restart_text, (restart_rect.centerx - restart_text.get_width()//2, restart_rect.centery - restart_text.get_height()//2))
         
         # Botón Tienda
@@ -1123,7 +1319,7 @@ class GameManager:
         pygame.draw.rect(surface, color_shop_bg, shop_rect, border_radius=12)
         pygame.draw.rect(surface, COLOR_XP_BAR_FILL, shop_rect, width=2, border_radius=12)
         
-        shop_text = self.font_btn.render("Mejoras (M)", True, COLOR_XP_BAR_FILL)
+        shop_text = render_text(self.font_btn, "Mejoras (M)", COLOR_XP_BAR_FILL)
         surface.blit(shop_text, (shop_rect.centerx - shop_text.get_width()//2, shop_rect.centery - shop_text.get_height()//2))
 
         # Botón Menu Principal
@@ -1132,7 +1328,7 @@ class GameManager:
         pygame.draw.rect(surface, color_menu_bg, menu_rect, border_radius=12)
         pygame.draw.rect(surface, (200, 100, 100), menu_rect, width=2, border_radius=12)
         
-        menu_text = self.font_btn.render("Menu Principal", True, (200, 100, 100))
+        menu_text = render_text(self.font_btn, "Menu Principal", (200, 100, 100))
         surface.blit(menu_text, (menu_rect.centerx - menu_text.get_width()//2, menu_rect.centery - menu_text.get_height()//2))
 
     def _draw_progression(self, surface):
@@ -1156,271 +1352,19 @@ class GameManager:
         # Dibujar Starfield (con culling del agujero negro)
         self.starfield.draw(surface, black_hole_radius=self.black_hole.radius)
         
-        center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
-        
-        node_radius = 15
-        
-        mx, my = pygame.mouse.get_pos()
-        
-        hovered_node = None
-        
-        # Obtener posiciones de nodos visibles
-        node_positions = self._get_visible_nodes_positions()
-        
-        # Aplicar flotación y ANIMACIÓN DE ENTRADA a las posiciones
-        floating_positions = {}
-        for key, (x, y) in node_positions.items():
-            # Usamos hash de la key para desincronizar las ondas
-            offset = hash(key) % 100
-            float_y = math.sin(self.menu_time + offset) * 5 # Amplitud 5px
-            
-            # Animación de entrada: Los nodos vienen desde el centro
-            # Interpolamos entre el centro y la posición final
-            final_x = x
-            final_y = y + float_y
-            
-            curr_x = center_x + (final_x - center_x) * ease_val
-            curr_y = center_y + (final_y - center_y) * ease_val
-            
-            floating_positions[key] = (curr_x, curr_y)
-        
-        # Dibujar conexiones (Líneas de Energía)
-        # Necesitamos saber dónde empieza cada rama para conectar los nodos raíz
-        branches = {
-            "asteroid": {"angle": math.pi},
-            "blackhole": {"angle": 0},
-            "unique": {"angle": -math.pi/2},
-            "planet": {"angle": math.pi/2}
-        }
-        branch_start_dist = 100
-        
-        for key, (x, y) in floating_positions.items():
-            data = UPGRADES[key]
-            parent_key = data.get("parent")
-            
-            start_pos = None
-            is_active = False # Si la conexión está "viva" (padre comprado)
-            
-            if parent_key and parent_key in floating_positions:
-                start_pos = floating_positions[parent_key]
-                # La conexión está activa si el nodo destino (hijo) ha sido comprado
-                # Esto significa que la conexión está "establecida"
-                if self.upgrades.get(key, 0) > 0:
-                    is_active = True
-            elif not parent_key:
-                # Es nodo raíz
-                cat = data.get("category", "asteroid")
-                angle = branches[cat]["angle"]
-                sx = center_x + branch_start_dist * math.cos(angle)
-                sy = center_y + branch_start_dist * math.sin(angle)
-                start_pos = (sx, sy)
-                # Las conexiones al núcleo están activas si el nodo raíz está comprado
-                if self.upgrades.get(key, 0) > 0:
-                    is_active = True
-            
-            if start_pos:
-                # Dibujar línea base oscura (siempre presente como "cable apagado")
-                pygame.draw.line(surface, (30, 30, 40), start_pos, (x, y), 5)
-                
-                if is_active:
-                    # Efecto Neón: La línea completa brilla
-                    # Pulsación suave del brillo para que parezca electricidad viva
-                    pulse = (math.sin(self.menu_time * 4 + hash(key)) + 1) / 2 # 0.0 a 1.0
-                    
-                    # 1. Glow externo (Simulado con líneas más anchas y oscuras)
-                    # Azul eléctrico oscuro
-                    glow_color = (0, 100, 180) 
-                    pygame.draw.line(surface, glow_color, start_pos, (x, y), 5)
-                    
-                    # 2. Línea media (Color principal pulsante)
-                    # Cian brillante
-                    mid_val = 150 + int(105 * pulse)
-                    mid_color = (0, mid_val, mid_val)
-                    pygame.draw.line(surface, mid_color, start_pos, (x, y), 3)
-                    
-                    # 3. Núcleo (Blanco/Cian muy claro)
-                    pygame.draw.line(surface, (200, 255, 255), start_pos, (x, y), 1)
-
-        # Dibujar nodos (en segunda pasada para que queden encima de las líneas)
-        for key, pos in floating_positions.items():
-            x, y = pos
-            data = UPGRADES[key]
-            
-            # Estado
-            level = self.upgrades[key]
-            cost = self.get_upgrade_cost(key)
-            can_buy = self.total_money >= cost
-            is_maxed = "max_level" in data and level >= data["max_level"]
-            
-            # Interacción Mouse
-            hover = math.sqrt((mx - x)**2 + (my - y)**2) < node_radius + 5
-            
-            if hover:
-                hovered_node = {
-                    "key": key, "data": data, "level": level, 
-                    "cost": cost, "can_buy": can_buy, "is_maxed": is_maxed,
-                    "x": x, "y": y
-                }
-            
-            # --- Estilos de Nodo ---
-            
-            # 1. Relleno (Fondo)
-            if is_maxed:
-                fill_color = (20, 50, 20) # Verde oscuro
-            elif can_buy:
-                fill_color = (20, 20, 40) # Azul oscuro
-            elif level > 0:
-                # Comprado pero no alcanza para mejorar (Stalled) -> GRIS
-                fill_color = (20, 20, 25) # Gris oscuro
-            else:
-                # No comprado y no alcanza (Locked/Dormant) -> ROJO
-                fill_color = (30, 10, 10) # Rojo oscuro suave
-            
-            pygame.draw.circle(surface, fill_color, (x, y), node_radius)
-            
-            # 2. Borde y Efectos
-            if is_maxed:
-                # Dorado / Verde Brillante
-                border_color = (255, 215, 0) # Gold
-                pygame.draw.circle(surface, border_color, (x, y), node_radius, 2)
-                # Brillo interno
-                pygame.draw.circle(surface, (100, 255, 100), (x, y), node_radius - 4, 1)
-                
-            elif can_buy:
-                # Cian Neón Pulsante
-                pulse = (math.sin(self.menu_time * 5) + 1) / 2 # 0.0 a 1.0 rápido
-                base_val = 150
-                bright_val = 255
-                c_val = int(base_val + (bright_val - base_val) * pulse)
-                border_color = (0, c_val, c_val) # Cian variable
-                
-                # Glow externo si es comprable
-                glow_surf = pygame.Surface((node_radius*4, node_radius*4), pygame.SRCALPHA)
-                pygame.draw.circle(glow_surf, (0, 200, 255, 50), (node_radius*2, node_radius*2), node_radius + 5 + 2*pulse)
-                surface.blit(glow_surf, (x - node_radius*2, y - node_radius*2))
-                
-                pygame.draw.circle(surface, border_color, (x, y), node_radius, 2)
-                
-            elif level > 0:
-                # Gris (Bloqueado por dinero pero ya poseído) -> GRIS
-                border_color = (80, 80, 100) # Gris metal
-                pygame.draw.circle(surface, border_color, (x, y), node_radius, 1)
-                
-            else:
-                # Rojo (Bloqueado y nunca comprado) -> ROJO
-                border_color = (150, 50, 50) # Rojo óxido
-                pygame.draw.circle(surface, border_color, (x, y), node_radius, 1)
-            
-            # Highlight al hacer hover
-            if hover:
-                pygame.draw.circle(surface, (255, 255, 255), (x, y), node_radius + 2, 1)
-            
-            # Nivel dentro
-            if node_radius > 10:
-                if is_maxed:
-                    txt_col = (255, 215, 0)
-                    txt_str = "M" # Max
-                elif can_buy:
-                    txt_col = (200, 255, 255)
-                    txt_str = str(level)
-                elif level > 0:
-                    txt_col = (150, 150, 170) # Gris claro
-                    txt_str = str(level)
-                else:
-                    txt_col = (150, 100, 100) # Rojo claro
-                    txt_str = "0"
-                    
-                icon_text = self.font_desc.render(txt_str, True, txt_col)
-                surface.blit(icon_text, (x - icon_text.get_width()//2, y - icon_text.get_height()//2))
-
-        # Botón Central (Volver/Jugar)
-        # Ya no dibujamos un círculo, el agujero negro está ahí.
-        # Solo dibujamos el texto "PLAY" o "EVOLVE" encima si queremos, o un anillo indicador
-        center_radius = 25 # Reducido de 40
-        hover_center = math.sqrt((mx - center_x)**2 + (my - center_y)**2) < center_radius
-        
-        if hover_center:
-            # Indicador sutil de que es interactivo
-            pygame.draw.circle(surface, (255, 255, 255), (center_x, center_y), center_radius + 5, 1)
-            # Texto más pequeño o icono de Play
-            play_text = self.font_btn.render("PLAY", True, (255, 255, 255))
-            surface.blit(play_text, (center_x - play_text.get_width()//2, center_y - play_text.get_height()//2))
-        
-        # Mostrar Dinero Total arriba
-        money_surf = self.font_title.render(f"BANCO: ${self.total_money}", True, COLOR_MONEY_TEXT) # Verde oscuro se ve bien
-        surface.blit(money_surf, (center_x - money_surf.get_width()//2, 50))
-        
-        # Etiquetas de Ramas (Colores más oscuros para contraste)
-        # Ajustadas posiciones para el nuevo espaciado
-        lbl_ast = self.font_desc.render("ASTEROIDES", True, COLOR_TEXT_LIGHT)
-        surface.blit(lbl_ast, (center_x - 250, center_y - 30))
-        
-        lbl_bh = self.font_desc.render("AGUJERO NEGRO", True, COLOR_TEXT_LIGHT)
-        surface.blit(lbl_bh, (center_x + 150, center_y - 30))
-        
-        lbl_uniq = self.font_desc.render("ÚNICAS", True, COLOR_TEXT_LIGHT)
-        surface.blit(lbl_uniq, (center_x - lbl_uniq.get_width()//2, center_y - 150))
-        
-        # Etiqueta Planetas (Abajo)
-        if self.planets_unlocked:
-            lbl_planet = self.font_desc.render("PLANETAS", True, COLOR_TEXT_LIGHT)
-            surface.blit(lbl_planet, (center_x - lbl_planet.get_width()//2, center_y + 150))
+        # Conexiones, nodos y etiquetas (layout y costes cacheados en la escena de la tienda)
+        mouse_pos = pygame.mouse.get_pos()
+        hovered_node = self.shop.draw(surface, self.menu_time, ease_val, mouse_pos)
 
         # DIBUJAR TOOLTIP AL FINAL (ENCIMA DE TODO)
         if hovered_node:
-            data = hovered_node["data"]
-            
-            # Contenido del tooltip
-            lines = [
-                (data["name"], self.font_title, COLOR_TEXT_INVERTED),
-                (data["description"], self.font_desc, (200, 200, 200)),
-            ]
-            
-            if hovered_node["is_maxed"]:
-                lines.append(("MAX LEVEL", self.font_cost, (100, 255, 100)))
-            else:
-                cost_color = COLOR_MONEY_TEXT if hovered_node["can_buy"] else (255, 100, 100)
-                lines.append((f"Cost: ${hovered_node['cost']}", self.font_cost, cost_color))
-                
-                # Mostrar incremento
-                current_val = data["base_value"] + (hovered_node["level"] * data["increment"])
-                next_val = current_val + data["increment"]
-                if isinstance(current_val, float):
-                    val_str = f"{current_val:.2f} -> {next_val:.2f}"
-                else:
-                    val_str = f"{current_val} -> {next_val}"
-                lines.append((f"Effect: {val_str}", self.font_desc, (150, 150, 255)))
-
-            # Calcular dimensiones
-            box_width = 220
-            box_height = 10 + len(lines) * 25
-            
-            # Posición
-            bx = mx + 15
-            by = my + 15
-            
-            if bx + box_width > SCREEN_WIDTH: bx = mx - box_width - 15
-            if by + box_height > SCREEN_HEIGHT: by = my - box_height - 15
-            
-            # Fondo oscuro para el tooltip (para que el texto claro se lea)
-            s = pygame.Surface((box_width, box_height))
-            s.set_alpha(230)
-            s.fill((20, 20, 30))
-            surface.blit(s, (bx, by))
-            
-            pygame.draw.rect(surface, (100, 100, 150), (bx, by, box_width, box_height), 1)
-            
-            curr_y = by + 10
-            for text, font_obj, color in lines:
-                surf = font_obj.render(text, True, color)
-                surface.blit(surf, (bx + 10, curr_y))
-                curr_y += 25
+            self.shop.draw_tooltip(surface, hovered_node, mouse_pos)
 
     def reset_run(self):
         self.time_remaining = GAME_DURATION
         self.money_earned = 0 # Resetear dinero de la run (el total se mantiene)
         
-        self.bodies = []
+        self.bodies.clear()
         self.bodies_destroyed = {level: 0 for level in MASS_COLORS.keys()}
         
         # Iniciar transición de vuelta al juego
@@ -1436,9 +1380,9 @@ class GameManager:
         
         self.current_xp = 0
         self.xp_to_next_level = XP_BASE_REQUIREMENT
-        self.shockwaves = []
-        self.floating_texts = []
-        self.debris_list = []
+        SHOCKWAVES.release_all(self.shockwaves)
+        FLOATING_TEXTS.release_all(self.floating_texts)
+        self.debris.clear()
         
         # Resetear spawns
         self.spawned_count = 0
@@ -0,0 +1,87 @@
+import gc
+import time
+from config import *
+
+
+class GCPolicy:
+    """Política del recolector cíclico para el juego interactivo.
+
+    Tras el arranque congela (gc.freeze) todo lo creado hasta entonces para que
+    las colecciones no lo vuelvan a recorrer. Durante PLAYING la recolección
+    generacional se aplaza (gc.disable) y se hace una colección completa al
+    entrar en transiciones y pausa, donde un parón no se nota. Si durante la run
+    se acumulan demasiadas asignaciones pendientes se recoge solo la generación
+    joven. Mientras no se llama a install() (simulate.py, scenarios.py) no hace nada.
+    """
+
+    def __init__(self, max_deferred=GC_MAX_DEFERRED_ALLOCATIONS):
+        self.installed = False
+        self.deferred = False
+        self.max_deferred = max_deferred
+        self._pause_start = None
+        self.reset_run_stats()
+        self.pauses = 0
+        self.pause_ms = 0.0
+
+    def install(self):
+        """Colección completa + gc.freeze() de lo creado en el arranque y medición de pausas"""
+        if self.installed:
+            return
+        gc.collect()
+        gc.freeze()
+        gc.callbacks.append(self._on_gc)
+        self.installed = True
+
+    def reset_run_stats(self):
+        self.run_pauses = 0       # Colecciones ocurridas durante la run (PLAYING)
+        self.run_pause_ms = 0.0
+        self.run_max_pause_ms = 0.0
+
+    def on_state_change(self, playing, collect, new_run):
+        """playing: se entra en PLAYING; collect: buen momento para una colección completa"""
+        if not self.installed:
+            return
+        if playing:
+            if new_run:
+                self.reset_run_stats()
+            gc.disable()
+            self.deferred = True
+        else:
+            if self.deferred:
+                gc.enable()
+                self.deferred = False
+            if collect:
+                gc.collect()
+
+    def poll(self):
+        """Válvula de seguridad durante la run: colección de la generación joven si hay demasiado pendiente"""
+        if self.deferred and gc.get_count()[0] > self.max_deferred:
+            gc.collect(0)
+
+    def _on_gc(self, phase, info):
+        if phase == "start":
+            self._pause_start = time.perf_counter()
+            return
+        if self._pause_start is None:
+            return
+        ms = (time.perf_counter() - self._pause_start) * 1000
+        self._pause_start = None
+        self.pauses += 1
+        self.pause_ms += ms
+        if self.deferred:
+            self.run_pauses += 1
+            self.run_pause_ms += ms
+            self.run_max_pause_ms = max(self.run_max_pause_ms, ms)
+
+    def stats(self):
+        return {
+            "run_pauses": self.run_pauses,
+            "run_pause_ms": self.run_pause_ms,
+            "run_max_pause_ms": self.run_max_pause_ms,
+            "pauses": self.pauses,
+            "pause_ms": self.pause_ms,
+            "frozen": gc.get_freeze_count(),
+        }
+
+
+GC_POLICY = GCPolicy()
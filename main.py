@@ -1,17 +1,24 @@
+from startup import STARTUP # Primero: marca el inicio de la medición del arranque
 import pygame
+STARTUP.mark("imports.pygame") # pygame arrastra numpy (surfarray) y pkg_resources
 import sys
 import asyncio
+import time
 from config import *
 from game_state import GameManager, GameState
+from gc_policy import GC_POLICY
+STARTUP.mark("imports.game")
 
 async def main():
     # Inicialización de Pygame
     pygame.init()
+    STARTUP.mark("pygame.init")
     
     # Flags de pantalla: Doble Buffer y VSync para evitar flickering/tearing
     # flags = pygame.DOUBLEBUF
     # screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), flags, vsync=1)
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    STARTUP.mark("display")
     
     # --- Configuración de Icono ---
     # Generar icono proceduralmente (Agujero negro sobre fondo beige)
@@ -29,16 +36,29 @@ async def main():
     
     # Ocultar el cursor del sistema operativo porque usamos uno custom
     pygame.mouse.set_visible(False)
+    STARTUP.mark("window")
 
     # Instancia del Gestor de Juego
     game = GameManager()
 
     running = True
+    last_time = time.perf_counter()
     while running:
         # 1. Gestión de Eventos
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        if not events and IDLE_FPS and game.is_idle() and sys.platform != "emscripten":
+            # Pantalla estática sin input: dormir hasta el siguiente evento (como mucho un frame a IDLE_FPS)
+            # La simulación recupera después el tiempo esperado, así las animaciones mantienen su ritmo
+            event = pygame.event.wait(1000 // IDLE_FPS)
+            if event.type != pygame.NOEVENT:
+                events = [event] + pygame.event.get()
+
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
+
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                game.invalidate_frame()
             
             if event.type == pygame.KEYDOWN:
                 # Debug Inputs
@@ -68,17 +88,35 @@ async def main():
             if event.type == pygame.MOUSEBUTTONDOWN:
                 game.handle_input(event)
 
-        # 2. Actualización Lógica
-        game.update()
+        # 2. Actualización Lógica (pasos fijos según el tiempo real; no se ralentiza si bajan los FPS)
+        now = time.perf_counter()
+        game.step(now - last_time)
+        last_time = now
 
-        # 3. Renderizado
-        game.draw(screen)
+        # 3. Renderizado (en pantallas estáticas solo se presentan las zonas que cambian)
+        dirty_rects = game.draw(screen)
 
         # 4. Control de FPS
-        pygame.display.flip()
+        if dirty_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty_rects)
+        if not STARTUP.done:
+            STARTUP.finish()
+            if DEBUG_MODE:
+                print(STARTUP.report())
+            # Arranque terminado: congelar lo creado hasta ahora y activar la política de GC
+            GC_POLICY.install()
+        # Tiempo sobrante del frame: construir por adelantado los próximos cuerpos a spawnear
+        # (solo si tras presentar aún queda holgura hasta el presupuesto)
+        deadline = now + SIM_DT * SPAWN_IDLE_BUDGET
+        if time.perf_counter() < deadline:
+            game.prefetch_spawns(deadline)
         clock.tick(FPS)
         await asyncio.sleep(0)
 
+    # Escribir el último guardado pendiente antes de salir
+    game.flush_saves()
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,150 @@
+import random
+import numpy as np
+import pygame
+from config import *
+
+
+class DebrisField:
+    """Sistema de partículas para el debris de los cuerpos destruidos.
+
+    Las partículas viven en arrays NumPy (coordenadas polares respecto al centro),
+    se integran en un único paso vectorizado y se dibujan en bloque con
+    Surface.blits a partir de sprites circulares cacheados por (color, radio).
+    """
+
+    _ARRAYS = ("orbit_radius", "angle", "speed", "decay_speed", "size", "color_index",
+               "prev_orbit_radius", "prev_angle")
+
+    def __init__(self, capacity=256):
+        self.count = 0
+        self.capacity = capacity
+        self.orbit_radius = np.zeros(capacity)
+        self.angle = np.zeros(capacity)
+        self.speed = np.zeros(capacity)        # Velocidad angular
+        self.decay_speed = np.zeros(capacity)  # Velocidad de caída al centro
+        self.size = np.zeros(capacity)
+        self.color_index = np.zeros(capacity, dtype=np.int32)
+        # Estado del paso anterior para interpolar el dibujado
+        self.prev_orbit_radius = np.zeros(capacity)
+        self.prev_angle = np.zeros(capacity)
+
+        self.palette = []        # Colores usados (índice -> RGB)
+        self._palette_index = {}
+        self._sprites = {}       # (índice de color, radio en px) -> Surface
+        self.rng = np.random.default_rng(random.getrandbits(64))
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self, needed):
+        new_capacity = self.capacity
+        while new_capacity < needed:
+            new_capacity *= 2
+        for name in self._ARRAYS:
+            old = getattr(self, name)
+            new = np.zeros(new_capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = new_capacity
+
+    def _color_to_index(self, color):
+        color = tuple(color)
+        index = self._palette_index.get(color)
+        if index is None:
+            index = len(self.palette)
+            self.palette.append(color)
+            self._palette_index[color] = index
+        return index
+
+    def emit(self, count, color, orbit_radius, angle, size_multiplier=1.0):
+        """Genera 'count' partículas en la posición orbital de un cuerpo"""
+        if count <= 0:
+            return
+        if self.count + count > self.capacity:
+            self._grow(self.count + count)
+
+        s = slice(self.count, self.count + count)
+        self.orbit_radius[s] = orbit_radius
+        self.angle[s] = angle
+        self.prev_orbit_radius[s] = orbit_radius
+        self.prev_angle[s] = angle
+        self.size[s] = self.rng.integers(3, 7, count) * size_multiplier # Tamaño escalable
+        self.speed[s] = self.rng.uniform(0.02, 0.05, count)              # Velocidad angular rápida
+        self.decay_speed[s] = self.rng.uniform(1.0, 2.0, count)          # Caída al centro
+        self.color_index[s] = self._color_to_index(color)
+        self.count += count
+
+    def update(self, cull_radius):
+        """Movimiento espiral hacia el centro y eliminación de lo que cae dentro de cull_radius"""
+        n = self.count
+        if n == 0:
+            return
+
+        self.prev_angle[:n] = self.angle[:n]
+        self.prev_orbit_radius[:n] = self.orbit_radius[:n]
+        self.angle[:n] += self.speed[:n]
+        self.orbit_radius[:n] -= self.decay_speed[:n]
+
+        alive = self.orbit_radius[:n] > cull_radius
+        if alive.all():
+            return
+
+        new_count = int(alive.sum())
+        for name in self._ARRAYS:
+            arr = getattr(self, name)
+            arr[:new_count] = arr[:n][alive]
+        self.count = new_count
+
+    def clear(self):
+        self.count = 0
+
+    def _get_sprite(self, color_index, radius):
+        key = (color_index, radius)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            color = self.palette[color_index]
+            colorkey = (255, 0, 255) if color != (255, 0, 255) else (0, 255, 0)
+            sprite = pygame.Surface((radius * 2 + 1, radius * 2 + 1))
+            sprite.fill(colorkey)
+            sprite.set_colorkey(colorkey, pygame.RLEACCEL)
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            self._sprites[key] = sprite
+        return sprite
+
+    def draw(self, surface, zoom=1.0, alpha=1.0):
+        """alpha interpola entre el paso anterior (0) y el actual (1)"""
+        n = self.count
+        if n == 0:
+            return
+
+        center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
+        orbit = self.orbit_radius[:n]
+        angle = self.angle[:n]
+        if alpha < 1:
+            orbit = self.prev_orbit_radius[:n] + (orbit - self.prev_orbit_radius[:n]) * alpha
+            angle = self.prev_angle[:n] + (angle - self.prev_angle[:n]) * alpha
+        orbit = orbit * zoom
+        screen_x = (center_x + orbit * np.cos(angle)).astype(np.int32)
+        screen_y = (center_y + orbit * np.sin(angle)).astype(np.int32)
+        radius = np.maximum(1, (self.size[:n] * zoom).astype(np.int32))
+
+        # Culling de lo que queda fuera de pantalla
+        visible = ((screen_x + radius >= 0) & (screen_x - radius < SCREEN_WIDTH) &
+                   (screen_y + radius >= 0) & (screen_y - radius < SCREEN_HEIGHT))
+        if not visible.any():
+            return
+        screen_x = screen_x[visible] - radius[visible]
+        screen_y = screen_y[visible] - radius[visible]
+        radius = radius[visible]
+        color_index = self.color_index[:n][visible]
+
+        # Un sprite por combinación (color, radio); el resto es una lista de posiciones
+        sprites = {}
+        for ci, r in set(zip(color_index.tolist(), radius.tolist())):
+            sprites[(ci, r)] = self._get_sprite(ci, r)
+
+        surface.blits(
+            [(sprites[key], pos) for key, pos in zip(zip(color_index.tolist(), radius.tolist()),
+                                                      zip(screen_x.tolist(), screen_y.tolist()))],
+            doreturn=False,
+        )
@@ -0,0 +1,47 @@
+from config import *
+
+
+class Pool:
+    """Free-list de objetos de vida corta (textos flotantes, ondas).
+
+    acquire() reutiliza un objeto liberado llamando a su reset() con los mismos
+    argumentos que el constructor, así en plena run no se crean objetos nuevos
+    ni basura para el recolector.
+    """
+
+    def __init__(self, factory, max_free=POOL_MAX_FREE):
+        self.factory = factory
+        self.max_free = max_free
+        self._free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args, **kwargs):
+        if self._free:
+            obj = self._free.pop()
+            obj.reset(*args, **kwargs)
+            self.reused += 1
+            return obj
+        self.created += 1
+        return self.factory(*args, **kwargs)
+
+    def release(self, obj):
+        if len(self._free) < self.max_free:
+            self._free.append(obj)
+
+    def release_all(self, items):
+        """Devuelve todos los elementos al pool y vacía la lista (en el sitio)"""
+        for obj in items:
+            self.release(obj)
+        items.clear()
+
+    def compact(self, items, is_alive):
+        """Quita de 'items' los elementos muertos sin crear una lista nueva y los devuelve al pool"""
+        write = 0
+        for obj in items:
+            if is_alive(obj):
+                items[write] = obj
+                write += 1
+            else:
+                self.release(obj)
+        del items[write:]
@@ -0,0 +1,163 @@
+import time
+import numpy as np
+import pygame
+from config import *
+from fonts import get_font
+
+MAX_PHASES = 24
+
+# Colores de las fases en el gráfico apilado (se asignan por orden de aparición)
+PHASE_COLORS = [
+    (230, 90, 90), (240, 170, 70), (230, 220, 90), (140, 210, 100),
+    (80, 200, 180), (90, 160, 240), (150, 120, 240), (220, 110, 220),
+    (200, 200, 200), (160, 110, 80), (110, 160, 110), (90, 110, 160),
+]
+
+
+class FrameProfiler:
+    """Tiempos por fase de cada frame con spans monótonos (perf_counter).
+
+    Cada lap(fase) imputa a esa fase el tiempo desde el lap anterior, así que
+    instrumentar una fase es una sola llamada. Los frames se guardan en un ring
+    buffer de PERF_HISTORY_FRAMES. Desactivado, lap() solo comprueba un booleano.
+    """
+
+    def __init__(self, history=PERF_HISTORY_FRAMES):
+        self.enabled = False
+        self.phases = []      # Nombres en orden de aparición
+        self._phase_index = {}
+        self.history = np.zeros((history, MAX_PHASES)) # ms por frame y fase
+        self.head = 0
+        self.count = 0
+        self._current = np.zeros(MAX_PHASES)
+        self._mark = 0.0
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._current[:] = 0
+        self._mark = time.perf_counter()
+
+    def lap(self, phase):
+        """Cierra el tramo en curso y lo imputa a 'phase'"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        index = self._phase_index.get(phase)
+        if index is None:
+            if len(self.phases) == MAX_PHASES:
+                return
+            index = len(self.phases)
+            self.phases.append(phase)
+            self._phase_index[phase] = index
+        self._current[index] += (now - self._mark) * 1000
+        self._mark = now
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        self.history[self.head] = self._current
+        self.head = (self.head + 1) % len(self.history)
+        self.count = min(self.count + 1, len(self.history))
+
+    def last_frame(self):
+        """ms por fase del último frame cerrado"""
+        return self.history[(self.head - 1) % len(self.history)]
+
+    def stats(self):
+        """Percentiles del tiempo de frame y media por fase sobre el ring buffer"""
+        if self.count == 0:
+            return None
+        frames = self.history[:self.count]
+        # Percentil por rango (np.percentile cuesta ~20 veces más que ordenar 300 valores)
+        totals = np.sort(frames.sum(axis=1))
+        last = self.count - 1
+        p50, p95, p99 = (float(totals[int(last * q + 0.5)]) for q in (0.50, 0.95, 0.99))
+        means = frames[:, :len(self.phases)].mean(axis=0).tolist()
+        return {"p50": p50, "p95": p95, "p99": p99, "phases": dict(zip(self.phases, means))}
+
+
+class PerfOverlay:
+    """Overlay de rendimiento: gráfico apilado del tiempo de frame por fase, percentiles y contadores.
+
+    El gráfico es una superficie persistente que se desplaza una columna por frame
+    (solo se pinta la columna nueva) y el texto se repinta de línea en línea, así
+    el overlay se mantiene por debajo de ~0.2 ms por frame.
+    """
+
+    GRAPH_WIDTH = 240
+    GRAPH_HEIGHT = 80
+
+    def __init__(self, profiler, position=(10, 90), max_ms=PERF_GRAPH_MAX_MS):
+        self.profiler = profiler
+        self.position = position
+        self.scale = self.GRAPH_HEIGHT / max_ms
+        self.graph = pygame.Surface((self.GRAPH_WIDTH, self.GRAPH_HEIGHT))
+        self.graph.fill((20, 20, 20))
+        self.font = get_font(13)
+        self.text = None
+        self._lines = []      # Líneas de la pasada de texto en curso
+        self._next_line = 0
+        self.cost_ms = 0.0 # Coste del propio overlay (último frame)
+
+    def _push_column(self, phases_ms):
+        graph = self.graph
+        x = self.GRAPH_WIDTH - 1
+        graph.scroll(-1, 0)
+        graph.fill((20, 20, 20), (x, 0, 1, self.GRAPH_HEIGHT))
+        bottom = self.GRAPH_HEIGHT
+        for index, ms in enumerate(phases_ms[:len(self.profiler.phases)].tolist()):
+            height = int(ms * self.scale + 0.5)
+            if height <= 0:
+                continue
+            bottom -= height
+            graph.fill(PHASE_COLORS[index % len(PHASE_COLORS)], (x, max(0, bottom), 1, height))
+            if bottom <= 0:
+                break
+        # Presupuesto de un frame (1 / FPS)
+        budget_y = self.GRAPH_HEIGHT - int(1000 / FPS * self.scale)
+        if 0 <= budget_y < self.GRAPH_HEIGHT:
+            graph.set_at((x, budget_y), (255, 255, 255))
+
+    def _text_lines(self, counts):
+        stats = self.profiler.stats()
+        lines = []
+        if stats is not None:
+            lines.append((f"frame p50 {stats['p50']:.2f}  p95 {stats['p95']:.2f}  p99 {stats['p99']:.2f} ms", (255, 255, 255)))
+            for index, (phase, ms) in enumerate(stats["phases"].items()):
+                lines.append((f"{phase:18s} {ms:6.2f} ms", PHASE_COLORS[index % len(PHASE_COLORS)]))
+        lines.append((" ".join(f"{name} {value}" for name, value in counts.items()), (200, 200, 200)))
+        lines.append((f"overlay {self.cost_ms:.3f} ms", (150, 150, 150)))
+        return lines
+
+    def _refresh_text(self, counts):
+        """Rasteriza una sola línea por frame (la recomposición completa no cabe en el presupuesto)"""
+        if self._next_line >= len(self._lines):
+            self._lines = self._text_lines(counts)
+            self._next_line = 0
+            height = self.font.get_linesize() * len(self._lines) + 4
+            if self.text is None or self.text.get_height() != height:
+                self.text = pygame.Surface((self.GRAPH_WIDTH, height))
+                self.text.fill((20, 20, 20))
+            return # Las estadísticas ya ocupan este frame
+
+        # Texto dinámico: se rasteriza directamente para no llenar la caché de textos de la UI
+        line, color = self._lines[self._next_line]
+        line_height = self.font.get_linesize()
+        y = 2 + self._next_line * line_height
+        self.text.fill((20, 20, 20), (0, y, self.GRAPH_WIDTH, line_height))
+        self.text.blit(self.font.render(line, True, color, (20, 20, 20)), (4, y))
+        self._next_line += 1
+
+    def draw(self, surface, counts):
+        """Dibuja el overlay y devuelve el rectángulo de pantalla que ocupa"""
+        start = time.perf_counter()
+        self._push_column(self.profiler.last_frame())
+
+        self._refresh_text(counts)
+
+        x, y = self.position
+        graph_rect = surface.blit(self.graph, (x, y))
+        text_rect = surface.blit(self.text, (x, y + self.GRAPH_HEIGHT))
+        self.cost_ms = (time.perf_counter() - start) * 1000
+        return graph_rect.union(text_rect)
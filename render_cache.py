@@ -0,0 +1,500 @@
+import math
+import random
+import numpy as np
+import pygame
+from collections import OrderedDict
+from config import *
+
+
+# --- Capa Auxiliar ---
+
+_scratch_layer = None
+
+
+def scratch_layer(size):
+    """Capa SRCALPHA del tamaño de pantalla reutilizable entre frames.
+
+    Quien la usa limpia y vuelca solo el área que dibuja, así el coste queda
+    acotado por el área visible en vez de por el tamaño del efecto.
+    """
+    global _scratch_layer
+    if _scratch_layer is None or _scratch_layer.get_size() != size:
+        _scratch_layer = pygame.Surface(size, pygame.SRCALPHA)
+    return _scratch_layer
+
+
+def _ring_tiles(area, cx, cy, outer, inner, tile_size):
+    # Tiles del área que contienen algún píxel del anillo (distancia al centro entre inner y outer)
+    tiles = []
+    for top in range(area.top, area.bottom, tile_size):
+        bottom = min(top + tile_size, area.bottom)
+        dy_min = max(top - cy, 0, cy - (bottom - 1))
+        dy_max = max(abs(top - cy), abs(bottom - 1 - cy))
+        for left in range(area.left, area.right, tile_size):
+            right = min(left + tile_size, area.right)
+            dx_min = max(left - cx, 0, cx - (right - 1))
+            dx_max = max(abs(left - cx), abs(right - 1 - cx))
+            if dx_min * dx_min + dy_min * dy_min > outer * outer:
+                continue
+            if dx_max * dx_max + dy_max * dy_max < inner * inner:
+                continue
+            tiles.append(pygame.Rect(left, top, right - left, bottom - top))
+    return tiles
+
+
+def draw_ring(surface, center, radius, width, color):
+    """Dibuja un anillo translúcido sin reservar superficies del tamaño del anillo.
+
+    Se rasteriza sobre la capa auxiliar y solo se limpian y vuelcan los tiles
+    visibles que atraviesa el anillo, así el coste queda acotado por el área de
+    pantalla que ocupa el anillo y no por su radio.
+    """
+    cx, cy = center
+    area = pygame.Rect(cx - radius, cy - radius, radius * 2 + 1, radius * 2 + 1).clip(surface.get_clip())
+    if area.width <= 0 or area.height <= 0:
+        return
+
+    # width == 0 es un círculo relleno (igual que pygame.draw.circle)
+    inner = radius - width - 1 if width > 0 else 0
+    tiles = _ring_tiles(area, cx, cy, radius + 1, inner, RING_TILE_SIZE)
+    if not tiles:
+        return
+
+    layer = scratch_layer(surface.get_size())
+    for tile in tiles:
+        layer.fill((0, 0, 0, 0), tile)
+    layer.set_clip(area)
+    pygame.draw.circle(layer, color, center, radius, width)
+    layer.set_clip(None)
+    surface.blits([(layer, tile.topleft, tile) for tile in tiles], doreturn=False)
+
+
+# --- Asteroides ---
+
+def draw_polygon_body(surface, screen_points, min_y, max_y, color, dark_color, health_pct):
+    """Trazado vectorial de un cuerpo poligonal: fondo oscuro, parte viva recortada por la vida y bordes"""
+    # 1. Dibujar fondo oscuro (parte dañada)
+    pygame.draw.polygon(surface, dark_color, screen_points)
+    
+    # 2. Dibujar parte viva (recortada verticalmente)
+    # Optimizacion: Usar set_clip en lugar de crear superficies temporales
+    height = max_y - min_y
+    
+    if height > 0:
+        # La parte "viva" está abajo. Calculamos Y donde empieza.
+        clip_top = min_y + (height * (1 - health_pct))
+        
+        # Guardar clip actual
+        old_clip = surface.get_clip()
+        
+        # Definir zona de dibujo (desde clip_top hacia abajo)
+        # Usamos todo el ancho de la superficie
+        clip_rect = pygame.Rect(0, int(clip_top), surface.get_width(), int(surface.get_height() - clip_top + 100))
+        
+        # Respetar clip existente si lo hubiera
+        if old_clip:
+            clip_rect = clip_rect.clip(old_clip)
+        
+        surface.set_clip(clip_rect)
+        
+        # Dibujar polígono vivo
+        pygame.draw.polygon(surface, color, screen_points)
+        # Brillo interno
+        pygame.draw.aalines(surface, (255, 255, 255), True, screen_points)
+        
+        # Restaurar clip
+        surface.set_clip(old_clip)
+
+    # 3. Dibujar borde (Nuevo)
+    # Usamos el color oscuro para el borde, para definir bien la forma
+    # Añadimos suavizado al borde
+    pygame.draw.aalines(surface, dark_color, True, screen_points)
+
+
+class AsteroidSpriteCache:
+    """Asteroides prerrasterizados por (forma, color, tamaño, banda de vida).
+
+    El tamaño se cuantiza en pasos geométricos (ASTEROID_SIZE_STEPS por octava) y
+    el relleno de vida en ASTEROID_HEALTH_BANDS niveles, así que cada asteroide
+    cuesta un blit por frame. Fuera de [min_size, max_size] se usa el trazado vectorial.
+    """
+
+    def __init__(self, steps_per_octave=ASTEROID_SIZE_STEPS, bands=ASTEROID_HEALTH_BANDS,
+                 min_size=ASTEROID_SPRITE_MIN_SIZE, max_size=ASTEROID_SPRITE_MAX_SIZE,
+                 max_entries=ASTEROID_SPRITE_CACHE_SIZE):
+        self.steps_per_octave = steps_per_octave
+        self.bands = bands
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def accepts(self, size):
+        return self.min_size <= size <= self.max_size
+
+    def get(self, shape_index, points, color, dark_color, size, health_pct):
+        """Devuelve (sprite, (cx, cy)) con (cx, cy) la posición del centro del cuerpo en el sprite"""
+        bucket = round(math.log2(size) * self.steps_per_octave)
+        band = round(max(0.0, min(1.0, health_pct)) * self.bands)
+        key = (shape_index, color, dark_color, bucket, band)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        scaled = points * (2.0 ** (bucket / self.steps_per_octave))
+        # Margen de 2px para los bordes suavizados
+        origin = np.floor(scaled.min(axis=0)) - 2
+        local = scaled - origin
+        width, height = (np.ceil(local.max(axis=0)) + 3).astype(int).tolist()
+        sprite = pygame.Surface((width, height), pygame.SRCALPHA)
+        min_y = float(local[:, 1].min())
+        max_y = float(local[:, 1].max())
+        draw_polygon_body(sprite, local.tolist(), min_y, max_y, color, dark_color, band / self.bands)
+
+        entry = (sprite, (-origin).tolist())
+        self._entries[key] = entry
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+
+ASTEROID_SPRITES = AsteroidSpriteCache()
+
+
+# --- Texturas de Planetas ---
+
+def generate_planet_texture(color, dark_color, res, rng=random):
+    """Genera la textura de bandas de un planeta y su versión "muerta" (oscura)"""
+    # 1. Fondo Base (Color Principal)
+    rect_surf = pygame.Surface((res, res), pygame.SRCALPHA)
+    rect_surf.fill(color)
+    
+    # 2. Bandas Sinoidales (Júpiter Style)
+    num_bands = rng.randint(5, 10)
+    
+    # Colores para las bandas (Oscuro y Claro)
+    c_dark = dark_color
+    c_light = tuple(min(255, c + 40) for c in color)
+    
+    for i in range(num_bands):
+        # Alternar entre oscuro y claro
+        band_color = c_dark if i % 2 == 0 else c_light
+        
+        # Propiedades de la banda
+        y_center = (i / num_bands) * res
+        thickness = rng.randint(res//20, res//8)
+        amplitude = rng.randint(res//50, res//20)
+        freq = rng.uniform(0.02, 0.06)
+        phase = rng.uniform(0, 6.28)
+        
+        # Dibujar polígono para la banda
+        points = []
+        # Borde superior
+        for x in range(0, res, 4):
+            y = y_center + math.sin(x * freq + phase) * amplitude
+            points.append((x, y))
+        
+        # Borde inferior
+        for x in range(res, -1, -4):
+            y = y_center + thickness + math.sin(x * freq + phase) * amplitude
+            points.append((x, y))
+            
+        pygame.draw.polygon(rect_surf, band_color, points)
+        
+    # 3. Aplicar Máscara Circular
+    mask = pygame.Surface((res, res), pygame.SRCALPHA)
+    pygame.draw.circle(mask, (255, 255, 255, 255), (res//2, res//2), res//2)
+    
+    # Multiplicar para recortar (Mantiene lo que está dentro del círculo blanco)
+    rect_surf.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+    
+    # 4. Generar versión "Muerta" (Oscura)
+    dead_texture = rect_surf.copy()
+    # Oscurecer: Multiplicar por gris oscuro
+    dark_overlay = pygame.Surface((res, res), pygame.SRCALPHA)
+    dark_overlay.fill((80, 80, 80, 255))
+    dead_texture.blit(dark_overlay, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+    
+    return rect_surf, dead_texture
+
+
+def texture_size_bucket(res):
+    """Cuantiza una resolución a pasos de media octava (…, 128, 181, 256, 362, 512, …)"""
+    return int(round(2 ** (round(math.log2(res) * 2) / 2)))
+
+
+class PlanetTexture:
+    """Textura viva y muerta de un planeta con su cadena de mipmaps potencia de dos"""
+
+    def __init__(self, texture, dead_texture, min_mip_size=PLANET_MIN_MIP_SIZE):
+        self.texture = texture
+        self.dead_texture = dead_texture
+        # mips[0] es la textura original; luego potencias de dos decrecientes (256, 128, ...)
+        self.mips = [texture]
+        self.dead_mips = [dead_texture]
+        size = 1 << (texture.get_width() - 1).bit_length()
+        while size > min_mip_size:
+            size //= 2
+            if size >= texture.get_width():
+                continue
+            self.mips.append(pygame.transform.smoothscale(self.mips[-1], (size, size)))
+            self.dead_mips.append(pygame.transform.smoothscale(self.dead_mips[-1], (size, size)))
+
+    def _mip_level(self, size):
+        # El nivel más pequeño que sigue siendo >= size (reducir desde ahí nunca baja de 2:1)
+        level = 0
+        while level + 1 < len(self.mips) and self.mips[level + 1].get_width() >= size:
+            level += 1
+        return level
+
+    def scaled(self, size):
+        """Devuelve (viva, muerta) escaladas a size x size partiendo del mip más cercano"""
+        level = self._mip_level(size)
+        live = self.mips[level]
+        dead = self.dead_mips[level]
+        if live.get_width() != size:
+            live = pygame.transform.smoothscale(live, (size, size))
+            dead = pygame.transform.smoothscale(dead, (size, size))
+        return live, dead
+
+
+class PlanetTexturePool:
+    """Pool LRU de texturas de planeta ya generadas, por (nivel, tamaño, variante).
+
+    Cada clave tiene 'variants' texturas distintas (semilla fija por variante), así
+    los planetas comparten texturas sin que todos los del mismo nivel sean iguales.
+    """
+
+    def __init__(self, variants=PLANET_TEXTURE_VARIANTS, max_entries=PLANET_TEXTURE_POOL_SIZE):
+        self.variants = variants
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self._entries.clear()
+
+    def get(self, level, color, dark_color, target_size):
+        """Devuelve la PlanetTexture para un planeta de ese nivel y tamaño"""
+        # Resolución alta para evitar pixelado al hacer zoom
+        res = max(100, int(target_size * 4))
+        bucket = texture_size_bucket(res)
+        variant = random.randrange(self.variants)
+        key = (level, bucket, variant)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        # Semilla determinista por clave: la misma variante siempre genera la misma textura
+        rng = random.Random(level * 1000003 + bucket * 101 + variant)
+        entry = PlanetTexture(*generate_planet_texture(color, dark_color, bucket, rng))
+        self._entries[key] = entry
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+
+PLANET_TEXTURES = PlanetTexturePool()
+
+
+# --- Brillo de Atmósfera ---
+
+class GlowSpriteCache:
+    """Sprites de brillo translúcido (círculo con alpha) por (color, radio cuantizado).
+
+    El pulso de la atmósfera solo recorre unos pocos radios enteros, así que tras
+    el primer ciclo cada frame es un único blit compartido entre planetas del mismo nivel.
+    """
+
+    def __init__(self, alpha=50, max_entries=GLOW_CACHE_SIZE):
+        self.alpha = alpha
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def quantize(radius):
+        # Radios pequeños exactos; a partir de 128px pasos de radius // 64 px
+        step = max(1, radius // 64)
+        return radius - radius % step
+
+    def get(self, color, radius):
+        radius = self.quantize(int(radius))
+        key = (color, radius)
+        sprite = self._entries.get(key)
+        if sprite is not None:
+            self._entries.move_to_end(key)
+            return sprite
+
+        size = radius * 2 + 1
+        sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (*color, self.alpha), (radius, radius), radius)
+        self._entries[key] = sprite
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return sprite
+
+
+ATMOSPHERE_GLOWS = GlowSpriteCache()
+
+
+# --- Aura del Agujero Negro ---
+
+class AuraRenderer:
+    """Dibuja el aura por capas del agujero negro recortada a la zona visible.
+
+    Mientras la geometría (radio, zoom, energía) se mantiene estable entre frames,
+    el aura recortada se cachea por (capas, recorte): con la respiración cuantizada
+    el ciclo se repite y cada frame es un único blit. La caché está limitada
+    también en bytes (un aura grande ocupa casi la pantalla entera); lo que no
+    cabe, y todo durante las animaciones, se dibuja sobre la capa auxiliar.
+    """
+
+    def __init__(self, max_entries=AURA_CACHE_SIZE, max_bytes=AURA_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._last_geometry = None
+
+    @staticmethod
+    def _render(target, cx, cy, layers):
+        # Capas de fuera hacia dentro: cada círculo reemplaza los píxeles del anterior
+        for radius, color in layers:
+            pygame.draw.circle(target, color, (cx, cy), radius)
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    @staticmethod
+    def _covered(area, cx, cy, radius):
+        # True si las cuatro esquinas de 'area' quedan dentro del círculo (el cuerpo tapa todo el aura visible)
+        dx = max(abs(area.left - cx), abs(area.right - cx))
+        dy = max(abs(area.top - cy), abs(area.bottom - cy))
+        return dx * dx + dy * dy <= radius * radius
+
+    def draw(self, surface, center, layers, geometry, body_radius=0):
+        """layers: [(radio, (r, g, b, a)), ...] de la capa exterior a la interior.
+
+        body_radius: radio en pantalla del cuerpo opaco que se dibuja encima; si
+        tapa toda la zona visible del aura no se dibuja nada.
+        """
+        cx, cy = center
+        outer = layers[0][0]
+        area = pygame.Rect(cx - outer, cy - outer, outer * 2 + 1, outer * 2 + 1).clip(surface.get_clip())
+        if area.width <= 0 or area.height <= 0:
+            return
+        if outer <= body_radius or self._covered(area, cx, cy, body_radius):
+            return
+
+        steady = geometry == self._last_geometry
+        if not steady:
+            self.clear() # Nueva geometría: las variantes anteriores ya no se van a pedir
+        self._last_geometry = geometry
+        size = area.width * area.height * 4
+
+        if steady and size <= self.max_bytes:
+            key = (center, tuple(layers), tuple(area))
+            sprite = self._entries.get(key)
+            if sprite is None:
+                sprite = pygame.Surface(area.size, pygame.SRCALPHA)
+                self._render(sprite, cx - area.x, cy - area.y, layers)
+                self._entries[key] = sprite
+                self._bytes += size
+                while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                    _, old = self._entries.popitem(last=False)
+                    self._bytes -= old.get_width() * old.get_height() * 4
+            else:
+                self._entries.move_to_end(key)
+            surface.blit(sprite, area.topleft)
+            return
+
+        layer = scratch_layer(surface.get_size())
+        layer.fill((0, 0, 0, 0), area)
+        layer.set_clip(area)
+        self._render(layer, cx, cy, layers)
+        layer.set_clip(None)
+        surface.blit(layer, area.topleft, area)
+
+
+BLACK_HOLE_AURA = AuraRenderer()
+
+
+# --- Pantallas Estáticas ---
+
+class FrameCache:
+    """Último frame compuesto de una pantalla estática (todo salvo el cursor).
+
+    Solo se recompone cuando cambia su clave (estado, hover, aspecto del agujero
+    negro...). Entre medias cada frame restaura desde aquí la zona que tapaba el
+    cursor, y basta con presentar esos rectángulos.
+    """
+
+    def __init__(self):
+        self.surface = None
+        self.key = None
+        self.cursor_rect = None # Zona de pantalla ocupada por el cursor en el último frame
+
+    def invalidate(self):
+        self.key = None
+        self.cursor_rect = None
+
+    def is_valid(self, key):
+        return self.key is not None and self.key == key
+
+    def store(self, source, key):
+        if self.surface is None or self.surface.get_size() != source.get_size():
+            self.surface = source.copy()
+        else:
+            self.surface.blit(source, (0, 0))
+        self.key = key
+
+    def restore(self, target, rect=None):
+        if rect is None:
+            target.blit(self.surface, (0, 0))
+        else:
+            target.blit(self.surface, rect.topleft, rect)
+
+
+class NoiseLoop:
+    """Bucle corto de frames de ruido estático precalculados (efecto VHS).
+
+    Las posiciones de cada frame se generan una vez; los colores se calculan al
+    fijar la escena de fondo con bake(), así cada frame es una escritura en bloque
+    de unos cientos de píxeles.
+    """
+
+    def __init__(self, size, dots, frames=PAUSE_NOISE_FRAMES, color=(200, 200, 200, 50)):
+        rng = np.random.default_rng(random.getrandbits(64))
+        width, height = size
+        self.positions = [(rng.integers(0, width, dots), rng.integers(0, height, dots)) for _ in range(frames)]
+        self.color = color
+        self.colors = None
+        self.frame = 0
+
+    def bake(self, background):
+        """Precalcula el color de cada punto mezclado sobre 'background'"""
+        tint = scratch_layer(background.get_size())
+        tint.fill(self.color)
+        tinted = background.copy()
+        tinted.blit(tint, (0, 0))
+        pixels = pygame.surfarray.pixels3d(tinted)
+        self.colors = [pixels[xs, ys].copy() for xs, ys in self.positions]
+        del pixels
+
+    def draw(self, surface):
+        xs, ys = self.positions[self.frame]
+        pixels = pygame.surfarray.pixels3d(surface)
+        pixels[xs, ys] = self.colors[self.frame]
+        del pixels # Desbloquear la superficie
+        self.frame = (self.frame + 1) % len(self.positions)
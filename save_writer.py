@@ -0,0 +1,136 @@
+import json
+import os
+import sys
+import threading
+import time
+from config import *
+
+
+def write_atomic(path, data):
+    """Escribe JSON en un temporal del mismo directorio, fsync y rename: el guardado nunca queda a medias"""
+    directory = os.path.dirname(os.path.abspath(path))
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump(data, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    # Persistir también la entrada del directorio (POSIX); en Windows no se puede abrir un directorio
+    if hasattr(os, "O_DIRECTORY"):
+        try:
+            fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass # Algunos sistemas de ficheros no lo permiten; el rename ya es atómico
+        finally:
+            os.close(fd)
+
+
+class SaveWriter:
+    """Guardado en segundo plano con debounce.
+
+    request() solo deja una copia de los datos como pendiente y vuelve; un hilo
+    escribe la última versión cuando pasan 'delay' segundos sin peticiones
+    nuevas, así una ráfaga de compras es una sola escritura. Sin hilos (web /
+    pygbag) se escribe en el momento. main_wait_ms acumula lo que el hilo
+    principal ha esperado por guardados durante la partida (debería ser ~0);
+    la espera de flush() al salir va aparte, en flush_wait_ms.
+    """
+
+    def __init__(self, path, delay=SAVE_DEBOUNCE_SECONDS, threaded=None):
+        self.path = path
+        self.delay = delay
+        self.threaded = sys.platform != "emscripten" if threaded is None else threaded
+        self._cond = threading.Condition()
+        self._pending = None      # Últimos datos sin escribir
+        self._due = 0.0           # Momento (monotonic) en que se escribe lo pendiente
+        self._writing = False
+        self._thread = None
+
+        # Métricas
+        self.requests = 0
+        self.writes = 0
+        self.coalesced = 0
+        self.failures = 0
+        self.main_wait_ms = 0.0
+        self.flush_wait_ms = 0.0
+        self.last_write_ms = 0.0
+
+    def request(self, data):
+        """Programa un guardado de 'data' (una copia: no se modifica después de pedirlo)"""
+        start = time.perf_counter()
+        if not self.threaded:
+            self.requests += 1
+            self._write(data)
+        else:
+            with self._cond:
+                self.requests += 1
+                if self._pending is not None:
+                    self.coalesced += 1 # Sustituye a un guardado que aún no se había escrito
+                self._pending = data
+                self._due = time.monotonic() + self.delay
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+                    self._thread.start()
+                self._cond.notify()
+        self.main_wait_ms += (time.perf_counter() - start) * 1000
+
+    def flush(self, timeout=5.0):
+        """Escribe ya lo pendiente y espera a que termine (al salir del juego)"""
+        if not self.threaded:
+            return True
+        start = time.perf_counter()
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._due = 0.0
+            self._cond.notify()
+            while self._pending is not None or self._writing:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            done = self._pending is None and not self._writing
+        self.flush_wait_ms += (time.perf_counter() - start) * 1000
+        return done
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "writes": self.writes,
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+            "main_wait_ms": self.main_wait_ms,
+            "flush_wait_ms": self.flush_wait_ms,
+            "last_write_ms": self.last_write_ms,
+        }
+
+    def _run(self):
+        while True:
+            with self._cond:
+                # Esperar a que haya algo pendiente y a que pase el debounce desde la última petición
+                while self._pending is None or time.monotonic() < self._due:
+                    if self._pending is None:
+                        self._cond.wait()
+                    else:
+                        self._cond.wait(max(0.0, self._due - time.monotonic()))
+                data = self._pending
+                self._pending = None
+                self._writing = True
+            self._write(data)
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+    def _write(self, data):
+        start = time.perf_counter()
+        try:
+            write_atomic(self.path, data)
+            self.writes += 1
+            print("Juego guardado correctamente.")
+        except Exception as e:
+            self.failures += 1
+            print(f"Error al guardar el juego: {e}")
+        self.last_write_ms = (time.perf_counter() - start) * 1000
@@ -0,0 +1,246 @@
+"""Escenarios de carga: construye una partida en PLAYING con cantidades declaradas y mide sus frames.
+
+Cada escenario es un dict con cuántos cuerpos, ondas, debris y textos hay en
+pantalla; --scale multiplica todas las cantidades para tener puntos de carga
+1x/10x/100x reproducibles (misma semilla, mismo recorrido del cursor).
+
+Ejemplos:
+    python scenarios.py --list
+    python scenarios.py late_game --scale 10 --frames 600
+    python scenarios.py fission_storm --scale 1 10 100 --out load.json
+"""
+import os
+
+# Sin ventana ni audio: tiene que fijarse antes de importar pygame
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import math
+import random
+import time
+
+import numpy as np
+import pygame
+from config import *
+from entities import Asteroid, Planet, Shockwave, FloatingText
+from game_state import GameManager, GameState
+
+
+# --- Escenarios ---
+# asteroids/planets: {nivel: cantidad}; moons: cuántos de los planetas llevan luna.
+# shockwaves, debris y texts se mantienen (como mínimo) en esa cantidad durante toda la medición.
+# zoom None = el que corresponde al nivel del agujero negro.
+
+SCENARIOS = {
+    "early_game": {
+        "asteroids": {1: 8, 2: 4},
+        "planets": {},
+        "moons": 0,
+        "shockwaves": 0,
+        "debris": 20,
+        "texts": 5,
+        "black_hole_level": 2,
+        "zoom": None,
+    },
+    "late_game": {
+        "asteroids": {3: 10, 4: 10, 5: 6, 6: 4},
+        "planets": {4: 3, 5: 3, 6: 2},
+        "moons": 4,
+        "shockwaves": 2,
+        "debris": 150,
+        "texts": 20,
+        "black_hole_level": 12,
+        "zoom": None,
+    },
+    # Fisión + resonancia encadenadas: muchas ondas, debris y textos a la vez
+    "fission_storm": {
+        "asteroids": {4: 25, 5: 25, 6: 10},
+        "planets": {5: 4, 6: 4},
+        "moons": 8,
+        "shockwaves": 5,
+        "debris": 600,
+        "texts": 60,
+        "black_hole_level": 15,
+        "zoom": None,
+    },
+}
+
+
+def scaled(spec, scale):
+    """Copia del escenario con todas las cantidades multiplicadas por 'scale'"""
+    spec = dict(spec)
+    for key in ("asteroids", "planets"):
+        spec[key] = {level: count * scale for level, count in spec[key].items()}
+    for key in ("moons", "shockwaves", "debris", "texts"):
+        spec[key] = spec[key] * scale
+    return spec
+
+
+def cursor_path(frames_per_loop=240, radius_x=320, radius_y=200):
+    """Recorrido del cursor en lemniscata alrededor del centro (determinista)"""
+    step = 0
+    def pointer():
+        nonlocal step
+        t = 2 * math.pi * step / frames_per_loop
+        step += 1
+        return (int(SCREEN_WIDTH // 2 + radius_x * math.sin(t)),
+                int(SCREEN_HEIGHT // 2 + radius_y * math.sin(2 * t)))
+    return pointer
+
+
+# --- Construcción ---
+
+def _spawn(game, body, immortal):
+    min_spawn = max(SPAWN_DISTANCE_MIN, game.black_hole.radius + 80)
+    max_spawn = SPAWN_DISTANCE_MAX + (game.black_hole.level * 100)
+    body.set_spawn_position(min_spawn, max_spawn)
+    # Sin animación de entrada: se mide el estado estable
+    body.spawn_anim_timer = body.spawn_anim_duration
+    body.current_size = body.target_size
+    if immortal:
+        # La población no cambia durante la medición
+        body.max_health = body.current_health = 1e12
+    game.bodies.append(body)
+
+
+def build_game(spec, seed=0, immortal=True):
+    """GameManager en PLAYING con el contenido declarado en 'spec' (sin spawner ni guardado)"""
+    random.seed(seed)
+    game = GameManager(persistent=False)
+    game.state = GameState.PLAYING
+    game.time_remaining = 1e9
+    game.spawned_count = game.bodies_per_level # El spawner no añade nada
+
+    black_hole = game.black_hole
+    for _ in range(spec["black_hole_level"] - 1):
+        black_hole.level_up()
+    black_hole.radius = black_hole.target_radius
+    game.current_zoom = spec["zoom"] or 1.0 / (1.0 + (black_hole.level - 1) * 0.1)
+
+    for level, count in spec["asteroids"].items():
+        for _ in range(count):
+            _spawn(game, Asteroid(level), immortal)
+
+    moons_left = spec["moons"]
+    for level, count in spec["planets"].items():
+        for _ in range(count):
+            _spawn(game, Planet(level, has_moon=moons_left > 0), immortal)
+            moons_left -= 1
+
+    game.bodies.update()
+    sustain(game, spec)
+    return game
+
+
+def sustain(game, spec):
+    """Repone ondas, debris y textos hasta las cantidades declaradas"""
+    center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
+    while len(game.shockwaves) < spec["shockwaves"]:
+        game.shockwave_generation += 1
+        wave = Shockwave(center_x, center_y, game.shockwave_generation)
+        # Escalonadas: cada onda nueva arranca en una fase distinta de su vida
+        for _ in range(game.shockwave_generation * 7 % 40):
+            wave.update()
+        game.shockwaves.append(wave)
+
+    missing = spec["debris"] - len(game.debris)
+    if missing > 0:
+        radius = random.uniform(game.black_hole.radius + 50, SPAWN_DISTANCE_MAX)
+        game.debris.emit(missing, (120, 120, 120), radius, random.uniform(0, 2 * math.pi))
+
+    while len(game.floating_texts) < spec["texts"]:
+        angle = random.uniform(0, 2 * math.pi)
+        distance = random.uniform(100, 400)
+        game.floating_texts.append(FloatingText(
+            center_x + math.cos(angle) * distance, center_y + math.sin(angle) * distance,
+            str(random.randint(1, 999))))
+
+
+# --- Medición ---
+
+def run_scenario(spec, frames=600, seed=0, draw=True, immortal=True):
+    """Ejecuta 'frames' pasos (update + draw) y devuelve percentiles del tiempo de frame en ms"""
+    surface = pygame.display.get_surface()
+    game = build_game(spec, seed, immortal)
+    game.cursor.pointer = cursor_path()
+    game.profiler.enabled = True
+    fixed_zoom = spec["zoom"]
+
+    times = np.empty(frames)
+    for i in range(frames):
+        start = time.perf_counter()
+        game.profiler.begin_frame()
+        game.update()
+        if fixed_zoom:
+            game.current_zoom = fixed_zoom
+        if draw:
+            game.draw(surface) # Cierra el frame del profiler
+        else:
+            game.profiler.end_frame()
+        times[i] = (time.perf_counter() - start) * 1000
+        sustain(game, spec)
+
+    p50, p95, p99 = np.percentile(times, (50, 95, 99)).tolist()
+    return {
+        "frames": frames,
+        "bodies": len(game.bodies),
+        "mean": round(float(times.mean()), 3),
+        "p50": round(p50, 3),
+        "p95": round(p95, 3),
+        "p99": round(p99, 3),
+        "max": round(float(times.max()), 3),
+        "over_budget": int((times > 1000 / FPS).sum()), # Frames que no caben en 1/FPS
+        "phases": {phase: round(ms, 3) for phase, ms in game.profiler.stats()["phases"].items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Escenarios de carga para medir la escalabilidad")
+    parser.add_argument("scenarios", nargs="*", default=["late_game"])
+    parser.add_argument("--list", action="store_true", help="mostrar los escenarios disponibles")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-draw", action="store_true", help="medir solo la simulación")
+    parser.add_argument("--mortal", action="store_true", help="los cuerpos reciben daño y pueden morir")
+    parser.add_argument("--phases", action="store_true", help="desglose medio por fase")
+    parser.add_argument("--out", help="guardar los resultados en JSON")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, spec in SCENARIOS.items():
+            bodies = sum(spec["asteroids"].values()) + sum(spec["planets"].values())
+            print(f"{name:16s} {bodies} cuerpos, {spec['shockwaves']} ondas, {spec['debris']} debris, "
+                  f"{spec['texts']} textos, nivel {spec['black_hole_level']}")
+        return
+
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    results = {}
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            raise SystemExit(f"Escenario desconocido: {name} (ver --list)")
+        for scale in args.scale:
+            label = f"{name}[x{scale}]"
+            result = run_scenario(scaled(SCENARIOS[name], scale), args.frames, args.seed,
+                                  draw=not args.no_draw, immortal=not args.mortal)
+            results[label] = result
+            print(f"{label:24s} {result['bodies']:6d} cuerpos  mediana {result['p50']:8.2f}  "
+                  f"p95 {result['p95']:8.2f}  p99 {result['p99']:8.2f}  máx {result['max']:8.2f} ms  "
+                  f"fuera de presupuesto {result['over_budget']}/{result['frames']}")
+            if args.phases:
+                for phase, ms in result["phases"].items():
+                    print(f"    {phase:20s} {ms:8.3f} ms")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import math
+import random
+import numpy as np
+from config import *
+
+
+def chaikin(points, iterations):
+    """Suavizado de Chaikin (Corner Cutting) sobre polígonos cerrados.
+
+    points: array (..., n, 2). Cada iteración sustituye cada lado p0-p1 por dos
+    puntos al 25% y 75%, así que duplica el número de vértices.
+    """
+    for _ in range(iterations):
+        following = np.roll(points, -1, axis=-2)
+        q = 0.75 * points + 0.25 * following
+        r = 0.25 * points + 0.75 * following
+        # Intercalar Q y R: q0, r0, q1, r1...
+        points = np.stack((q, r), axis=-2).reshape(points.shape[:-2] + (-1, 2))
+    return points
+
+
+class ShapeLibrary:
+    """Biblioteca de polígonos irregulares normalizados (radio ~1) ya suavizados.
+
+    Se genera una vez: ASTEROID_SHAPE_VARIANTS formas por cada número de vértices
+    base. Los cuerpos guardan el índice de su forma y comparten el array.
+    """
+
+    def __init__(self, vertex_counts=range(5, 10), variants=ASTEROID_SHAPE_VARIANTS, iterations=2, rng=None):
+        if rng is None:
+            rng = np.random.default_rng(random.getrandbits(64))
+        self.vertex_counts = tuple(vertex_counts)
+        self.variants = variants
+        self.shapes = []
+        for num_points in self.vertex_counts:
+            # Vértices base (picos) con radio aleatorio
+            theta = np.arange(num_points) / num_points * 2 * math.pi
+            r = rng.uniform(0.8, 1.2, (variants, num_points))
+            base_points = np.stack((r * np.cos(theta), r * np.sin(theta)), axis=-1)
+            for shape in chaikin(base_points, iterations):
+                shape.flags.writeable = False # Compartida entre cuerpos
+                self.shapes.append(shape)
+
+    def __len__(self):
+        return len(self.shapes)
+
+    def __getitem__(self, index):
+        return self.shapes[index]
+
+    def random_index(self):
+        """Índice de una forma al azar (número de vértices uniforme, como antes)"""
+        count_index = random.randrange(len(self.vertex_counts))
+        return count_index * self.variants + random.randrange(self.variants)
+
+
+ASTEROID_SHAPES = ShapeLibrary()
+
+# Círculo de alta resolución (forma base de los planetas)
+_theta = np.arange(32) / 32 * 2 * math.pi
+UNIT_CIRCLE = np.stack((np.cos(_theta), np.sin(_theta)), axis=-1)
+UNIT_CIRCLE.flags.writeable = False
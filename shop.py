@@ -0,0 +1,352 @@
+import math
+import pygame
+from config import *
+from fonts import render_text
+from render_cache import scratch_layer
+
+NODE_RADIUS = 15
+CENTER_RADIUS = 25     # Botón central (agujero negro) -> JUGAR
+CLICK_RADIUS = 25      # Radio de click un poco más generoso que el visual
+BRANCH_START_DIST = 100
+NODE_SPACING = 80
+GLOW_COLOR = (0, 200, 255, 50) # Halo de los nodos comprables
+
+# Dirección de cada rama del árbol desde el centro
+BRANCH_ANGLES = {
+    "asteroid": math.pi,
+    "blackhole": 0,
+    "unique": -math.pi / 2,
+    "planet": math.pi / 2,
+}
+
+# Estilo de nodo -> (relleno, color del texto)
+NODE_FILLS = {
+    "maxed": ((20, 50, 20), (255, 215, 0)),     # Verde oscuro / dorado
+    "buyable": ((20, 20, 40), (200, 255, 255)), # Azul oscuro / cian claro
+    "stalled": ((20, 20, 25), (150, 150, 170)), # Comprado pero no alcanza -> GRIS
+    "locked": ((30, 10, 10), (150, 100, 100)),  # Nunca comprado y no alcanza -> ROJO
+}
+
+
+class ShopNode:
+    """Nodo visible del árbol: posición de layout, fase de animación y estado de compra"""
+    __slots__ = ("key", "data", "x", "y", "float_phase", "pulse_phase", "parent", "root_pos",
+                 "level", "cost", "is_maxed", "can_buy", "style", "label", "draw_x", "draw_y")
+
+    def __init__(self, key, data, x, y):
+        self.key = key
+        self.data = data
+        self.x = x
+        self.y = y
+        # hash de la key para desincronizar las ondas (igual en toda la sesión)
+        self.float_phase = hash(key) % 100
+        self.pulse_phase = hash(key)
+        self.parent = None   # ShopNode padre (si es visible)
+        self.root_pos = None # Inicio de la rama si es nodo raíz
+        self.draw_x = x
+        self.draw_y = y
+
+
+class ShopScene:
+    """Tienda de mejoras como escena retenida.
+
+    El layout (nodos visibles, posiciones, conexiones) y la tabla de costes se
+    calculan una vez y solo se rehacen tras invalidate() (compras, carga de
+    partida) o cuando cambia el dinero. El arte estático de cada nodo (relleno,
+    borde, nivel) es un sprite cacheado; por frame solo se dibujan las líneas
+    entre nodos flotantes, los pulsos y el hover.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.nodes = []
+        self._layout_valid = False
+        self._money = None        # total_money con el que se calcularon los estados
+        self._node_sprites = {}   # (estilo, texto, radio del glow) -> Surface
+        self._tooltip_boxes = {}  # alto -> Surface
+
+    def invalidate(self):
+        """Las mejoras cambiaron: rehacer layout y costes en el próximo uso"""
+        self._layout_valid = False
+
+    # --- Layout y Costes ---
+
+    def _build_layout(self):
+        upgrades = self.game.upgrades
+        center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
+        spacing_y = NODE_SPACING * 0.8
+        by_key = {}
+
+        for key, data in UPGRADES.items():
+            cat = data.get("category", "asteroid")
+            if cat not in BRANCH_ANGLES:
+                continue
+            # Si tiene padre, solo es visible si el padre está comprado (nivel > 0)
+            parent_key = data.get("parent")
+            if parent_key and upgrades.get(parent_key, 0) == 0:
+                continue
+
+            branch_angle = BRANCH_ANGLES[cat]
+            start_x = center_x + BRANCH_START_DIST * math.cos(branch_angle)
+            start_y = center_y + BRANCH_START_DIST * math.sin(branch_angle)
+            u_x, u_y = math.cos(branch_angle), math.sin(branch_angle)
+            v_x, v_y = math.cos(branch_angle + math.pi / 2), math.sin(branch_angle + math.pi / 2)
+
+            col, row = data.get("tree_pos", (0, 0))
+            x = int(start_x + (col * NODE_SPACING * u_x) + (row * spacing_y * v_x))
+            y = int(start_y + (col * NODE_SPACING * u_y) + (row * spacing_y * v_y))
+
+            node = ShopNode(key, data, x, y)
+            if not parent_key:
+                node.root_pos = (start_x, start_y)
+            by_key[key] = node
+
+        # Orden por categoría (igual que el recorrido por ramas del dibujado original)
+        self.nodes = [node for cat in BRANCH_ANGLES for node in by_key.values()
+                      if node.data.get("category", "asteroid") == cat]
+        for node in self.nodes:
+            parent_key = node.data.get("parent")
+            if parent_key:
+                node.parent = by_key.get(parent_key)
+            node.level = upgrades[node.key]
+            node.cost = self.game.get_upgrade_cost(node.key)
+            node.is_maxed = "max_level" in node.data and node.level >= node.data["max_level"]
+
+        self._layout_valid = True
+        self._money = None
+
+    def _update_states(self):
+        money = self.game.total_money
+        for node in self.nodes:
+            node.can_buy = money >= node.cost
+            if node.is_maxed:
+                node.style, node.label = "maxed", "M"
+            elif node.can_buy:
+                node.style, node.label = "buyable", str(node.level)
+            elif node.level > 0:
+                node.style, node.label = "stalled", str(node.level)
+            else:
+                node.style, node.label = "locked", "0"
+        self._money = money
+
+    def refresh(self):
+        """Asegura layout y estados al día (barato si nada cambió)"""
+        if not self._layout_valid:
+            self._build_layout()
+        if self._money != self.game.total_money:
+            self._update_states()
+
+    @property
+    def node_positions(self):
+        self.refresh()
+        return {node.key: (node.x, node.y) for node in self.nodes}
+
+    def nodes_at(self, pos, radius=CLICK_RADIUS):
+        """Keys de todos los nodos bajo 'pos' (posiciones de layout), en orden de layout"""
+        self.refresh()
+        mx, my = pos
+        radius_sq = radius * radius
+        keys = []
+        for node in self.nodes:
+            dx, dy = mx - node.x, my - node.y
+            if dx * dx + dy * dy < radius_sq:
+                keys.append(node.key)
+        return keys
+
+    # --- Sprites ---
+
+    def _node_sprite(self, style, label, glow_radius=0):
+        """Relleno, borde estático, texto y (comprables) el glow de un nodo, centrados en el sprite"""
+        key = (style, label, glow_radius)
+        sprite = self._node_sprites.get(key)
+        if sprite is None:
+            fill_color, text_color = NODE_FILLS[style]
+            if glow_radius:
+                # Glow externo translúcido; dentro del nodo el glow tiñe el relleno (se precalcula la mezcla)
+                c = NODE_RADIUS * 2
+                sprite = pygame.Surface((c * 2, c * 2), pygame.SRCALPHA)
+                pygame.draw.circle(sprite, GLOW_COLOR, (c, c), glow_radius)
+                probe = pygame.Surface((1, 1))
+                probe.fill(fill_color)
+                tint = pygame.Surface((1, 1), pygame.SRCALPHA)
+                tint.fill(GLOW_COLOR)
+                probe.blit(tint, (0, 0))
+                fill_color = probe.get_at((0, 0))[:3]
+            else:
+                c = NODE_RADIUS + 1
+                sprite = pygame.Surface((c * 2, c * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, fill_color, (c, c), NODE_RADIUS)
+            if style == "maxed":
+                pygame.draw.circle(sprite, (255, 215, 0), (c, c), NODE_RADIUS, 2)
+                # Brillo interno
+                pygame.draw.circle(sprite, (100, 255, 100), (c, c), NODE_RADIUS - 4, 1)
+            elif style == "stalled":
+                pygame.draw.circle(sprite, (80, 80, 100), (c, c), NODE_RADIUS, 1) # Gris metal
+            elif style == "locked":
+                pygame.draw.circle(sprite, (150, 50, 50), (c, c), NODE_RADIUS, 1) # Rojo óxido
+            # El borde de los comprables pulsa: se dibuja en cada frame
+            text = render_text(self.game.font_desc, label, text_color)
+            sprite.blit(text, (c - text.get_width() // 2, c - text.get_height() // 2))
+            self._node_sprites[key] = sprite
+        return sprite
+
+    # --- Dibujado ---
+
+    def draw(self, surface, menu_time, ease_val, mouse_pos):
+        """Dibuja conexiones, nodos y etiquetas; devuelve el nodo bajo el ratón (o None)"""
+        self.refresh()
+        center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
+        mx, my = mouse_pos
+
+        # Flotación y animación de entrada: los nodos vienen desde el centro
+        for node in self.nodes:
+            float_y = math.sin(menu_time + node.float_phase) * 5 # Amplitud 5px
+            node.draw_x = center_x + (node.x - center_x) * ease_val
+            node.draw_y = center_y + (node.y + float_y - center_y) * ease_val
+
+        # Conexiones (Líneas de Energía)
+        for node in self.nodes:
+            if node.parent is not None:
+                start_pos = (node.parent.draw_x, node.parent.draw_y)
+            elif node.root_pos is not None:
+                start_pos = node.root_pos
+            else:
+                continue
+            end_pos = (node.draw_x, node.draw_y)
+
+            # Línea base oscura (siempre presente como "cable apagado")
+            pygame.draw.line(surface, (30, 30, 40), start_pos, end_pos, 5)
+            # La conexión está "establecida" si el nodo destino ha sido comprado
+            if node.level > 0:
+                # Efecto Neón con pulsación suave (electricidad viva)
+                pulse = (math.sin(menu_time * 4 + node.pulse_phase) + 1) / 2
+                pygame.draw.line(surface, (0, 100, 180), start_pos, end_pos, 5) # Glow externo
+                mid_val = 150 + int(105 * pulse)
+                pygame.draw.line(surface, (0, mid_val, mid_val), start_pos, end_pos, 3)
+                pygame.draw.line(surface, (200, 255, 255), start_pos, end_pos, 1) # Núcleo
+
+        # Nodos (encima de las líneas)
+        pulse = (math.sin(menu_time * 5) + 1) / 2 # Pulso común de los comprables
+        border_val = int(150 + 105 * pulse)
+        glow_radius = int(NODE_RADIUS + 5 + 2 * pulse)
+        hover_radius_sq = (NODE_RADIUS + 5) ** 2
+        hovered = None
+
+        for node in self.nodes:
+            x, y = node.draw_x, node.draw_y
+            if node.style == "buyable":
+                sprite = self._node_sprite(node.style, node.label, glow_radius)
+                offset = NODE_RADIUS * 2
+                surface.blit(sprite, (int(x) - offset, int(y) - offset))
+                pygame.draw.circle(surface, (0, border_val, border_val), (x, y), NODE_RADIUS, 2)
+            else:
+                offset = NODE_RADIUS + 1
+                surface.blit(self._node_sprite(node.style, node.label), (int(x) - offset, int(y) - offset))
+
+            dx, dy = mx - x, my - y
+            if dx * dx + dy * dy < hover_radius_sq:
+                hovered = node
+                pygame.draw.circle(surface, (255, 255, 255), (x, y), NODE_RADIUS + 2, 1)
+
+        self._draw_labels(surface, mx, my)
+        return hovered
+
+    def _draw_labels(self, surface, mx, my):
+        game = self.game
+        center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
+
+        # Botón central: el agujero negro ya está ahí, solo el indicador de hover
+        dx, dy = mx - center_x, my - center_y
+        if dx * dx + dy * dy < CENTER_RADIUS * CENTER_RADIUS:
+            pygame.draw.circle(surface, (255, 255, 255), (center_x, center_y), CENTER_RADIUS + 5, 1)
+            play_text = render_text(game.font_btn, "PLAY", (255, 255, 255))
+            surface.blit(play_text, (center_x - play_text.get_width()//2, center_y - play_text.get_height()//2))
+
+        money_surf = render_text(game.font_title, f"BANCO: ${game.total_money}", COLOR_MONEY_TEXT)
+        surface.blit(money_surf, (center_x - money_surf.get_width()//2, 50))
+
+        # Etiquetas de Ramas
+        lbl_ast = render_text(game.font_desc, "ASTEROIDES", COLOR_TEXT_LIGHT)
+        surface.blit(lbl_ast, (center_x - 250, center_y - 30))
+        lbl_bh = render_text(game.font_desc, "AGUJERO NEGRO", COLOR_TEXT_LIGHT)
+        surface.blit(lbl_bh, (center_x + 150, center_y - 30))
+        lbl_uniq = render_text(game.font_desc, "ÚNICAS", COLOR_TEXT_LIGHT)
+        surface.blit(lbl_uniq, (center_x - lbl_uniq.get_width()//2, center_y - 150))
+        if game.planets_unlocked:
+            lbl_planet = render_text(game.font_desc, "PLANETAS", COLOR_TEXT_LIGHT)
+            surface.blit(lbl_planet, (center_x - lbl_planet.get_width()//2, center_y + 150))
+
+    def draw_tooltip(self, surface, node, mouse_pos):
+        game = self.game
+        data = node.data
+        mx, my = mouse_pos
+
+        lines = [
+            (data["name"], game.font_title, COLOR_TEXT_INVERTED),
+            (data["description"], game.font_desc, (200, 200, 200)),
+        ]
+        if node.is_maxed:
+            lines.append(("MAX LEVEL", game.font_cost, (100, 255, 100)))
+        else:
+            cost_color = COLOR_MONEY_TEXT if node.can_buy else (255, 100, 100)
+            lines.append((f"Cost: ${node.cost}", game.font_cost, cost_color))
+
+            # Mostrar incremento
+            current_val = data["base_value"] + (node.level * data["increment"])
+            next_val = current_val + data["increment"]
+            if isinstance(current_val, float):
+                val_str = f"{current_val:.2f} -> {next_val:.2f}"
+            else:
+                val_str = f"{current_val} -> {next_val}"
+            lines.append((f"Effect: {val_str}", game.font_desc, (150, 150, 255)))
+
+        box_width = 220
+        box_height = 10 + len(lines) * 25
+        bx = mx + 15
+        by = my + 15
+        if bx + box_width > SCREEN_WIDTH: bx = mx - box_width - 15
+        if by + box_height > SCREEN_HEIGHT: by = my - box_height - 15
+
+        # Fondo oscuro semitransparente (uno por alto de caja)
+        box = self._tooltip_boxes.get(box_height)
+        if box is None:
+            box = pygame.Surface((box_width, box_height))
+            box.set_alpha(230)
+            box.fill((20, 20, 30))
+            self._tooltip_boxes[box_height] = box
+        surface.blit(box, (bx, by))
+        pygame.draw.rect(surface, (100, 100, 150), (bx, by, box_width, box_height), 1)
+
+        curr_y = by + 10
+        for text, font_obj, color in lines:
+            surface.blit(render_text(font_obj, text, color), (bx + 10, curr_y))
+            curr_y += 25
+
+    def draw_exit(self, surface, expansion, alpha):
+        """Nodos saliendo disparados hacia fuera (transición a jugar) sobre la capa auxiliar"""
+        self.refresh()
+        center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
+        shapes = []
+        for node in self.nodes:
+            dx = node.x - center_x
+            dy = node.y - center_y
+            ex = center_x + dx * expansion
+            ey = center_y + dy * expansion
+            # Solo si está en pantalla
+            if 0 <= ex <= SCREEN_WIDTH and 0 <= ey <= SCREEN_HEIGHT:
+                # Línea de velocidad (Trail) hacia el centro
+                shapes.append(((int(ex), int(ey)), (int(ex - dx * 0.1), int(ey - dy * 0.1))))
+        if not shapes:
+            return
+
+        # Solo se limpia y vuelca el rectángulo que ocupan los nodos, no la pantalla entera
+        xs = [p[0] for pair in shapes for p in pair]
+        ys = [p[1] for pair in shapes for p in pair]
+        area = pygame.Rect(min(xs) - 12, min(ys) - 12, max(xs) - min(xs) + 25, max(ys) - min(ys) + 25)
+        area = area.clip(surface.get_rect())
+        layer = scratch_layer(surface.get_size())
+        layer.fill((0, 0, 0, 0), area)
+        for end, start in shapes:
+            pygame.draw.circle(layer, (100, 200, 255, alpha), end, 10)
+            pygame.draw.line(layer, (100, 200, 255, alpha // 2), start, end, 2)
+        surface.blit(layer, area.topleft, area)
@@ -0,0 +1,230 @@
+"""Simulador headless por lotes: juega runs completas sin ventana para ajustar UPGRADES y config.py.
+
+Cada combinación (niveles de mejora, semilla) es una run independiente que se
+reparte en un pool de procesos; los resultados se escriben en CSV a medida que
+terminan, así un barrido largo se puede seguir (o cortar) sin perder nada.
+
+Ejemplos:
+    python simulate.py --seeds 20 --out runs.csv
+    python simulate.py --upgrade damage=0:10 --upgrade radius=0,2,4 --seeds 50 --workers 8
+    python simulate.py --tree 2 --seeds 5 --policy orbit --out tree.csv
+"""
+import os
+
+# Sin ventana ni audio: tiene que fijarse antes de importar pygame
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+# Sin esto SDL instala su propio manejador de SIGTERM en los workers y el pool no puede terminarlos
+os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+
+import argparse
+import csv
+import itertools
+import math
+import multiprocessing
+import random
+import sys
+import time
+
+import numpy as np
+import pygame
+from config import *
+from game_state import GameManager, GameState
+
+
+# --- Políticas de Cursor ---
+
+class ChaseNearestPolicy:
+    """Va en línea recta hacia el cuerpo más cercano en pantalla, con velocidad limitada"""
+
+    def __init__(self, game, speed=12):
+        self.game = game
+        self.speed = speed # px de pantalla por paso de simulación
+        self.x = SCREEN_WIDTH / 2
+        self.y = SCREEN_HEIGHT / 2
+
+    def __call__(self):
+        bodies = self.game.bodies
+        n = bodies.count
+        if n:
+            center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
+            zoom = self.game.get_zoom()
+            screen_x = center_x + (bodies.x[:n] - center_x) * zoom
+            screen_y = center_y + (bodies.y[:n] - center_y) * zoom
+            target = int(np.argmin((screen_x - self.x) ** 2 + (screen_y - self.y) ** 2))
+            dx = screen_x[target] - self.x
+            dy = screen_y[target] - self.y
+            distance = math.hypot(dx, dy)
+            if distance > 0:
+                step = min(distance, self.speed)
+                self.x += dx / distance * step
+                self.y += dy / distance * step
+        return int(self.x), int(self.y)
+
+
+class OrbitPolicy:
+    """Da vueltas alrededor del agujero negro a radio fijo (no persigue nada)"""
+
+    def __init__(self, game, radius=200, angular_speed=0.03):
+        self.game = game
+        self.radius = radius
+        self.angular_speed = angular_speed
+        self.angle = 0.0
+
+    def __call__(self):
+        self.angle += self.angular_speed
+        return (int(SCREEN_WIDTH // 2 + self.radius * math.cos(self.angle)),
+                int(SCREEN_HEIGHT // 2 + self.radius * math.sin(self.angle)))
+
+
+POLICIES = {
+    "chase": ChaseNearestPolicy,
+    "orbit": OrbitPolicy,
+}
+
+
+# --- Runs ---
+
+def _init_worker():
+    pygame.init()
+    # Algunos recursos (texturas, textos) necesitan un modo de vídeo aunque no se dibuje nada
+    pygame.display.set_mode((1, 1))
+
+
+def simulate_run(upgrades, seed, policy="chase", max_seconds=600):
+    """Juega una run completa (desde PLAYING hasta que se acaba el tiempo) y devuelve sus resultados"""
+    random.seed(seed)
+    game = GameManager(persistent=False)
+    for key, level in upgrades.items():
+        game.upgrades[key] = level
+    game._recalculate_stats()
+    game.cursor.pointer = POLICIES[policy](game)
+    game.state = GameState.PLAYING
+
+    max_steps = int(max_seconds / SIM_DT)
+    start = time.perf_counter()
+    steps = 0
+    while game.state == GameState.PLAYING and steps < max_steps:
+        game.update()
+        steps += 1
+
+    row = {"seed": seed, "policy": policy}
+    row.update({key: upgrades.get(key, 0) for key in UPGRADES})
+    row.update({
+        "money": game.money_earned,
+        "xp": round(game.current_xp, 2),
+        "black_hole_level": game.black_hole.level,
+        "sim_seconds": round(steps * SIM_DT, 2),
+        "wall_ms": round((time.perf_counter() - start) * 1000, 1),
+    })
+    for level, count in sorted(game.bodies_destroyed.items()):
+        row[f"destroyed_{level}"] = count
+    row["destroyed_total"] = sum(game.bodies_destroyed.values())
+    return row
+
+
+def _run_task(task):
+    return simulate_run(*task)
+
+
+# --- Barridos ---
+
+def parse_levels(spec):
+    """'3' -> [3], '0:5' -> [0..5], '0,2,4' -> [0, 2, 4]"""
+    if ":" in spec:
+        low, high = spec.split(":")
+        return list(range(int(low), int(high) + 1))
+    return [int(value) for value in spec.split(",")]
+
+
+def is_reachable(upgrades):
+    """En la tienda una mejora solo se compra si su padre tiene al menos un nivel"""
+    for key, level in upgrades.items():
+        parent = UPGRADES[key]["parent"]
+        if level > 0 and parent is not None and upgrades.get(parent, 0) == 0:
+            return False
+    return True
+
+
+def grid_levels(upgrade_specs, tree_max=None):
+    """Niveles a barrer de cada mejora ({clave: [niveles]})"""
+    levels = {}
+    if tree_max is not None:
+        for key, data in UPGRADES.items():
+            levels[key] = list(range(min(tree_max, data.get("max_level", tree_max)) + 1))
+    for spec in upgrade_specs:
+        key, _, values = spec.partition("=")
+        if key not in UPGRADES:
+            raise SystemExit(f"Mejora desconocida: {key}")
+        levels[key] = parse_levels(values)
+    return levels
+
+
+def missing_parents(levels):
+    """Mejoras padre que nunca tienen nivel > 0 en el barrido pero hacen falta para algún hijo"""
+    missing = set()
+    for key, values in levels.items():
+        parent = UPGRADES[key]["parent"]
+        if max(values) > 0 and parent is not None and max(levels.get(parent, [0])) == 0:
+            missing.add(parent)
+    return sorted(missing)
+
+
+def build_grid(levels):
+    """Combinaciones de niveles de mejora alcanzables ({clave: nivel}), sin materializarlas"""
+    keys = list(levels)
+    for combo in itertools.product(*(levels[key] for key in keys)):
+        upgrades = dict(zip(keys, combo))
+        if is_reachable(upgrades):
+            yield upgrades
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulador headless de runs para ajustar mejoras")
+    parser.add_argument("--upgrade", action="append", default=[], metavar="CLAVE=NIVELES",
+                        help="niveles a barrer de una mejora: 3, 0:5 o 0,2,4 (repetible)")
+    parser.add_argument("--tree", type=int, metavar="N",
+                        help="barrer todo el árbol con niveles 0..N (limitado por max_level)")
+    parser.add_argument("--seeds", type=int, default=10, help="semillas por combinación")
+    parser.add_argument("--seed-base", type=int, default=0)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="chase")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", default="runs.csv")
+    args = parser.parse_args()
+
+    seeds = range(args.seed_base, args.seed_base + args.seeds)
+    levels = grid_levels(args.upgrade, args.tree)
+    # Contar recorriendo el generador: las tareas se generan de nuevo bajo demanda para el pool
+    total = sum(1 for _ in build_grid(levels)) * len(seeds)
+    if total == 0:
+        missing = missing_parents(levels)
+        if missing:
+            raise SystemExit(f"Ninguna combinación es alcanzable: faltan niveles de {', '.join(missing)}")
+        raise SystemExit("Ninguna run que simular")
+    tasks = ((upgrades, seed, args.policy) for upgrades in build_grid(levels) for seed in seeds)
+    print(f"{total} runs en {args.workers} procesos -> {args.out}", file=sys.stderr)
+
+    start = time.perf_counter()
+    with open(args.out, "w", newline="") as f:
+        pool = multiprocessing.Pool(args.workers, initializer=_init_worker)
+        try:
+            writer = None
+            for done, row in enumerate(pool.imap_unordered(_run_task, tasks, chunksize=4), 1):
+                if writer is None:
+                    writer = csv.DictWriter(f, fieldnames=list(row))
+                    writer.writeheader()
+                writer.writerow(row)
+                f.flush()
+                if done % 100 == 0 or done == total:
+                    elapsed = time.perf_counter() - start
+                    print(f"{done}/{total} runs ({done / elapsed:.1f} runs/s)", file=sys.stderr)
+            # Cierre ordenado: los workers acaban solos en vez de recibir SIGTERM
+            pool.close()
+        except BaseException:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import numpy as np
+from config import *
+
+# Desplazamiento para que las celdas con coordenadas negativas generen claves positivas
+_CELL_OFFSET = 1 << 20
+_CELL_STRIDE = 1 << 21
+
+
+class SpatialGrid:
+    """Rejilla uniforme sobre las posiciones de los cuerpos.
+
+    Las claves de celda se ordenan por columna y luego por fila, así que cada
+    columna que toca una consulta es un rango contiguo del array ordenado y se
+    resuelve con dos searchsorted.
+    """
+
+    def __init__(self, cell_size=SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self.order = np.empty(0, dtype=np.intp)     # Slots ordenados por celda
+        self.sorted_keys = np.empty(0, dtype=np.int64)
+        self.max_extent = 0.0                       # Mayor radio de cuerpo indexado
+
+    def _cell(self, coord):
+        return np.floor_divide(coord, self.cell_size).astype(np.int64) + _CELL_OFFSET
+
+    def rebuild(self, xs, ys, sizes):
+        """Reconstruye el índice a partir de los arrays de posiciones y tamaños"""
+        if len(xs) == 0:
+            self.order = np.empty(0, dtype=np.intp)
+            self.sorted_keys = np.empty(0, dtype=np.int64)
+            self.max_extent = 0.0
+            return
+
+        keys = self._cell(xs) * _CELL_STRIDE + self._cell(ys)
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+        self.max_extent = float(np.max(sizes))
+
+    def query_circle(self, x, y, radius):
+        """Slots (en orden ascendente) de los cuerpos que pueden tocar el círculo dado.
+
+        Devuelve un superconjunto: el test exacto de distancia lo hace el llamador.
+        """
+        if self.order.size == 0:
+            return self.order
+
+        reach = radius + self.max_extent
+        cs = self.cell_size
+        col_min = int((x - reach) // cs) + _CELL_OFFSET
+        col_max = int((x + reach) // cs) + _CELL_OFFSET
+        row_min = int((y - reach) // cs) + _CELL_OFFSET
+        row_max = int((y + reach) // cs) + _CELL_OFFSET
+
+        cols = np.arange(col_min, col_max + 1, dtype=np.int64) * _CELL_STRIDE
+        starts = np.searchsorted(self.sorted_keys, cols + row_min, side="left")
+        ends = np.searchsorted(self.sorted_keys, cols + row_max, side="right")
+
+        chunks = [self.order[s:e] for s, e in zip(starts, ends) if e > s]
+        if not chunks:
+            return np.empty(0, dtype=np.intp)
+        return np.sort(np.concatenate(chunks))
@@ -0,0 +1,86 @@
+import time
+from collections import deque
+from config import *
+from entities import Asteroid, Planet
+
+
+class SpawnPipeline:
+    """Cuerpos construidos por adelantado para los spawns y las fisiones.
+
+    Hay una cola acotada por (tipo, nivel, lunas). prefetch() la rellena con las
+    claves que el juego espera pedir (en la transición a PLAYING y con el tiempo
+    sobrante de cada frame), así en pleno frame un spawn solo tiene que colocar
+    el cuerpo. Si la cola de una clave está vacía el cuerpo se construye en el
+    momento y se cuenta como 'stall'.
+    """
+
+    def __init__(self, depth=SPAWN_QUEUE_DEPTH):
+        self.depth = depth
+        self._queues = {} # (tipo, nivel, lunas) -> deque de cuerpos sin estrenar
+
+        # Métricas
+        self.built = 0
+        self.hits = 0
+        self.stalls = 0
+        self.prefetch_ms = 0.0
+
+    def asteroid(self, level):
+        return self._take(("asteroid", level, False))
+
+    def planet(self, level, has_moon=False):
+        return self._take(("planet", level, has_moon))
+
+    def _take(self, key):
+        queue = self._queues.get(key)
+        if queue:
+            self.hits += 1
+            return queue.popleft()
+        self.stalls += 1
+        return self._build(key)
+
+    @staticmethod
+    def _build(key):
+        kind, level, has_moon = key
+        if kind == "planet":
+            return Planet(level=level, has_moon=has_moon)
+        return Asteroid(level=level)
+
+    def prefetch(self, keys, max_bodies=None, deadline=None):
+        """Construye cuerpos para 'keys' (rellenando primero la cola más vacía) hasta llenarlas,
+        hasta 'max_bodies' o hasta 'deadline' (perf_counter). Devuelve los construidos."""
+        start = time.perf_counter()
+        # Sin holgura (el frame ya se ha comido el presupuesto) no se construye ni un cuerpo
+        if not keys or (deadline is not None and start >= deadline):
+            return 0
+        queues = [self._queues.setdefault(key, deque()) for key in keys]
+        built = 0
+        while max_bodies is None or built < max_bodies:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            index = min(range(len(queues)), key=lambda i: len(queues[i]))
+            if len(queues[index]) >= self.depth:
+                break
+            queues[index].append(self._build(keys[index]))
+            built += 1
+        self.built += built
+        if built:
+            self.prefetch_ms += (time.perf_counter() - start) * 1000
+        return built
+
+    def queued(self):
+        return sum(len(queue) for queue in self._queues.values())
+
+    def depths(self):
+        return {key: len(queue) for key, queue in self._queues.items() if queue}
+
+    def clear(self):
+        self._queues.clear()
+
+    def stats(self):
+        return {
+            "queued": self.queued(),
+            "built": self.built,
+            "hits": self.hits,
+            "stalls": self.stalls,
+            "prefetch_ms": self.prefetch_ms,
+        }
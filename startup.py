@@ -0,0 +1,46 @@
+import time
+
+# Referencia de arranque: main.py importa este módulo antes que nada
+PROCESS_START = time.perf_counter()
+
+MAX_PHASES = 32
+
+
+class StartupTimer:
+    """Tiempo hasta el primer frame desglosado por fases.
+
+    Cada mark(fase) imputa a esa fase el tiempo desde la marca anterior; finish()
+    cierra la medición al presentar el primer frame y a partir de ahí las marcas
+    se ignoran (p.ej. los GameManager que crean simulate.py o scenarios.py).
+    """
+
+    def __init__(self, start=PROCESS_START):
+        self.start = start
+        self._mark = start
+        self.phases = []   # (fase, ms)
+        self.done = False
+
+    def mark(self, phase):
+        if self.done or len(self.phases) >= MAX_PHASES:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self._mark) * 1000))
+        self._mark = now
+
+    def finish(self):
+        """Marca el primer frame presentado y devuelve el total en ms"""
+        self.mark("first_frame")
+        self.done = True
+        return self.total_ms()
+
+    def total_ms(self):
+        return sum(ms for _, ms in self.phases)
+
+    def report(self):
+        lines = [f"Arranque: primer frame en {self.total_ms():.1f} ms"]
+        for phase, ms in self.phases:
+            lines.append(f"  {phase:18s} {ms:8.1f} ms")
+        return "\n".join(lines)
+
+
+STARTUP = StartupTimer()